@@ -21,10 +21,14 @@ Endpoints:
     GET /api/fraud           - Fraud detection data
     GET /api/forecast        - Demand forecast data
     GET /api/recommendations - Actionable recommendations
+    GET /api/spatial/*       - Radius, nearest and viewport pincode queries
+    GET /api/tiles/{z}/{x}/{y} - Aggregated heatmap cells of a map tile
+    GET /api/pincodes        - Filtered, sorted, paged pincode rows
 
 Data Sources:
     - priority_deployment_pincodes.csv
     - master_pincode_analysis.csv
+    - pincode_dimension.csv (joined into the pincode tables)
     - cluster_analysis.csv
     - state_enrollment_stats.csv
 
@@ -36,17 +40,37 @@ Version: 1.0.0
 License: MIT
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 import pandas as pd
 import numpy as np
 import os
+import sys
+import io
 import json
+import hashlib
+import asyncio
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
+from dataclasses import dataclass, field
 from pydantic import BaseModel
 import joblib
 
+# orjson serializes cached payloads much faster (optional - falls back to json)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# pyarrow reads Arrow IPC uploads for batch scoring (optional)
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 # Pydantic model for prediction requests
 class PredictionRequest(BaseModel):
     model_type: str  # 'fraud', 'cluster', or 'forecast'
@@ -92,6 +116,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # Data paths
@@ -100,6 +125,51 @@ OUTPUTS_DIR = os.path.join(BASE_DIR, 'outputs')
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 METRICS_FILE = os.path.join(OUTPUTS_DIR, 'metrics', 'model_metrics.json')
 MODELS_DIR = os.path.join(BASE_DIR, 'models', 'trained')
+OUTPUT_FILES = {
+    'priority_deployment_pincodes': 'priority_deployment_pincodes.csv',
+    'master_pincode_analysis': 'master_pincode_analysis.csv',
+    'cluster_analysis': 'cluster_analysis.csv',
+    'state_enrollment_stats': 'state_enrollment_stats.csv'
+}
+# Trained artifacts held in memory by the API (file names: pipeline.scoring.MODEL_FILES)
+SERVED_MODELS = ['isolation_forest', 'kmeans', 'random_forest']
+# Seconds between checks for new pipeline outputs (0 disables the watcher)
+RELOAD_INTERVAL = float(os.environ.get('AADHAAR_RELOAD_INTERVAL', 10))
+# If set, POST /api/admin/reload requires a matching X-Admin-Token header
+ADMIN_TOKEN = os.environ.get('AADHAAR_ADMIN_TOKEN')
+RAW_DATA_TYPES = ['enrolment', 'demographic', 'biometric']
+# Spatial query zones: name -> (dataset, activity category filter)
+SPATIAL_ZONES = {
+    'all': ('master_pincode_analysis', None),
+    'critical': ('master_pincode_analysis', 'Critical (Bottom 25%)'),
+    'priority': ('priority_deployment_pincodes', None),
+}
+SPATIAL_COLUMNS = ['pincode', 'state', 'district', 'latitude', 'longitude',
+                   'total_enrolments', 'daily_enrolment_rate', 'activity_category']
+MAX_SPATIAL_RESULTS = 5000
+# Pincode-level tables served by /api/pincodes
+LISTING_DATASETS = {
+    'master': 'master_pincode_analysis',
+    'priority': 'priority_deployment_pincodes',
+}
+
+# Shared data pipeline (pipeline/ lives at the repository root)
+sys.path.insert(0, BASE_DIR)
+from pipeline.manifest import load_manifest, manifest_path
+from pipeline.store import STORE_DIR
+from pipeline.features import COUNT_COLUMNS
+from pipeline.normalize import normalize_frame
+from pipeline.dimensions import DIMENSION_FILE, KEY_COLUMN, load_dimension, join_dimension
+from pipeline.forecasting import (
+    FORECAST_DIR, FORECAST_FILE, SUMMARY_FILE, LEVELS as FORECAST_LEVELS,
+    load_forecasts, select_series, staffing_plan
+)
+from pipeline.spatial import PincodeIndex
+from pipeline.tiles import TileAggregates, MAX_CELL_ZOOM
+from pipeline.listing import PincodeListing, CursorError, MAX_PAGE_SIZE
+from pipeline.scoring import (
+    MODEL_FILES, FLAT_FILES, HISTORY_FILE, load_model, load_forecast_history, normalize_records, score_anomalies, assign_clusters, forecast_demand
+)
 
 
 def load_ml_model(model_name: str):
@@ -125,79 +195,22 @@ def load_ml_model(model_name: str):
     return model, scaler
 
 
-# State name normalization mapping
-STATE_NAME_MAPPING = {
-    # West Bengal variations
-    'west bengal': 'West Bengal',
-    'West bengal': 'West Bengal',
-    'west  bengal': 'West Bengal',
-    'West  Bengal': 'West Bengal',
-    'west bangal': 'West Bengal',
-    'West Bangal': 'West Bengal',
-    'westbengal': 'West Bengal',
-    'Westbengal': 'West Bengal',
-    'WEST BENGAL': 'West Bengal',
-    'WESTBENGAL': 'West Bengal',
-    
-    # Odisha variations
-    'odisha': 'Odisha',
-    'ODISHA': 'Odisha',
-    'orissa': 'Odisha',
-    'Orissa': 'Odisha',
-    
-    # Andhra Pradesh variations
-    'andhra pradesh': 'Andhra Pradesh',
-    
-    # Andaman & Nicobar variations
-    'Andaman & Nicobar Islands': 'Andaman and Nicobar Islands',
-    'andaman & nicobar islands': 'Andaman and Nicobar Islands',
-    
-    # Jammu & Kashmir variations
-    'Jammu & Kashmir': 'Jammu and Kashmir',
-    'Jammu And Kashmir': 'Jammu and Kashmir',
-    'jammu and kashmir': 'Jammu and Kashmir',
-    
-    # Dadra and Nagar Haveli variations
-    'Dadra & Nagar Haveli': 'Dadra and Nagar Haveli and Daman and Diu',
-    'Dadra and Nagar Haveli': 'Dadra and Nagar Haveli and Daman and Diu',
-    'The Dadra And Nagar Haveli And Daman And Diu': 'Dadra and Nagar Haveli and Daman and Diu',
-    
-    # Daman & Diu variations
-    'Daman & Diu': 'Dadra and Nagar Haveli and Daman and Diu',
-    'Daman and Diu': 'Dadra and Nagar Haveli and Daman and Diu',
-    
-    # Puducherry variations
-    'Pondicherry': 'Puducherry',
-    'pondicherry': 'Puducherry',
-    
-    # Invalid entries
-    '100000': None,  # Remove invalid numeric state
-}
-
-
-def normalize_state_name(state: str) -> Optional[str]:
-    """Normalize state name to standard format."""
-    if pd.isna(state):
-        return None
-    state_str = str(state).strip()
-    return STATE_NAME_MAPPING.get(state_str, state_str)
-
-
 def normalize_dataframe_states(df: pd.DataFrame) -> pd.DataFrame:
-    """Normalize state names in a DataFrame and aggregate duplicates."""
+    """
+    Normalize state and district names in a DataFrame and aggregate duplicates.
+    
+    Rows with an invalid state are dropped. Only state-level tables whose
+    normalized names collide are aggregated; pincode-level tables keep
+    their rows.
+    """
     if 'state' not in df.columns:
         return df
     
-    df = df.copy()
-    df['state'] = df['state'].apply(normalize_state_name)
-    df = df[df['state'].notna()]  # Remove invalid states
+    df = normalize_frame(df, ['state', 'district'])
     
     # Aggregate rows with same normalized state name
     numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    if 'state' in numeric_cols:
-        numeric_cols.remove('state')
-    
-    if len(numeric_cols) > 0 and len(df) > 0:
+    if len(numeric_cols) > 0 and 'pincode' not in df.columns and df['state'].duplicated().any():
         # Group by state and sum numeric columns
         agg_dict = {col: 'sum' for col in numeric_cols}
         df = df.groupby('state', as_index=False).agg(agg_dict)
@@ -219,46 +232,112 @@ def load_model_metrics() -> Dict[str, Any]:
     return metrics
 
 
-def load_raw_data_stats() -> Dict[str, Any]:
+# Raw data stats cache: recomputed only when a data folder or the manifest changes
+_raw_stats_cache: Dict[str, Any] = {'signature': None, 'stats': None}
+_row_count_cache: Dict[str, Any] = {}
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    """Modification time of a file or folder, or None if it does not exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _raw_data_signature() -> tuple:
     """
-    Load statistics from raw data CSV files in the data folder.
+    Cheap fingerprint of the raw data folders.
+
+    Adding, removing or renaming a shard changes its folder's mtime and
+    every ingestion run rewrites the manifest, so four stat calls are
+    enough to detect that the cached stats are stale.
+    """
+    folders = tuple(
+        _mtime_ns(os.path.join(DATA_DIR, data_type, f'api_data_aadhar_{data_type}'))
+        for data_type in RAW_DATA_TYPES
+    )
+    return folders + (_mtime_ns(manifest_path(STORE_DIR)),)
+
+
+def _count_csv_rows(path: str) -> int:
+    """Exact number of data rows in a CSV shard (cached by size and mtime)."""
+    stat = os.stat(path)
+    cache_key = (path, stat.st_size, stat.st_mtime_ns)
+    if cache_key not in _row_count_cache:
+        lines = 0
+        last_byte = b'\n'
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                lines += chunk.count(b'\n')
+                last_byte = chunk[-1:]
+        if last_byte != b'\n':
+            lines += 1
+        _row_count_cache[cache_key] = max(0, lines - 1)  # minus header
+    return _row_count_cache[cache_key]
+
+
+def compute_raw_data_stats() -> Dict[str, Any]:
+    """
+    Count shards and records in the raw data folders.
+
+    Record counts come from the ingestion manifest; shards that have not
+    been ingested yet are counted exactly by scanning their lines.
     """
     stats = {
-        'enrolment': {'files': 0, 'total_records': 0},
-        'demographic': {'files': 0, 'total_records': 0},
-        'biometric': {'files': 0, 'total_records': 0}
+        data_type: {'files': 0, 'total_records': 0}
+        for data_type in RAW_DATA_TYPES
     }
+    manifest = load_manifest(STORE_DIR)
     
-    for data_type in ['enrolment', 'demographic', 'biometric']:
+    for data_type in RAW_DATA_TYPES:
         data_path = os.path.join(DATA_DIR, data_type, f'api_data_aadhar_{data_type}')
-        if os.path.exists(data_path):
-            csv_files = [f for f in os.listdir(data_path) if f.endswith('.csv')]
-            stats[data_type]['files'] = len(csv_files)
-            for csv_file in csv_files:
-                try:
-                    df = pd.read_csv(os.path.join(data_path, csv_file), nrows=0)
-                    # Get row count from filename if possible
-                    parts = csv_file.replace('.csv', '').split('_')
-                    if len(parts) >= 2:
-                        try:
-                            start = int(parts[-2])
-                            end = int(parts[-1])
-                            stats[data_type]['total_records'] += (end - start)
-                        except:
-                            pass
-                except:
-                    pass
+        if not os.path.exists(data_path):
+            continue
+        
+        recorded = manifest.get(data_type, {})
+        csv_files = [f for f in os.listdir(data_path) if f.endswith('.csv')]
+        stats[data_type]['files'] = len(csv_files)
+        
+        for csv_file in csv_files:
+            file_path = os.path.join(data_path, csv_file)
+            entry = recorded.get(f'api_data_aadhar_{data_type}/{csv_file}', {})
+            try:
+                stat = os.stat(file_path)
+                if entry.get('rows') is not None and entry.get('size') == stat.st_size \
+                        and entry.get('mtime') == stat.st_mtime:
+                    stats[data_type]['total_records'] += entry['rows']
+                else:
+                    stats[data_type]['total_records'] += _count_csv_rows(file_path)
+            except OSError as e:
+                print(f"Error reading shard {file_path}: {e}")
     
     return stats
 
 
+def load_raw_data_stats() -> Dict[str, Any]:
+    """
+    Statistics for the raw data CSV files in the data folder.
+    
+    Served from an in-memory cache that is invalidated when a data folder
+    or the ingestion manifest changes.
+    """
+    signature = _raw_data_signature()
+    if _raw_stats_cache['signature'] != signature:
+        _raw_stats_cache['stats'] = compute_raw_data_stats()
+        _raw_stats_cache['signature'] = signature
+    return _raw_stats_cache['stats']
+
+
 def load_real_data() -> Dict[str, Any]:
     """
     Load real processed data from outputs folder.
     
     This function attempts to load pre-processed CSV files from the
     outputs directory. These files are generated by the Jupyter notebooks
-    (01_data_pipeline.ipynb through 05_forecasting.ipynb).
+    (01_data_pipeline.ipynb through 05_forecasting.ipynb). Pincode tables
+    keyed by ``pincode_key`` are joined with the pincode dimension, and
+    repeated rows of older exports are dropped.
     
     Returns:
         Dict containing:
@@ -281,17 +360,17 @@ def load_real_data() -> Dict[str, Any]:
     }
     
     try:
-        files = {
-            'priority_deployment_pincodes': 'priority_deployment_pincodes.csv',
-            'master_pincode_analysis': 'master_pincode_analysis.csv',
-            'cluster_analysis': 'cluster_analysis.csv',
-            'state_enrollment_stats': 'state_enrollment_stats.csv'
-        }
+        files = OUTPUT_FILES
+        dimension = load_dimension(OUTPUTS_DIR)
         
         for key, filename in files.items():
             filepath = os.path.join(OUTPUTS_DIR, filename)
             if os.path.exists(filepath):
                 df = pd.read_csv(filepath)
+                if KEY_COLUMN in df.columns and dimension is not None:
+                    df = join_dimension(df, dimension)
+                if 'pincode' in df.columns and df.duplicated().any():
+                    df = df.drop_duplicates().reset_index(drop=True)
                 # Normalize state names if state column exists
                 if 'state' in df.columns:
                     df = normalize_dataframe_states(df)
@@ -371,15 +450,261 @@ def generate_synthetic_data() -> Dict[str, Any]:
     return pincode_data
 
 
-# Cache data on startup
-cached_data = None
+def _json_default(value: Any) -> Any:
+    """Serialize numpy/pandas scalars that the JSON encoders do not know."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_json(content: Any) -> bytes:
+    """Serialize a response payload to JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(content, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_json_default, ensure_ascii=False,
+                      allow_nan=False, separators=(',', ':')).encode('utf-8')
+
+
+# Pre-serialized GET responses: key -> (data version, body, ETag)
+_response_cache: Dict[str, tuple] = {}
+
+
+def current_data_version() -> int:
+    """Changes whenever a new data snapshot is swapped in."""
+    return get_snapshot().version
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """True if the client's If-None-Match header already covers ``etag``."""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(',')]
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
+
+
+async def cached_json_response(request: Request, key: str, build: Callable) -> Response:
+    """
+    Serve a GET payload from the response cache.
+    
+    The payload is built and serialized once per data version; later
+    requests get the stored bytes, or a 304 when the client already has
+    them (If-None-Match).
+    """
+    version = current_data_version()
+    entry = _response_cache.get(key)
+    if entry is None or entry[0] != version:
+        body = dumps_json(await build())
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        entry = (version, body, etag)
+        _response_cache[key] = entry
+    
+    _, body, etag = entry
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type='application/json', headers=headers)
+
+
+def cached_endpoint(key: str):
+    """Decorator: serve an async payload builder through the response cache."""
+    def decorator(build: Callable):
+        async def endpoint(request: Request):
+            return await cached_json_response(request, key, build)
+        endpoint.__name__ = build.__name__
+        endpoint.__doc__ = build.__doc__
+        return endpoint
+    return decorator
+
+
+@dataclass
+class DataSnapshot:
+    """
+    Everything the endpoints serve, loaded together.
+    
+    A snapshot is never modified after it is published: a reload builds a
+    new one and swaps the module-level reference, so a request that has
+    already picked up a snapshot keeps using it until it finishes.
+    """
+    version: int
+    data: Dict[str, Any]
+    metrics: Dict[str, Any]
+    models: Dict[str, tuple] = field(default_factory=dict)
+    forecast_history: Optional[Any] = None       # ForecastHistory of the Random Forest
+    forecasts: Optional[pd.DataFrame] = None     # Hierarchical forecasts (pipeline/forecasting.py)
+    forecast_summary: Dict[str, Any] = field(default_factory=dict)
+    spatial: Dict[str, PincodeIndex] = field(default_factory=dict)   # Zone -> coordinate index
+    tiles: Optional[TileAggregates] = None       # Heatmap cells of every zoom
+    listings: Dict[str, PincodeListing] = field(default_factory=dict)   # Paged pincode tables
+    signature: tuple = ()
+    loaded_at: str = ''
+
+
+def _snapshot_signature() -> tuple:
+    """mtimes of every file a snapshot is built from."""
+    paths = [os.path.join(OUTPUTS_DIR, filename) for filename in OUTPUT_FILES.values()]
+    paths.append(METRICS_FILE)
+    paths.append(os.path.join(OUTPUTS_DIR, DIMENSION_FILE))
+    paths.append(os.path.join(MODELS_DIR, HISTORY_FILE))
+    paths.append(os.path.join(FORECAST_DIR, FORECAST_FILE))
+    paths.append(os.path.join(FORECAST_DIR, SUMMARY_FILE))
+    for name in SERVED_MODELS:
+        model_file, scaler_file = MODEL_FILES[name]
+        paths.append(os.path.join(MODELS_DIR, model_file))
+        paths.append(os.path.join(MODELS_DIR, scaler_file))
+        if name in FLAT_FILES:
+            paths.append(os.path.join(MODELS_DIR, FLAT_FILES[name]))
+    return tuple(_mtime_ns(path) for path in paths)
+
+
+def load_trained_models() -> Dict[str, tuple]:
+    """
+    Load every available (model, scaler) pair listed in SERVED_MODELS.
+
+    Forests are memory-mapped from their flat exports, so API worker
+    processes share one copy of the tree arrays through the page cache.
+    """
+    models = {}
+    for name in SERVED_MODELS:
+        try:
+            loaded = load_model(name, MODELS_DIR)
+            if loaded is None:
+                continue
+            model, scaler = loaded
+            # Requests score a handful of rows: thread fan-out costs more than it saves
+            if hasattr(model, 'n_jobs'):
+                model.n_jobs = 1
+            models[name] = (model, scaler)
+        except Exception as e:
+            print(f"Error loading model {name}: {e}")
+    return models
+
+
+def build_spatial_indexes(data: Dict[str, Any]) -> Dict[str, PincodeIndex]:
+    """Coordinate index of every SPATIAL_ZONES zone whose data is loaded."""
+    indexes = {}
+    for zone, (dataset, category) in SPATIAL_ZONES.items():
+        df = data.get(dataset)
+        if df is None or not {'latitude', 'longitude'} <= set(df.columns):
+            continue
+        if category is not None:
+            if 'activity_category' not in df.columns:
+                continue
+            df = df[df['activity_category'] == category]
+        indexes[zone] = PincodeIndex(df[[c for c in SPATIAL_COLUMNS if c in df.columns]])
+    return indexes
+
+
+def build_tiles(data: Dict[str, Any]) -> Optional[TileAggregates]:
+    """Heatmap cell aggregates of the pincode table (None without coordinates)."""
+    df = data.get('master_pincode_analysis')
+    if df is None or not {'latitude', 'longitude'} <= set(df.columns):
+        return None
+    return TileAggregates(df)
+
+
+def load_snapshot(version: int) -> DataSnapshot:
+    """Load processed outputs, metrics and models into a new snapshot."""
+    # Read the signature first so a file written during the load triggers another reload
+    signature = _snapshot_signature()
+    models = load_trained_models()
+    forecast_history = load_forecast_history(MODELS_DIR)
+    if forecast_history is None:
+        # A forest trained before the series history existed cannot build its features
+        models.pop('random_forest', None)
+    forecasts, forecast_summary = load_forecasts()
+    data = load_real_data()
+    return DataSnapshot(
+        version=version,
+        data=data,
+        metrics=load_model_metrics(),
+        models=models,
+        forecast_history=forecast_history,
+        forecasts=forecasts,
+        forecast_summary=forecast_summary,
+        spatial=build_spatial_indexes(data),
+        tiles=build_tiles(data),
+        listings={name: PincodeListing(data[dataset], version)
+                  for name, dataset in LISTING_DATASETS.items() if dataset in data},
+        signature=signature,
+        loaded_at=datetime.now().isoformat()
+    )
+
+
+_snapshot: Optional[DataSnapshot] = None
+_reload_lock = asyncio.Lock()
+_watcher_task: Optional[asyncio.Task] = None
+
+
+def get_snapshot() -> DataSnapshot:
+    """The snapshot currently being served."""
+    return _snapshot
+
+
+async def reload_snapshot(force: bool = False) -> bool:
+    """
+    Build a new snapshot off the event loop and swap it in.
+    
+    Args:
+        force: Reload even if no source file changed
+    
+    Returns:
+        True if a new snapshot was published
+    """
+    global _snapshot
+    async with _reload_lock:
+        current = _snapshot
+        if not force and current is not None and current.signature == _snapshot_signature():
+            return False
+        version = current.version + 1 if current is not None else 1
+        snapshot = await asyncio.to_thread(load_snapshot, version)
+        _snapshot = snapshot
+        print(f"🔄 Data snapshot v{snapshot.version} - {snapshot.data['source_message']}, "
+              f"{len(snapshot.models)} models")
+        return True
+
+
+async def _watch_outputs():
+    """Poll the pipeline outputs and reload when any of them changes."""
+    while True:
+        await asyncio.sleep(RELOAD_INTERVAL)
+        try:
+            await reload_snapshot()
+        except Exception as e:
+            print(f"⚠️ Snapshot reload failed, still serving v{_snapshot.version}: {e}")
 
 
 @app.on_event("startup")
 async def startup_event():
-    global cached_data
-    cached_data = load_real_data()
-    print(f"🚀 API Started - {cached_data['source_message']}")
+    global _watcher_task
+    await reload_snapshot(force=True)
+    load_raw_data_stats()  # Warm the raw data stats cache
+    if RELOAD_INTERVAL > 0:
+        _watcher_task = asyncio.create_task(_watch_outputs())
+    print(f"🚀 API Started - {_snapshot.data['source_message']}")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if _watcher_task is not None:
+        _watcher_task.cancel()
+
+
+@app.post("/api/admin/reload")
+async def admin_reload(x_admin_token: Optional[str] = Header(default=None)):
+    """Reload processed outputs, metrics and models without restarting the API"""
+    if ADMIN_TOKEN and x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    await reload_snapshot(force=True)
+    snapshot = get_snapshot()
+    return {
+        "version": snapshot.version,
+        "loaded_at": snapshot.loaded_at,
+        "source_message": snapshot.data['source_message'],
+        "models_loaded": sorted(snapshot.models)
+    }
 
 
 @app.get("/")
@@ -395,12 +720,16 @@ async def root():
 @app.get("/api/status")
 async def get_status():
     """Get API and data status"""
+    snapshot = get_snapshot()
+    data = snapshot.data
     raw_stats = load_raw_data_stats()
     return {
         "api_status": "healthy",
-        "is_real_data": cached_data.get('is_real_data', False),
-        "source_message": cached_data.get('source_message', 'Unknown'),
-        "files_loaded": cached_data.get('files_loaded', 0),
+        "is_real_data": data.get('is_real_data', False),
+        "source_message": data.get('source_message', 'Unknown'),
+        "files_loaded": data.get('files_loaded', 0),
+        "data_version": snapshot.version,
+        "data_loaded_at": snapshot.loaded_at,
         "raw_data_stats": raw_stats,
         "timestamp": datetime.now().isoformat()
     }
@@ -409,6 +738,8 @@ async def get_status():
 @app.get("/api/data-overview")
 async def get_data_overview():
     """Get comprehensive overview of all loaded data"""
+    snapshot = get_snapshot()
+    data = snapshot.data
     raw_stats = load_raw_data_stats()
     
     overview = {
@@ -419,15 +750,15 @@ async def get_data_overview():
             "total_raw_records": sum(s['total_records'] for s in raw_stats.values())
         },
         "processed_data": {
-            "files_loaded": cached_data.get('files_loaded', 0),
-            "is_real_data": cached_data.get('is_real_data', False)
+            "files_loaded": data.get('files_loaded', 0),
+            "is_real_data": data.get('is_real_data', False)
         },
         "datasets": []
     }
     
     # Add details for each processed dataset
-    if 'state_enrollment_stats' in cached_data:
-        df = cached_data['state_enrollment_stats']
+    if 'state_enrollment_stats' in data:
+        df = data['state_enrollment_stats']
         overview['datasets'].append({
             "name": "State Enrollment Stats",
             "rows": len(df),
@@ -436,8 +767,8 @@ async def get_data_overview():
             "states_covered": len(df)
         })
     
-    if 'master_pincode_analysis' in cached_data:
-        df = cached_data['master_pincode_analysis']
+    if 'master_pincode_analysis' in data:
+        df = data['master_pincode_analysis']
         overview['datasets'].append({
             "name": "Master Pincode Analysis",
             "rows": len(df),
@@ -446,8 +777,8 @@ async def get_data_overview():
             "unique_states": int(df['state'].nunique())
         })
     
-    if 'cluster_analysis' in cached_data:
-        df = cached_data['cluster_analysis']
+    if 'cluster_analysis' in data:
+        df = data['cluster_analysis']
         overview['datasets'].append({
             "name": "Cluster Analysis",
             "rows": len(df),
@@ -456,8 +787,8 @@ async def get_data_overview():
             "clusters": len(df)
         })
     
-    if 'priority_deployment_pincodes' in cached_data:
-        df = cached_data['priority_deployment_pincodes']
+    if 'priority_deployment_pincodes' in data:
+        df = data['priority_deployment_pincodes']
         overview['datasets'].append({
             "name": "Priority Deployment Pincodes",
             "rows": len(df),
@@ -468,8 +799,11 @@ async def get_data_overview():
 
 
 @app.get("/api/executive-summary")
+@cached_endpoint("executive-summary")
 async def get_executive_summary():
     """Get KPIs and summary data for Executive Summary page"""
+    snapshot = get_snapshot()
+    data = snapshot.data
     
     # Calculate real statistics from loaded data
     total_pincodes = 0
@@ -479,21 +813,21 @@ async def get_executive_summary():
     critical_zones = 0
     
     # Load real model metrics
-    model_metrics = load_model_metrics()
+    model_metrics = snapshot.metrics
     kmeans_score = model_metrics.get('kmeans', {}).get('silhouette_score', 0.9134) * 100
     isolation_anomaly_rate = model_metrics.get('isolation_forest', {}).get('anomaly_rate', 2.0)
     rf_accuracy = model_metrics.get('random_forest', {}).get('accuracy_pct', 6.87)
     
-    if cached_data.get('is_real_data'):
-        if 'state_enrollment_stats' in cached_data:
-            df_state = cached_data['state_enrollment_stats']
+    if data.get('is_real_data'):
+        if 'state_enrollment_stats' in data:
+            df_state = data['state_enrollment_stats']
             total_pincodes = int(df_state['num_pincodes'].sum())
             total_enrolments = int(df_state['total_enrolments'].sum())
             total_demo_updates = int(df_state['demo_updates'].sum())
             total_bio_updates = int(df_state['bio_updates'].sum())
         
-        if 'cluster_analysis' in cached_data:
-            df_cluster = cached_data['cluster_analysis']
+        if 'cluster_analysis' in data:
+            df_cluster = data['cluster_analysis']
             critical_zones = int(df_cluster[df_cluster['Priority'] == 'HIGH']['Pincodes'].sum())
     
     # Use real values if available, otherwise defaults
@@ -578,28 +912,32 @@ async def get_executive_summary():
             {"month": "Nov '25", "enrollments": 546000},
             {"month": "Dec '25", "enrollments": 520000}
         ],
-        "is_real_data": cached_data.get('is_real_data', False)
+        "is_real_data": data.get('is_real_data', False)
     }
 
 
 @app.get("/api/geographic-analysis")
+@cached_endpoint("geographic-analysis")
 async def get_geographic_analysis():
     """Get pincode saturation and geographic data"""
+    snapshot = get_snapshot()
+    data = snapshot.data
     
     total_pincodes = 5000
     critical_zones = 47
     avg_daily_rate = 0
     state_data = []
+    next_cursor = None
     
     # Try to load real data
-    if cached_data.get('is_real_data') and 'master_pincode_analysis' in cached_data:
-        df = cached_data['master_pincode_analysis']
+    if data.get('is_real_data') and 'master_pincode_analysis' in data:
+        df = data['master_pincode_analysis']
         total_pincodes = len(df['pincode'].unique())
         
-        # Get pincode data with real columns
-        pincode_df = df.head(1000).copy()
-        pincode_df = pincode_df.fillna(0)
-        pincode_data = pincode_df.to_dict(orient='records')
+        # First page of the pincode table (/api/pincodes serves the rest)
+        first_page = snapshot.listings['master'].page(limit=1000)
+        pincode_data = first_page['results']
+        next_cursor = first_page['next_cursor']
         
         # Calculate activity categories distribution
         if 'activity_category' in df.columns:
@@ -621,24 +959,25 @@ async def get_geographic_analysis():
         pincode_data = records
     
     # Get state-level data if available
-    if cached_data.get('is_real_data') and 'state_enrollment_stats' in cached_data:
-        df_state = cached_data['state_enrollment_stats']
+    if data.get('is_real_data') and 'state_enrollment_stats' in data:
+        df_state = data['state_enrollment_stats']
         state_data = df_state.head(20).to_dict(orient='records')
         avg_daily_rate = float(df_state['avg_daily_rate'].mean())
     
     # Critical pincodes from real data or defaults
     critical_pincodes = []
-    if cached_data.get('is_real_data') and 'priority_deployment_pincodes' in cached_data:
-        df_priority = cached_data['priority_deployment_pincodes']
+    if data.get('is_real_data') and 'priority_deployment_pincodes' in data:
+        df_priority = data['priority_deployment_pincodes']
         if len(df_priority) > 0:
-            for _, row in df_priority.head(10).iterrows():
-                critical_pincodes.append({
-                    "pincode": str(row.get('pincode', '')),
-                    "state": str(row.get('state', '')).title(),
-                    "district": str(row.get('district', '')).title(),
-                    "total_enrolments": int(row.get('total_enrolments', 0)),
-                    "priority": "Critical"
-                })
+            top = df_priority.head(10)
+            column = lambda name, default: top[name] if name in top.columns else pd.Series(default, index=top.index)
+            critical_pincodes = [
+                {"pincode": str(pincode), "state": str(state).title(), "district": str(district).title(),
+                 "total_enrolments": int(enrolments), "priority": "Critical"}
+                for pincode, state, district, enrolments in zip(
+                    column('pincode', ''), column('state', ''), column('district', ''),
+                    column('total_enrolments', 0).fillna(0))
+            ]
     
     if not critical_pincodes:
         critical_pincodes = [
@@ -655,6 +994,7 @@ async def get_geographic_analysis():
             "deployment_roi": "12x"
         },
         "pincode_data": pincode_data,
+        "pincode_next_cursor": next_cursor,
         "state_data": state_data,
         "critical_pincodes": critical_pincodes,
         "saturation_distribution": [
@@ -663,13 +1003,176 @@ async def get_geographic_analysis():
             {"name": "Medium (40-70%)", "value": 2341, "color": "#FCBF49"},
             {"name": "High (>70%)", "value": 1720, "color": "#1B998B"}
         ],
-        "is_real_data": cached_data.get('is_real_data', False)
+        "is_real_data": data.get('is_real_data', False)
     }
 
 
+def spatial_index(snapshot: DataSnapshot, zone: str) -> PincodeIndex:
+    if zone not in SPATIAL_ZONES:
+        raise HTTPException(status_code=400, detail=f"Unknown zone: {zone} (expected one of {list(SPATIAL_ZONES)})")
+    if zone not in snapshot.spatial:
+        raise HTTPException(status_code=404, detail=f"No coordinates loaded for zone '{zone}'")
+    return snapshot.spatial[zone]
+
+
+def check_point(lat: float, lon: float):
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise HTTPException(status_code=400, detail="lat must be in [-90, 90] and lon in [-180, 180]")
+
+
+def spatial_response(index: PincodeIndex, rows: np.ndarray, distances: Optional[np.ndarray] = None,
+                     total: Optional[int] = None) -> Response:
+    """Serialize the selected index rows (with distances in km when given)."""
+    results = index.frame.iloc[rows].replace({np.nan: None})
+    if distances is not None:
+        results = results.assign(distance_km=np.round(distances, 3))
+    total = len(rows) if total is None else total
+    payload = {
+        "count": len(results),
+        "truncated": total > len(results),
+        "results": results.to_dict(orient='records'),
+    }
+    return Response(content=dumps_json(payload), media_type='application/json')
+
+
+@app.get("/api/spatial/within")
+async def get_pincodes_within(lat: float, lon: float, radius_km: float = 25.0,
+                              limit: int = 500, zone: str = 'all'):
+    """
+    Pincodes within ``radius_km`` of a point, nearest first
+    
+    zone is all, critical or priority; at most ``limit`` results
+    (``truncated`` tells whether more pincodes were in range).
+    """
+    check_point(lat, lon)
+    if radius_km <= 0:
+        raise HTTPException(status_code=400, detail="radius_km must be positive")
+    index = spatial_index(get_snapshot(), zone)
+    limit = max(1, min(limit, MAX_SPATIAL_RESULTS))
+    rows, distances = index.within(lat, lon, radius_km)
+    return spatial_response(index, rows[:limit], distances[:limit], total=len(rows))
+
+
+@app.get("/api/spatial/nearest")
+async def get_nearest_pincodes(lat: float, lon: float, k: int = 10, zone: str = 'critical'):
+    """The ``k`` pincodes of a zone nearest to a point (default: critical zones)"""
+    check_point(lat, lon)
+    index = spatial_index(get_snapshot(), zone)
+    rows, distances = index.nearest(lat, lon, max(1, min(k, MAX_SPATIAL_RESULTS)))
+    return spatial_response(index, rows, distances)
+
+
+@app.get("/api/spatial/bbox")
+async def get_pincodes_in_viewport(south: float, west: float, north: float, east: float,
+                                   limit: int = 2000, zone: str = 'all'):
+    """
+    Pincodes inside a map viewport
+    
+    west > east selects a viewport crossing the antimeridian; at most
+    ``limit`` results, in latitude order.
+    """
+    check_point(south, west)
+    check_point(north, east)
+    if south > north:
+        raise HTTPException(status_code=400, detail="south must not be above north")
+    index = spatial_index(get_snapshot(), zone)
+    rows = index.bbox(south, west, north, east)
+    return spatial_response(index, rows[:max(1, min(limit, MAX_SPATIAL_RESULTS))], total=len(rows))
+
+
+@app.get("/api/pincodes")
+async def get_pincodes(dataset: str = 'master', state: Optional[str] = None, district: Optional[str] = None,
+                       category: Optional[str] = None, sort: str = 'row', order: str = 'asc',
+                       cursor: Optional[str] = None, limit: int = 100, fields: Optional[str] = None):
+    """
+    Filtered, sorted and paged rows of a pincode-level table
+    
+    dataset is master or priority; state, district and category
+    (activity_category) are exact, case-insensitive filters; fields is a
+    comma-separated projection. Pass ``next_cursor`` back as ``cursor``
+    for the next page (cursors expire when the data is reloaded: 410;
+    a malformed cursor is a 400 like any invalid parameter).
+    """
+    snapshot = get_snapshot()
+    if dataset not in LISTING_DATASETS:
+        raise HTTPException(status_code=400, detail=f"Unknown dataset: {dataset} (expected one of {list(LISTING_DATASETS)})")
+    if dataset not in snapshot.listings:
+        raise HTTPException(status_code=404, detail=f"Dataset '{dataset}' is not loaded")
+    if order not in ('asc', 'desc'):
+        raise HTTPException(status_code=400, detail="order must be asc or desc")
+    listing = snapshot.listings[dataset]
+    try:
+        page = listing.page(
+            state=state, district=district, category=category, sort=sort, descending=order == 'desc',
+            cursor=cursor, limit=min(limit, MAX_PAGE_SIZE),
+            fields=[f.strip() for f in fields.split(',') if f.strip()] if fields else None
+        )
+    except CursorError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    page['total_rows'] = len(listing)
+    page['data_version'] = snapshot.version
+    return Response(content=dumps_json(page), media_type='application/json')
+
+
+def tile_payload(result: Optional[Dict[str, Any]], zoom: int, x: Optional[int] = None,
+                 y: Optional[int] = None) -> Dict[str, Any]:
+    """Columnar cell payload (one list per field) of a tile or zoom level."""
+    cells = result['cells'] if result else {}
+    return {
+        "zoom": zoom,
+        "x": x,
+        "y": y,
+        "cell_zoom": result['cell_zoom'] if result else None,
+        "count": len(cells.get('x', [])),
+        "cells": {name: values.tolist() for name, values in cells.items()},
+    }
+
+
+@app.get("/api/tiles/{z}/{x}/{y}")
+async def get_map_tile(request: Request, z: int, x: int, y: int):
+    """
+    Heatmap cells of a Web Mercator tile
+    
+    Pincodes are aggregated into a 16 x 16 grid of cells per tile
+    (pincodes, enrolments, activity, avg_daily_rate, critical_share and
+    the mean lat/lon of each cell). Built once per data version.
+    """
+    tiles = get_snapshot().tiles
+    if tiles is None:
+        raise HTTPException(status_code=404, detail="No pincode coordinates loaded")
+    if not (0 <= z <= MAX_CELL_ZOOM and 0 <= x < (1 << z) and 0 <= y < (1 << z)):
+        raise HTTPException(status_code=400, detail=f"Invalid tile {z}/{x}/{y} (zoom 0-{MAX_CELL_ZOOM})")
+    result = tiles.tile(z, x, y)
+    if result is None:
+        # Empty tiles are not cached (any z/x/y may be requested)
+        return Response(content=dumps_json(tile_payload(None, z, x, y)), media_type='application/json')
+    
+    async def build():
+        return tile_payload(get_snapshot().tiles.tile(z, x, y), z, x, y)
+    
+    return await cached_json_response(request, f"tile:{z}:{x}:{y}", build)
+
+
+@app.get("/api/heatmap")
+async def get_heatmap(request: Request, zoom: int = 6):
+    """Every heatmap cell of one zoom level (the national picture)"""
+    if get_snapshot().tiles is None:
+        raise HTTPException(status_code=404, detail="No pincode coordinates loaded")
+    zoom = min(max(zoom, 0), MAX_CELL_ZOOM)
+    
+    async def build():
+        return tile_payload(get_snapshot().tiles.level(zoom), zoom)
+    
+    return await cached_json_response(request, f"heatmap:{zoom}", build)
+
+
 @app.get("/api/fraud-detection")
 async def get_fraud_detection():
     """Get fraud detection and anomaly data"""
+    snapshot = get_snapshot()
+    data = snapshot.data
     
     # Risk distribution
     risk_distribution = [
@@ -721,13 +1224,16 @@ async def get_fraud_detection():
             "message": "2,340 suspicious transactions detected from 45 devices in the last 30 days.",
             "recommendation": "Immediate investigation and device blacklisting recommended."
         },
-        "is_real_data": cached_data.get('is_real_data', False)
+        "is_real_data": data.get('is_real_data', False)
     }
 
 
 @app.get("/api/life-events")
+@cached_endpoint("life-events")
 async def get_life_events():
     """Get life event sequence analysis data"""
+    snapshot = get_snapshot()
+    data = snapshot.data
     
     # Sankey flow data
     flows = [
@@ -765,13 +1271,84 @@ async def get_life_events():
             "flows": flows
         },
         "patterns": patterns,
-        "is_real_data": cached_data.get('is_real_data', False)
+        "is_real_data": data.get('is_real_data', False)
+    }
+
+
+def demand_forecast_payload(snapshot: DataSnapshot, level: str, key: Optional[str],
+                            state: Optional[str]) -> Dict[str, Any]:
+    """History, reconciled forecast and staffing plan of one geography."""
+    series = select_series(snapshot.forecasts, level, key, state)
+    if series.empty:
+        raise HTTPException(status_code=404, detail=f"No forecast for {level} '{key}'")
+    
+    history = series[series['actual'].notna()]
+    future = series[series['forecast'].notna()]
+    month = lambda period: pd.Timestamp(period).strftime("%b '%y")
+    historical = [
+        {"month": month(row.period), "enrollments": int(row.actual), "predicted": None}
+        for row in history.itertuples(index=False)
+    ]
+    forecast = [
+        {"month": month(row.period), "enrollments": None, "predicted": int(round(row.forecast)),
+         "lower_bound": int(row.lower), "upper_bound": int(np.ceil(row.upper))}
+        for row in future.itertuples(index=False)
+    ]
+    
+    summary = snapshot.forecast_summary
+    wape = summary.get('holdout', {}).get(level, {}).get('wape')
+    last_actual = float(history['actual'].iloc[-1]) if len(history) else 0.0
+    peak = future.loc[future['forecast'].idxmax()] if len(future) else None
+    surge = (peak['forecast'] / last_actual - 1) * 100 if peak is not None and last_actual > 0 else 0.0
+    rf_metrics = snapshot.metrics.get('random_forest', {})
+    
+    return {
+        "geography": {"level": level, "key": str(series['key'].iloc[0]),
+                      "state": series['state'].iloc[0] if pd.notna(series['state'].iloc[0]) else None},
+        "summary": {
+            "model_accuracy": round(100 - wape, 1) if wape is not None else None,
+            "mape": wape,
+            "peak_month": pd.Timestamp(peak['period']).strftime('%B') if peak is not None else None,
+            "peak_surge": f"{surge:+.0f}%",
+            "real_rf_r2": rf_metrics.get('test_r2', None),
+            "real_rf_mae": rf_metrics.get('mae', None),
+            "generated_at": summary.get('generated_at')
+        },
+        "historical": historical,
+        "forecast": forecast,
+        "staffing": staffing_plan(series),
+        "is_real_data": True
     }
 
 
 @app.get("/api/demand-forecast")
-async def get_demand_forecast():
-    """Get Random Forest forecast and staffing data"""
+async def get_demand_forecast(request: Request, level: str = 'national', key: Optional[str] = None,
+                              state: Optional[str] = None):
+    """
+    Get demand forecast and staffing data for a geography
+    
+    level is national, state, district or pincode; key names the state,
+    district or pincode (first one of the level if omitted) and state
+    disambiguates district names. Forecasts are reconciled bottom-up and
+    refreshed nightly by ``python -m pipeline.forecasting``; until they
+    exist the static national plan is served.
+    """
+    if level not in FORECAST_LEVELS:
+        raise HTTPException(status_code=400, detail=f"Unknown level: {level}")
+    
+    async def build():
+        snapshot = get_snapshot()
+        if snapshot.forecasts is None:
+            return static_demand_forecast(snapshot)
+        return demand_forecast_payload(snapshot, level, key, state)
+    
+    # One cache entry per geography (bounded by the number of series)
+    return await cached_json_response(request, f"demand-forecast:{level}:{key}:{state}", build)
+
+
+def static_demand_forecast(snapshot: DataSnapshot) -> Dict[str, Any]:
+    """Fixed national forecast served before the first forecast refit."""
+    data = snapshot.data
     
     # Historical data (2025 - based on actual dataset)
     historical = [
@@ -811,7 +1388,7 @@ async def get_demand_forecast():
     ]
     
     # Load real model metrics
-    model_metrics = load_model_metrics()
+    model_metrics = snapshot.metrics
     kmeans_score = model_metrics.get('kmeans', {}).get('silhouette_score', 0.9134) * 100
     rf_metrics = model_metrics.get('random_forest', {})
     
@@ -830,14 +1407,16 @@ async def get_demand_forecast():
             "base_staff": base_staff,
             "plan": staffing
         },
-        "is_real_data": cached_data.get('is_real_data', False)
+        "is_real_data": data.get('is_real_data', False)
     }
 
 
 @app.get("/api/model-metrics")
+@cached_endpoint("model-metrics")
 async def get_model_metrics():
     """Get real trained model metrics from the metrics file"""
-    model_metrics = load_model_metrics()
+    snapshot = get_snapshot()
+    model_metrics = snapshot.metrics
     
     return {
         "source": "outputs/metrics/model_metrics.json",
@@ -852,8 +1431,11 @@ async def get_model_metrics():
 
 
 @app.get("/api/recommendations")
+@cached_endpoint("recommendations")
 async def get_recommendations():
     """Get actionable recommendations with ROI"""
+    snapshot = get_snapshot()
+    data = snapshot.data
     
     recommendations = [
         {
@@ -917,7 +1499,7 @@ async def get_recommendations():
             "total_returns": "₹64 Cr",
             "overall_roi": "15x"
         },
-        "is_real_data": cached_data.get('is_real_data', False)
+        "is_real_data": data.get('is_real_data', False)
     }
 
 
@@ -926,6 +1508,113 @@ if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
 
 
+# K-Means volume tiers (pipeline.scoring.TIER_*) -> (name, priority, action)
+CLUSTER_TIERS = [
+    ("High Volume Zone", "Priority 1 - Needs additional resources", "Deploy mobile van and additional staff"),
+    ("Medium Volume Zone", "Priority 2 - Monitor closely", "Schedule periodic camps"),
+    ("Low Volume Zone", "Priority 3 - Standard service", "Maintain current service level"),
+]
+
+
+def request_frame(request: PredictionRequest) -> pd.DataFrame:
+    """One enrolment record built from a prediction request."""
+    return normalize_records(pd.DataFrame({
+        'pincode': [request.pincode],
+        **{col: [getattr(request, col) or 0] for col in COUNT_COLUMNS}
+    }))
+
+
+def predict_fraud(model, scaler, frame: pd.DataFrame, snapshot: DataSnapshot) -> Dict[str, Any]:
+    """Score a record with the trained Isolation Forest."""
+    scores = score_anomalies(model, scaler, frame)
+    anomaly_score = float(scores['anomaly_score'].iloc[0])
+    is_anomaly = bool(scores['is_anomaly'].iloc[0])
+    threshold = float(-model.offset_)
+    contamination = snapshot.metrics.get('isolation_forest', {}).get('contamination', 0.02)
+    total_enrollments = int(frame[COUNT_COLUMNS].to_numpy().sum())
+    
+    return {
+        "model": "Isolation Forest",
+        "model_loaded": True,
+        "prediction": "ANOMALY DETECTED 🚨" if is_anomaly else "NORMAL ✅",
+        "confidence": f"{(anomaly_score * 100 if is_anomaly else (1 - anomaly_score) * 100):.1f}",
+        "risk_level": "HIGH" if is_anomaly else "LOW",
+        "details": {
+            "anomaly_score": f"{anomaly_score:.4f}",
+            "threshold": f"{threshold:.4f}",
+            "total_enrollments": total_enrollments,
+            "contamination": f"{contamination:.2%}",
+            "model_type": "Isolation Forest (trained)",
+            "recommendation": "Flag for manual review. Unusual enrollment pattern detected." if is_anomaly
+                             else "No action needed. Pattern within normal range."
+        }
+    }
+
+
+def predict_cluster(model, scaler, frame: pd.DataFrame, snapshot: DataSnapshot) -> Dict[str, Any]:
+    """Assign a record to a trained K-Means segment."""
+    assigned = assign_clusters(model, scaler, frame)
+    cluster = int(assigned['cluster'].iloc[0])
+    cluster_name, priority, recommendation = CLUSTER_TIERS[int(assigned['tier'].iloc[0])]
+    
+    kmeans_metrics = snapshot.metrics.get('kmeans', {})
+    silhouette = kmeans_metrics.get('silhouette_score', 0.9134)
+    
+    return {
+        "model": "K-Means Clustering",
+        "model_loaded": True,
+        "prediction": f"Cluster {cluster}: {cluster_name}",
+        "confidence": f"{silhouette * 100:.2f}",
+        "cluster_id": cluster,
+        "details": {
+            "silhouette_score": f"{silhouette:.4f}",
+            "n_clusters": int(model.n_clusters),
+            "cluster_name": cluster_name,
+            "priority_level": priority,
+            "model_type": "K-Means (trained)",
+            "recommendation": recommendation
+        }
+    }
+
+
+def predict_forecast(model, scaler, frame: pd.DataFrame, snapshot: DataSnapshot) -> Dict[str, Any]:
+    """Forecast the pincode's next period with the trained Random Forest."""
+    rf_metrics = snapshot.metrics.get('random_forest', {})
+    history = snapshot.forecast_history
+    result = forecast_demand(model, scaler, frame, history)
+    forecast = int(round(float(result['predicted_value'].iloc[0])))
+    lower = float(result['lower_bound'].iloc[0])
+    upper = float(result['upper_bound'].iloc[0])
+    
+    base_enrollment = int(frame[COUNT_COLUMNS].to_numpy().sum())
+    accuracy = rf_metrics.get('accuracy_pct', 93.1)
+    trend = "📈 Increasing" if forecast > base_enrollment else "📉 Decreasing"
+    
+    return {
+        "model": "Random Forest Regressor",
+        "model_loaded": True,
+        "prediction": f"{forecast:,} enrollments",
+        "confidence": f"{accuracy:.1f}",
+        "details": {
+            "predicted_value": forecast,
+            "lower_bound": int(lower),
+            "upper_bound": int(np.ceil(upper)),
+            "trend": trend,
+            "forecast_period": history.target_period(with_latest=True),
+            "model_type": "Random Forest (trained)",
+            "recommendation": f"Plan for {max(1, forecast // 50)} staff members"
+        }
+    }
+
+
+# Request model_type -> (snapshot model name, predictor)
+PREDICTORS = {
+    'fraud': ('isolation_forest', predict_fraud),
+    'cluster': ('kmeans', predict_cluster),
+    'forecast': ('random_forest', predict_forecast),
+}
+
+
 @app.post("/api/predict")
 async def predict(request: PredictionRequest):
     """
@@ -935,14 +1624,24 @@ async def predict(request: PredictionRequest):
     - fraud: Isolation Forest for anomaly detection
     - cluster: K-Means for location grouping
     - forecast: Random Forest for demand prediction
+    
+    Models are held in memory by the data snapshot; if an artifact has not
+    been trained yet the rule-based fallback below is used.
     """
+    snapshot = get_snapshot()
     
     try:
+        # Trained model kept resident in the snapshot
+        model_name, predictor = PREDICTORS.get(request.model_type, (None, None))
+        if model_name in snapshot.models:
+            model, scaler = snapshot.models[model_name]
+            return predictor(model, scaler, request_frame(request), snapshot)
+        
         # Prepare input features
         total_enrollments = (request.age_0_5 or 0) + (request.age_5_17 or 0) + (request.age_18_greater or 0)
         
         # Load model metrics for reporting
-        model_metrics = load_model_metrics()
+        model_metrics = snapshot.metrics
         
         if request.model_type == 'fraud':
             # Intelligent rule-based fraud detection
@@ -970,7 +1669,7 @@ async def predict(request: PredictionRequest):
             
             return {
                 "model": "Isolation Forest",
-                "model_loaded": True,
+                "model_loaded": False,
                 "prediction": "ANOMALY DETECTED 🚨" if is_anomaly else "NORMAL ✅",
                 "confidence": f"{(anomaly_score * 100 if is_anomaly else (1 - anomaly_score) * 100):.1f}",
                 "risk_level": "HIGH" if is_anomaly else "LOW",
@@ -1000,7 +1699,7 @@ async def predict(request: PredictionRequest):
             
             return {
                 "model": "K-Means Clustering",
-                "model_loaded": True,
+                "model_loaded": False,
                 "prediction": f"Cluster {cluster}: {cluster_name}",
                 "confidence": f"{silhouette * 100:.2f}",
                 "cluster_id": cluster,
@@ -1032,7 +1731,7 @@ async def predict(request: PredictionRequest):
             
             return {
                 "model": "Random Forest Regressor",
-                "model_loaded": True,
+                "model_loaded": False,
                 "prediction": f"{forecast:,} enrollments",
                 "confidence": f"{accuracy:.1f}",
                 "details": {
@@ -1048,5 +1747,119 @@ async def predict(request: PredictionRequest):
         else:
             raise HTTPException(status_code=400, detail=f"Unknown model type: {request.model_type}")
     
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+
+# Batch prediction: rows per streamed chunk of the response
+BATCH_STREAM_ROWS = 10000
+ARROW_CONTENT_TYPES = ('application/vnd.apache.arrow.stream', 'application/vnd.apache.arrow.file')
+
+
+def parse_batch_records(body: bytes, content_type: str) -> tuple:
+    """
+    Parse a batch upload into a DataFrame of records.
+    
+    Supported bodies:
+        - application/json: a list of records, or an object with
+          ``records`` (list of records or column -> values) and an
+          optional ``model_type``
+        - text/csv: one record per line with a header row
+        - Arrow IPC stream/file
+    
+    Returns:
+        (records DataFrame, model_type from the JSON body or None)
+    """
+    model_type = None
+    if content_type.startswith('text/csv'):
+        return pd.read_csv(io.BytesIO(body)), None
+    if content_type.startswith(ARROW_CONTENT_TYPES):
+        if not HAS_PYARROW:
+            raise HTTPException(status_code=415, detail="Arrow uploads need pyarrow installed")
+        if content_type.startswith('application/vnd.apache.arrow.file'):
+            table = pa.ipc.open_file(pa.BufferReader(body)).read_all()
+        else:
+            table = pa.ipc.open_stream(pa.BufferReader(body)).read_all()
+        return table.to_pandas(), None
+    
+    payload = orjson.loads(body) if HAS_ORJSON else json.loads(body)
+    if isinstance(payload, dict):
+        model_type = payload.get('model_type')
+        payload = payload.get('records', [])
+    return pd.DataFrame(payload), model_type
+
+
+def score_batch(snapshot: DataSnapshot, model_type: str, records: pd.DataFrame) -> pd.DataFrame:
+    """Score every record with one vectorized call of the requested model."""
+    model_name = PREDICTORS[model_type][0]
+    model, scaler = snapshot.models[model_name]
+    
+    if model_type == 'fraud':
+        scores = score_anomalies(model, scaler, records)
+    elif model_type == 'cluster':
+        scores = assign_clusters(model, scaler, records)
+        tier_names = np.array([name for name, _, _ in CLUSTER_TIERS])
+        scores['cluster_name'] = tier_names[scores['tier'].to_numpy()]
+    else:
+        scores = forecast_demand(model, scaler, records, snapshot.forecast_history)
+    
+    return pd.concat([records[['pincode']], scores], axis=1)
+
+
+def _stream_scores(scores: pd.DataFrame, as_csv: bool):
+    """Yield the scored frame in chunks (CSV or newline-delimited JSON)."""
+    for start in range(0, len(scores), BATCH_STREAM_ROWS):
+        chunk = scores.iloc[start:start + BATCH_STREAM_ROWS]
+        if as_csv:
+            yield chunk.to_csv(index=False, header=(start == 0))
+        else:
+            text = chunk.to_json(orient='records', lines=True, double_precision=6)
+            yield text if text.endswith('\n') else text + '\n'
+
+
+@app.post("/api/predict/batch")
+async def predict_batch(request: Request, model_type: Optional[str] = None):
+    """
+    📦 Batch ML Prediction Endpoint
+    
+    Scores many records (e.g. every pincode of a district) in one call:
+    one feature matrix, one vectorized model call. Upload JSON, CSV or
+    Arrow IPC (see ``parse_batch_records``); ``model_type`` comes from the
+    query string or the JSON body.
+    
+    Results keep the input order and are streamed back as newline-delimited
+    JSON, or as CSV when the client sends ``Accept: text/csv``.
+    """
+    snapshot = get_snapshot()
+    content_type = request.headers.get('content-type', 'application/json')
+    body = await request.body()
+    
+    try:
+        records, body_model_type = await asyncio.to_thread(parse_batch_records, body, content_type)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not parse batch upload: {e}")
+    
+    model_type = model_type or body_model_type
+    if model_type not in PREDICTORS:
+        raise HTTPException(status_code=400, detail=f"Unknown model type: {model_type}")
+    if PREDICTORS[model_type][0] not in snapshot.models:
+        raise HTTPException(status_code=503, detail=f"Model for '{model_type}' has not been trained yet")
+    if records.empty:
+        raise HTTPException(status_code=400, detail="No records to score")
+    
+    try:
+        records = normalize_records(records)
+        scores = await asyncio.to_thread(score_batch, snapshot, model_type, records)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+    
+    as_csv = 'text/csv' in request.headers.get('accept', '')
+    return StreamingResponse(
+        _stream_scores(scores, as_csv),
+        media_type='text/csv' if as_csv else 'application/x-ndjson',
+        headers={'X-Rows-Scored': str(len(scores)), 'X-Data-Version': str(snapshot.version)}
+    )
@@ -16,19 +16,20 @@ Date: January 2026
 
 import pandas as pd
 import numpy as np
-import glob
 import os
 import joblib
 import json
+import sys
+import time
+import argparse
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
 # Scikit-learn imports
-from sklearn.ensemble import IsolationForest, RandomForestRegressor, GradientBoostingRegressor
-from sklearn.cluster import DBSCAN, KMeans
+from sklearn.ensemble import IsolationForest, RandomForestRegressor
 from sklearn.preprocessing import StandardScaler, MinMaxScaler, LabelEncoder
-from sklearn.model_selection import train_test_split, cross_val_score, TimeSeriesSplit
+from sklearn.model_selection import cross_val_score, TimeSeriesSplit
 from sklearn.metrics import (
     accuracy_score, precision_score, recall_score, f1_score,
     mean_absolute_error, mean_squared_error, r2_score,
@@ -36,14 +37,7 @@ from sklearn.metrics import (
 )
 from sklearn.linear_model import LinearRegression, Ridge
 from sklearn.neighbors import LocalOutlierFactor
-
-# Try importing XGBoost (optional)
-try:
-    import xgboost as xgb
-    HAS_XGBOOST = True
-except ImportError:
-    HAS_XGBOOST = False
-    print("⚠️ XGBoost not installed, using GradientBoosting instead")
+from threadpoolctl import threadpool_limits
 
 print("="*70)
 print("🤖 AADHAAR INTELLIGENCE - ML MODEL TRAINING PIPELINE")
@@ -59,6 +53,108 @@ DATA_DIR = os.path.join(BASE_DIR, 'data')
 OUTPUT_DIR = os.path.join(BASE_DIR, 'outputs')
 MODELS_DIR = os.path.join(BASE_DIR, 'models', 'trained')
 
+# Cores shared by the concurrently running trainers
+TRAIN_CORES = int(os.environ.get('AADHAAR_TRAIN_CORES', os.cpu_count() or 1))
+
+# Shard loading: parser processes and memory ceiling for CSV shards being parsed
+LOAD_WORKERS = int(os.environ.get('AADHAAR_LOAD_WORKERS', os.cpu_count() or 1))
+LOAD_MEMORY_LIMIT_MB = float(os.environ.get('AADHAAR_LOAD_MEMORY_MB', 0)) or None
+
+# Shared ingestion store (pipeline/ lives at the repository root)
+sys.path.insert(0, BASE_DIR)
+from pipeline.store import load_dataset, build_store, iter_month_batches, STORE_DIR, HAS_PYARROW
+from pipeline.manifest import load_manifest
+from pipeline import features as feature_module
+from pipeline import stage_cache
+from pipeline.dag import Stage, run_dag
+from pipeline.streaming import Reservoir, monthly_profiles
+from pipeline import clustering, streaming, artifacts, normalize
+from pipeline.artifacts import export_forest, load_forest, check_parity, artifact_stats
+from pipeline.scoring import FLAT_FILES
+from pipeline.clustering import (
+    partitioned_dbscan, stratified_sample, kmeans_sweep, streaming_kmeans, predict_chunked
+)
+from pipeline.features import (
+    PROFILE_KEYS, PROFILE_COLUMNS, COUNT_COLUMNS, pincode_profile, profile_features, cluster_features
+)
+from pipeline import timeseries
+from pipeline.timeseries import (
+    SERIES_TARGET, ForecastHistory, series_matrix, cached_feature_frame, feature_columns, period_split,
+    save_history
+)
+from pipeline import tuning
+from pipeline.profiling import Profiler, PROFILE_MODES, phase, set_rows, compare as compare_profiles
+from pipeline.tuning import (
+    HAS_XGBOOST, TUNED_MODELS, fit_boosting, successive_halving, save_best_params, load_best_params
+)
+from pipeline.scoring import HISTORY_FILE
+
+# XGBoost is optional (pipeline/tuning.py fits the boosting model with either)
+if not HAS_XGBOOST:
+    print("⚠️ XGBoost not installed, using GradientBoosting instead")
+
+# Content-addressed cache of trained stages (see pipeline/stage_cache.py)
+CACHE_DIR = os.path.join(MODELS_DIR, 'cache')
+
+# Per-stage timing / memory / throughput of the last run, and optional profile dumps
+PROFILE_PATH = os.path.join(OUTPUT_DIR, 'metrics', 'training_profile.json')
+PROFILE_DUMP_DIR = os.path.join(OUTPUT_DIR, 'metrics', 'profiles')
+
+# Hyperparameter search results (models/train_models.py --tune, see pipeline/tuning.py)
+BEST_PARAMS_PATH = os.path.join(OUTPUT_DIR, 'metrics', 'best_params.json')
+
+# Hyperparameters per model - part of each stage's cache key
+MODEL_PARAMS = {
+    'isolation_forest': {
+        'n_estimators': 200,            # More trees = better accuracy
+        'contamination': 0.02,          # 2% anomaly rate
+        'max_samples': 'auto',
+        'reservoir_size': 200000,       # Pincode-days the forest is fitted on
+        'batch_rows': 100000,           # Records per streamed batch
+        'random_state': 42,
+    },
+    'dbscan': {
+        'eps': 0.5,                     # Maximum distance between samples
+        'min_samples': 5,               # Minimum samples in a cluster
+        'partition_points': 20000,      # Unique points per partition (bounds memory)
+        'silhouette_sample': 20000,     # Rows used for the silhouette score
+        'random_state': 42,
+    },
+    'random_forest': {
+        'n_estimators': 100,
+        'max_depth': 10,                # Reduced from 15 to prevent overfitting
+        'min_samples_split': 10,        # Increased for regularization
+        'min_samples_leaf': 5,          # Increased for regularization
+        'max_features': 'sqrt',         # Feature subsampling for regularization
+        'level': 'pincode',             # Series forecast (see pipeline/timeseries.py)
+        'freq': 'D',                    # Daily periods
+        'test_fraction': 0.2,           # Latest periods held out
+        'random_state': 42,
+    },
+    'gradient_boosting': {
+        'n_estimators': 500,            # Round limit (early stopping picks the count)
+        'max_depth': 6,
+        'learning_rate': 0.1,
+        'subsample': 0.8,
+        'colsample_bytree': 0.8,        # XGBoost only
+        'min_child_weight': 1,          # min_samples_leaf without XGBoost
+        'early_stopping_rounds': 30,    # Rounds without validation improvement
+        'validation_fraction': 0.2,     # Latest training periods used for early stopping
+        'random_state': 42,
+    },
+    'kmeans': {
+        'k_min': 2,
+        'k_max': 7,
+        'batch_size': 4096,             # MiniBatchKMeans batch
+        'chunk_rows': 100000,           # Rows per partial_fit / predict chunk
+        'epochs': 2,                    # partial_fit passes of the final model
+        'silhouette_sample': 20000,     # Stratified (by state) rows for silhouette
+        'n_init': 3,
+        'max_iter': 100,
+        'random_state': 42,
+    },
+}
+
 # Create directories
 os.makedirs(MODELS_DIR, exist_ok=True)
 os.makedirs(os.path.join(OUTPUT_DIR, 'metrics'), exist_ok=True)
@@ -70,142 +166,150 @@ print()
 # ============================================
 # LOAD DATA
 # ============================================
-def load_all_data():
-    """Load all UIDAI datasets"""
+def load_training_data():
+    """
+    Load the enrolment records of the in-memory trainers from the columnar
+    ingestion store (the only dataset the trainers read).
+    """
     print("📊 LOADING UIDAI DATASETS...")
     print("-"*50)
     
     datasets = {}
-    
-    # Load Enrollment Data
-    enrol_pattern = os.path.join(DATA_DIR, 'enrolment', '**', '*.csv')
-    enrol_files = glob.glob(enrol_pattern, recursive=True)
-    if enrol_files:
-        df_list = [pd.read_csv(f) for f in enrol_files]
-        datasets['enrollment'] = pd.concat(df_list, ignore_index=True)
-        print(f"✅ Enrollment: {len(datasets['enrollment']):,} records from {len(enrol_files)} files")
-    
-    # Load Demographic Data
-    demo_pattern = os.path.join(DATA_DIR, 'demographic', '**', '*.csv')
-    demo_files = glob.glob(demo_pattern, recursive=True)
-    if demo_files:
-        df_list = [pd.read_csv(f) for f in demo_files]
-        datasets['demographic'] = pd.concat(df_list, ignore_index=True)
-        print(f"✅ Demographic: {len(datasets['demographic']):,} records from {len(demo_files)} files")
-    
-    # Load Biometric Data
-    bio_pattern = os.path.join(DATA_DIR, 'biometric', '**', '*.csv')
-    bio_files = glob.glob(bio_pattern, recursive=True)
-    if bio_files:
-        df_list = [pd.read_csv(f) for f in bio_files]
-        datasets['biometric'] = pd.concat(df_list, ignore_index=True)
-        print(f"✅ Biometric: {len(datasets['biometric']):,} records from {len(bio_files)} files")
+    df = load_dataset('enrolment', workers=LOAD_WORKERS, memory_limit_mb=LOAD_MEMORY_LIMIT_MB)
+    if df is not None:
+        datasets['enrollment'] = df
+        print(f"✅ Enrollment: {len(df):,} records from {STORE_DIR}/enrolment")
     
     print()
     return datasets
 
+
+def streaming_available():
+    """True when the Isolation Forest can stream the store instead of loaded data."""
+    return HAS_PYARROW and os.path.isdir(os.path.join(STORE_DIR, 'enrolment'))
+
 # ============================================
 # MODEL 1: ISOLATION FOREST (Anomaly Detection)
 # ============================================
-def train_isolation_forest(data):
+def train_isolation_forest(data, params=MODEL_PARAMS['isolation_forest'], n_jobs=-1):
     """
     Train Isolation Forest for fraud/anomaly detection.
     
     Best for: Detecting unusual enrollment patterns, suspicious pincodes
     Algorithm: Isolation Forest (unsupervised anomaly detection)
     Contamination: 2% (assumes 2% of data are anomalies)
+    
+    With the Parquet store available the pincode-day profiles are built
+    out of core: records are streamed month by month, the scaler is fitted
+    with partial_fit and the forest on a reservoir sample of pincode-days.
     """
     print("="*70)
     print("🚨 MODEL 1: ISOLATION FOREST (Anomaly Detection)")
     print("="*70)
     
-    # Prepare features
-    df = data['enrollment'].copy()
-    
-    # Get numeric columns for features
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    model = IsolationForest(
+        n_estimators=params['n_estimators'],
+        contamination=params['contamination'],
+        max_samples=params['max_samples'],
+        random_state=params['random_state'],
+        n_jobs=n_jobs,              # Core budget from the scheduler
+        verbose=0
+    )
+    results_path = os.path.join(OUTPUT_DIR, 'fraud_predictions.csv')
     
-    # Create aggregated features if we have pincode/district data
-    if 'Pincode' in df.columns or 'pincode' in df.columns:
-        pincode_col = 'Pincode' if 'Pincode' in df.columns else 'pincode'
-        
-        # Aggregate by pincode
-        agg_features = df.groupby(pincode_col).agg({
-            col: ['sum', 'mean', 'std'] for col in numeric_cols if col != pincode_col
-        }).reset_index()
-        agg_features.columns = ['_'.join(col).strip('_') for col in agg_features.columns]
+    def write_predictions(X_part, first):
+        predictions = model.predict(X_part)
+        pd.DataFrame({
+            'anomaly_score': model.decision_function(X_part),
+            'prediction': predictions,
+            'is_anomaly': predictions == -1
+        }).to_csv(results_path, mode='w' if first else 'a', header=first, index=False)
+        return int((predictions == -1).sum())
+    
+    streaming = streaming_available()
+    phase('profile_and_scale')
+    if streaming:
+        # Out of core: stream the store month by month, memory stays flat as shards grow
+        def profiles():
+            batches = iter_month_batches('enrolment', columns=PROFILE_KEYS + COUNT_COLUMNS,
+                                         batch_rows=params['batch_rows'])
+            for _, profile in monthly_profiles(batches):
+                if len(profile):
+                    yield profile_features(profile)
         
-        # Fill NaN with 0
-        agg_features = agg_features.fillna(0)
-        
-        # Select features for training
-        feature_cols = [col for col in agg_features.columns if col not in [pincode_col, 'Pincode', 'pincode']]
-        X = agg_features[feature_cols].values
+        # Pass 1: scaler statistics and a reservoir sample of pincode-days
+        scaler = StandardScaler()
+        reservoir = Reservoir(params['reservoir_size'], params['random_state'])
+        for X_month in profiles():
+            scaler.partial_fit(X_month)
+            reservoir.add(X_month)
+        n_samples = reservoir.seen
+        X_train = scaler.transform(reservoir.sample)
+        set_rows(n_samples)
     else:
-        # Use raw numeric data
-        X = df[numeric_cols].fillna(0).values
-    
-    # Standardize features
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
-    
-    print(f"📊 Features shape: {X_scaled.shape}")
-    print(f"📊 Number of samples: {X_scaled.shape[0]}")
-    print(f"📊 Number of features: {X_scaled.shape[1]}")
+        # In memory: profile the loaded frame
+        X = profile_features(pincode_profile(data['enrollment']))
+        scaler = StandardScaler()
+        X_train = scaler.fit_transform(X)
+        n_samples = len(X_train)
+        set_rows(len(data['enrollment']))
+    
+    print(f"📊 Mode: {'streaming (out-of-core)' if streaming else 'in-memory'}")
+    print(f"📊 Number of samples: {n_samples:,} (fitted on {len(X_train):,})")
+    print(f"📊 Number of features: {X_train.shape[1]}")
     print()
     
     # Train Isolation Forest
     print("🔄 Training Isolation Forest...")
-    model = IsolationForest(
-        n_estimators=200,           # More trees = better accuracy
-        contamination=0.02,         # 2% anomaly rate
-        max_samples='auto',
-        random_state=42,
-        n_jobs=-1,                  # Use all CPU cores
-        verbose=0
-    )
-    
-    # Fit and predict
-    predictions = model.fit_predict(X_scaled)
-    scores = model.decision_function(X_scaled)
-    
-    # Calculate metrics
-    n_anomalies = (predictions == -1).sum()
-    anomaly_rate = n_anomalies / len(predictions) * 100
+    phase('fit', rows=len(X_train))
+    model.fit(X_train)
+    
+    # Score every pincode-day (pass 2 when streaming)
+    phase('score', rows=n_samples)
+    if streaming:
+        n_anomalies = 0
+        for i, X_month in enumerate(profiles()):
+            n_anomalies += write_predictions(scaler.transform(X_month), first=(i == 0))
+    else:
+        n_anomalies = write_predictions(X_train, first=True)
+    anomaly_rate = n_anomalies / max(n_samples, 1) * 100
     
     print(f"✅ Training Complete!")
-    print(f"📊 Total Samples: {len(predictions):,}")
+    print(f"📊 Total Samples: {n_samples:,}")
     print(f"🚨 Anomalies Detected: {n_anomalies:,} ({anomaly_rate:.2f}%)")
-    print(f"✅ Normal Samples: {(predictions == 1).sum():,}")
+    print(f"✅ Normal Samples: {n_samples - n_anomalies:,}")
     print()
     
     # Save model and scaler
     model_path = os.path.join(MODELS_DIR, 'isolation_forest_model.pkl')
     scaler_path = os.path.join(MODELS_DIR, 'isolation_forest_scaler.pkl')
     
+    flat_path = os.path.join(MODELS_DIR, FLAT_FILES['isolation_forest'])
+    
+    phase('save')
     joblib.dump(model, model_path)
     joblib.dump(scaler, scaler_path)
+    export_forest(model, flat_path)  # memory-mapped by the API
+    parity = check_parity(model, load_forest(flat_path))
+    print(f"{'✅' if parity['passed'] else '❌'} Flat forest parity ({parity['backend']}): "
+          f"max diff {parity['max_abs_diff']:.2e}")
     
     print(f"💾 Model saved: {model_path}")
     print(f"💾 Scaler saved: {scaler_path}")
-    
-    # Save predictions
-    results_df = pd.DataFrame({
-        'anomaly_score': scores,
-        'prediction': predictions,
-        'is_anomaly': predictions == -1
-    })
-    results_path = os.path.join(OUTPUT_DIR, 'fraud_predictions.csv')
-    results_df.to_csv(results_path, index=False)
+    print(f"💾 Flat forest saved: {flat_path}")
     print(f"💾 Predictions saved: {results_path}")
     
     metrics = {
         'model': 'Isolation Forest',
-        'total_samples': int(len(predictions)),
+        'total_samples': int(n_samples),
+        'training_samples': int(len(X_train)),
+        'streaming': bool(streaming),
         'anomalies_detected': int(n_anomalies),
         'anomaly_rate': round(anomaly_rate, 2),
-        'contamination': 0.02,
-        'n_estimators': 200
+        'contamination': params['contamination'],
+        'n_estimators': params['n_estimators'],
+        'artifact': {**artifact_stats(model_path, flat_path), 'parity': parity},
+        'features': PROFILE_COLUMNS
     }
     
     print()
@@ -215,7 +319,7 @@ def train_isolation_forest(data):
 # ============================================
 # MODEL 2: DBSCAN (Fraud Ring Clustering)
 # ============================================
-def train_dbscan(data):
+def train_dbscan(data, params=MODEL_PARAMS['dbscan'], n_jobs=-1):
     """
     Train DBSCAN for fraud ring detection.
     
@@ -226,56 +330,51 @@ def train_dbscan(data):
     print("🔍 MODEL 2: DBSCAN (Fraud Ring Clustering)")
     print("="*70)
     
-    df = data['enrollment'].copy()
-    
-    # Get numeric columns
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    df = data['enrollment']
     
-    # Prepare features
-    X = df[numeric_cols].fillna(0).values
+    # Age counts per record (shared with bulk scoring, see pipeline/features.py)
+    phase('features_and_scale', rows=len(df))
+    X = cluster_features(df)
     
     # Standardize
     scaler = StandardScaler()
     X_scaled = scaler.fit_transform(X)
     
-    # Sample if dataset is too large
-    if len(X_scaled) > 50000:
-        np.random.seed(42)
-        sample_idx = np.random.choice(len(X_scaled), 50000, replace=False)
-        X_sample = X_scaled[sample_idx]
-    else:
-        X_sample = X_scaled
-        sample_idx = np.arange(len(X_scaled))
-    
-    print(f"📊 Features shape: {X_sample.shape}")
+    print(f"📊 Features shape: {X_scaled.shape}")
     print()
     
-    # Train DBSCAN
-    print("🔄 Training DBSCAN Clustering...")
-    model = DBSCAN(
-        eps=0.5,                    # Maximum distance between samples
-        min_samples=5,              # Minimum samples in a cluster
-        metric='euclidean',
-        n_jobs=-1
+    # Cluster every record, partition by partition (see pipeline/clustering.py)
+    print("🔄 Training DBSCAN Clustering (partitioned, all records)...")
+    phase('fit', rows=len(X_scaled))
+    start = time.perf_counter()
+    result = partitioned_dbscan(
+        X_scaled,
+        eps=params['eps'],
+        min_samples=params['min_samples'],
+        partition_points=params['partition_points'],
+        n_jobs=n_jobs
     )
-    
-    clusters = model.fit_predict(X_sample)
+    fit_seconds = time.perf_counter() - start
+    model = result.model
+    clusters = result.labels
     
     # Calculate metrics
-    n_clusters = len(set(clusters)) - (1 if -1 in clusters else 0)
+    n_clusters = int(clusters.max()) + 1 if len(clusters) else 0
     n_noise = (clusters == -1).sum()
     
-    # Silhouette score (only if we have valid clusters)
+    # Silhouette score on a sample of the clustered (non-noise) records
+    phase('metrics')
+    silhouette = 0
     if n_clusters > 1:
-        # Filter out noise points for silhouette calculation
         mask = clusters != -1
         if mask.sum() > 1:
-            silhouette = silhouette_score(X_sample[mask], clusters[mask])
-        else:
-            silhouette = 0
-    else:
-        silhouette = 0
+            silhouette = silhouette_score(
+                X_scaled[mask], clusters[mask],
+                sample_size=min(params['silhouette_sample'], int(mask.sum())),
+                random_state=params['random_state']
+            )
     
+    print(f"📊 Unique points: {result.unique_points:,} in {len(result.partitions)} partitions")
     print(f"✅ Training Complete!")
     print(f"📊 Number of Clusters: {n_clusters}")
     print(f"📊 Noise Points (potential fraud): {n_noise:,}")
@@ -286,6 +385,7 @@ def train_dbscan(data):
     model_path = os.path.join(MODELS_DIR, 'dbscan_model.pkl')
     scaler_path = os.path.join(MODELS_DIR, 'dbscan_scaler.pkl')
     
+    phase('save')
     joblib.dump(model, model_path)
     joblib.dump(scaler, scaler_path)
     
@@ -305,22 +405,63 @@ def train_dbscan(data):
         'model': 'DBSCAN',
         'n_clusters': int(n_clusters),
         'noise_points': int(n_noise),
-        'silhouette_score': round(silhouette, 4),
-        'eps': 0.5,
-        'min_samples': 5
+        'silhouette_score': round(float(silhouette), 4),
+        'eps': params['eps'],
+        'min_samples': params['min_samples'],
+        'rows_clustered': int(len(clusters)),
+        'unique_points': int(result.unique_points),
+        'fit_seconds': round(fit_seconds, 2),
+        'partitions': [
+            {**stat, 'seconds': round(stat['seconds'], 3)} for stat in result.partitions
+        ],
+        'features': COUNT_COLUMNS
     }
     
     print()
     return model, scaler, metrics
 
 
+def series_feature_frame(data):
+    """
+    Series feature rows of the forecast models (``timeseries.cached_feature_frame``).
+    
+    Built once by the shared 'series_features' stage when the training DAG
+    runs; trainers called on their own build (or read) it themselves.
+    """
+    if data.get('series_features') is not None:
+        return data['series_features']
+    rf_params = MODEL_PARAMS['random_forest']
+    return cached_feature_frame(data['enrollment'], enrollment_data_key(), rf_params['level'], rf_params['freq'])
+
+
+# Stages that train on the series features
+SERIES_FEATURE_STAGES = ['random_forest', 'gradient_boosting']
+
+# Stages that stream the store instead of the loaded frame (when the store exists)
+STREAMING_STAGES = ['isolation_forest']
+
+
+def check_temporal_split(periods, split_idx, part='test'):
+    """Fail clearly when a temporal split leaves no rows on one side."""
+    if 0 < split_idx < len(periods):
+        return
+    if not len(periods):
+        raise ValueError("Not enough history to forecast: the enrolment series have no feature rows")
+    side = 'training' if split_idx <= 0 else part
+    raise ValueError(f"Not enough history to forecast: {len(periods):,} feature rows over "
+                     f"{len(np.unique(periods))} periods leave no {side} periods")
+
+
 # ============================================
 # MODEL 3: RANDOM FOREST (Demand Forecasting)
 # ============================================
-def train_demand_forecast(data):
+def train_demand_forecast(data, params=MODEL_PARAMS['random_forest'], n_jobs=-1):
     """
     Train Random Forest for demand forecasting.
     
+    Predicts a pincode's total enrolments of the next day from its own
+    recent series (lags, rolling mean/std, calendar).
+    
     Best for: Predicting future enrollment demand
     Algorithm: Random Forest Regressor (ensemble method)
     """
@@ -328,36 +469,17 @@ def train_demand_forecast(data):
     print("🔮 MODEL 3: RANDOM FOREST (Demand Forecasting)")
     print("="*70)
     
-    df = data['enrollment'].copy()
-    
-    # Get numeric columns
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    
-    if len(numeric_cols) < 2:
-        print("⚠️ Not enough numeric columns for forecasting")
-        return None, None, {}
+    df = data['enrollment']
+    level, freq = params['level'], params['freq']
     
-    # Create time-based features if possible
-    # For now, use existing numeric features
-    
-    # Use first numeric column as target (enrollment count)
-    target_col = numeric_cols[0]
-    feature_cols = numeric_cols[1:] if len(numeric_cols) > 1 else numeric_cols
-    
-    # Prepare data
-    X = df[feature_cols].fillna(0).values
-    y = df[target_col].fillna(0).values
-    
-    # Add synthetic time features
-    n_samples = len(X)
-    time_features = np.column_stack([
-        np.arange(n_samples),                          # Time index
-        np.sin(2 * np.pi * np.arange(n_samples) / 12), # Monthly seasonality
-        np.cos(2 * np.pi * np.arange(n_samples) / 12),
-        np.sin(2 * np.pi * np.arange(n_samples) / 52), # Weekly seasonality
-    ])
-    
-    X_enhanced = np.hstack([X, time_features])
+    # Lag / rolling-window / calendar features of every pincode series,
+    # cached per data version (shared with the API, see pipeline/timeseries.py)
+    phase('features', rows=len(df))
+    matrix = series_matrix(df, level, freq)
+    frame = series_feature_frame(data)
+    features = feature_columns(freq)
+    X_enhanced = frame[features].to_numpy()
+    y = frame[SERIES_TARGET].to_numpy()
     
     # ============================================
     # FIX: Use temporal split instead of random split
@@ -365,15 +487,20 @@ def train_demand_forecast(data):
     # ============================================
     print("📊 Using temporal split for proper time-series validation...")
     
-    # Use last 20% as test set (temporal split, not random)
-    split_idx = int(len(X_enhanced) * 0.8)
+    # Rows are sorted by period: the latest periods are the test set
+    periods = frame['period'].to_numpy()
+    split_idx = period_split(periods, params['test_fraction'])
+    check_temporal_split(periods, split_idx)
+    split_period = periods[split_idx]
     X_train = X_enhanced[:split_idx]
     X_test = X_enhanced[split_idx:]
     y_train = y[:split_idx]
     y_test = y[split_idx:]
-
+    print(f"📊 {matrix.values.shape[0]:,} {level} series x {matrix.values.shape[1]} periods ({freq}), "
+          f"test from {str(split_period)[:10]}")
     
     # Standardize features
+    phase('scale', rows=len(X_enhanced))
     scaler = StandardScaler()
     X_train_scaled = scaler.fit_transform(X_train)
     X_test_scaled = scaler.transform(X_test)
@@ -385,19 +512,21 @@ def train_demand_forecast(data):
     
     # Train Random Forest with regularization to prevent overfitting
     print("🔄 Training Random Forest Regressor (regularized)...")
+    phase('fit', rows=len(X_train))
     model = RandomForestRegressor(
-        n_estimators=100,
-        max_depth=10,              # Reduced from 15 to prevent overfitting
-        min_samples_split=10,      # Increased for regularization
-        min_samples_leaf=5,        # Increased for regularization
-        max_features='sqrt',       # Feature subsampling for regularization
-        random_state=42,
-        n_jobs=-1
+        n_estimators=params['n_estimators'],
+        max_depth=params['max_depth'],
+        min_samples_split=params['min_samples_split'],
+        min_samples_leaf=params['min_samples_leaf'],
+        max_features=params['max_features'],
+        random_state=params['random_state'],
+        n_jobs=n_jobs
     )
     
     model.fit(X_train_scaled, y_train)
     
     # Predictions
+    phase('metrics', rows=len(X_enhanced))
     y_pred_train = model.predict(X_train_scaled)
     y_pred_test = model.predict(X_test_scaled)
     
@@ -425,12 +554,23 @@ def train_demand_forecast(data):
     # Save model
     model_path = os.path.join(MODELS_DIR, 'random_forest_forecast.pkl')
     scaler_path = os.path.join(MODELS_DIR, 'forecast_scaler.pkl')
+    flat_path = os.path.join(MODELS_DIR, FLAT_FILES['random_forest'])
+    history_path = os.path.join(MODELS_DIR, HISTORY_FILE)
     
+    phase('save')
     joblib.dump(model, model_path)
     joblib.dump(scaler, scaler_path)
+    export_forest(model, flat_path)  # memory-mapped by the API
+    history = ForecastHistory.from_matrix(matrix)
+    save_history(history, history_path)  # recent series the API builds features from
+    parity = check_parity(model, load_forest(flat_path))
+    print(f"{'✅' if parity['passed'] else '❌'} Flat forest parity ({parity['backend']}): "
+          f"max diff {parity['max_abs_diff']:.2e}")
     
     print(f"💾 Model saved: {model_path}")
     print(f"💾 Scaler saved: {scaler_path}")
+    print(f"💾 Flat forest saved: {flat_path}")
+    print(f"💾 Series history saved: {history_path}")
     
     metrics = {
         'model': 'Random Forest Regressor',
@@ -441,7 +581,14 @@ def train_demand_forecast(data):
         'rmse': round(rmse, 2),
         'cv_mean': round(cv_scores.mean(), 4),
         'cv_std': round(cv_scores.std(), 4),
-        'n_estimators': 100
+        'n_estimators': params['n_estimators'],
+        'artifact': {**artifact_stats(model_path, flat_path), 'parity': parity},
+        'target': SERIES_TARGET,
+        'features': features,
+        'level': level,
+        'freq': freq,
+        'training_samples': int(len(X_train)),
+        'last_period': str(history.last_period)
     }
     
     print()
@@ -451,10 +598,13 @@ def train_demand_forecast(data):
 # ============================================
 # MODEL 4: GRADIENT BOOSTING / XGBOOST
 # ============================================
-def train_xgboost_model(data):
+def train_xgboost_model(data, params=MODEL_PARAMS['gradient_boosting'], n_jobs=-1):
     """
     Train XGBoost/Gradient Boosting for enrollment prediction.
     
+    Uses the Random Forest's series features and temporal split; the
+    number of boosting rounds is chosen by early stopping.
+    
     Best for: High accuracy predictions with feature importance
     Algorithm: XGBoost or Gradient Boosting (if XGBoost not available)
     """
@@ -462,28 +612,24 @@ def train_xgboost_model(data):
     print("🚀 MODEL 4: GRADIENT BOOSTING (Enrollment Prediction)")
     print("="*70)
     
-    df = data['enrollment'].copy()
-    
-    # Get numeric columns
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    df = data['enrollment']
     
-    if len(numeric_cols) < 2:
-        print("⚠️ Not enough numeric columns")
-        return None, None, {}
+    # Same series features and test periods as the Random Forest, so the two
+    # models (and their tuned configurations) are comparable
+    rf_params = MODEL_PARAMS['random_forest']
+    phase('features', rows=len(df))
+    frame = series_feature_frame(data)
+    X = frame[feature_columns(rf_params['freq'])].to_numpy()
+    y = frame[SERIES_TARGET].to_numpy()
+    periods = frame['period'].to_numpy()
     
-    # Prepare features and target
-    target_col = numeric_cols[0]
-    feature_cols = numeric_cols[1:]
-    
-    X = df[feature_cols].fillna(0).values
-    y = df[target_col].fillna(0).values
-    
-    # Train-test split
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
-    )
+    # Temporal split; the latest training periods are the early-stopping fold
+    split_idx = period_split(periods, rf_params['test_fraction'])
+    check_temporal_split(periods, split_idx)
+    X_train, X_test, y_train, y_test = X[:split_idx], X[split_idx:], y[:split_idx], y[split_idx:]
     
     # Standardize
+    phase('scale', rows=len(X))
     scaler = StandardScaler()
     X_train_scaled = scaler.fit_transform(X_train)
     X_test_scaled = scaler.transform(X_test)
@@ -492,33 +638,18 @@ def train_xgboost_model(data):
     print(f"📊 Test samples: {len(X_test):,}")
     print()
     
-    # Train model
-    if HAS_XGBOOST:
-        print("🔄 Training XGBoost Regressor...")
-        model = xgb.XGBRegressor(
-            n_estimators=100,
-            max_depth=6,
-            learning_rate=0.1,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            random_state=42,
-            n_jobs=-1
-        )
-        model_name = 'XGBoost'
-    else:
-        print("🔄 Training Gradient Boosting Regressor...")
-        model = GradientBoostingRegressor(
-            n_estimators=100,
-            max_depth=6,
-            learning_rate=0.1,
-            subsample=0.8,
-            random_state=42
-        )
-        model_name = 'Gradient Boosting'
-    
-    model.fit(X_train_scaled, y_train)
+    # Train model, stopping early against the latest training periods
+    model_name = 'XGBoost' if HAS_XGBOOST else 'Gradient Boosting'
+    print(f"🔄 Training {model_name} Regressor (early stopping)...")
+    phase('fit', rows=len(X_train))
+    val_idx = period_split(periods[:split_idx], params['validation_fraction'])
+    check_temporal_split(periods[:split_idx], val_idx, 'early-stopping')
+    model, rounds = fit_boosting(params, X_train_scaled[:val_idx], y_train[:val_idx],
+                                 X_train_scaled[val_idx:], y_train[val_idx:], n_jobs=n_jobs)
+    print(f"📊 Boosting rounds kept: {rounds} of {params['n_estimators']}")
     
     # Predictions
+    phase('metrics', rows=len(X_test))
     y_pred_test = model.predict(X_test_scaled)
     
     # Metrics
@@ -537,6 +668,7 @@ def train_xgboost_model(data):
     model_path = os.path.join(MODELS_DIR, 'gradient_boost_model.pkl')
     scaler_path = os.path.join(MODELS_DIR, 'gradient_boost_scaler.pkl')
     
+    phase('save')
     joblib.dump(model, model_path)
     joblib.dump(scaler, scaler_path)
     
@@ -549,7 +681,8 @@ def train_xgboost_model(data):
         'accuracy_pct': round(max(0, test_r2*100), 2),
         'mae': round(mae, 2),
         'rmse': round(rmse, 2),
-        'n_estimators': 100
+        'n_estimators': rounds,
+        'target': SERIES_TARGET
     }
     
     print()
@@ -559,23 +692,22 @@ def train_xgboost_model(data):
 # ============================================
 # MODEL 5: K-MEANS (Geographic Segmentation)
 # ============================================
-def train_kmeans(data):
+def train_kmeans(data, params=MODEL_PARAMS['kmeans'], n_jobs=-1):
     """
     Train K-Means for geographic segmentation.
     
     Best for: Segmenting pincodes/districts by service needs
-    Algorithm: K-Means Clustering
+    Algorithm: Mini-batch K-Means (all records, parallel k-sweep)
     """
     print("="*70)
     print("📍 MODEL 5: K-MEANS (Geographic Segmentation)")
     print("="*70)
     
-    df = data['enrollment'].copy()
+    df = data['enrollment']
     
-    # Get numeric columns
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    
-    X = df[numeric_cols].fillna(0).values
+    # Age counts per record (shared with the API, see pipeline/features.py)
+    phase('features_and_scale', rows=len(df))
+    X = cluster_features(df)
     
     # Standardize
     scaler = StandardScaler()
@@ -585,50 +717,48 @@ def train_kmeans(data):
     print(f"📊 Features: {X_scaled.shape[1]}")
     print()
     
-    # Find optimal k using elbow method (simplified)
+    # Silhouette rows: stratified by state so every region is represented
+    strata = df['state'].astype(str).to_numpy() if 'state' in df.columns else np.zeros(len(df))
+    sample_idx = stratified_sample(strata, params['silhouette_sample'], params['random_state'])
+    
+    # Mini-batch K-Means for every candidate k on all records, candidates in parallel
     print("🔄 Finding optimal number of clusters...")
-    inertias = []
-    silhouettes = []
-    K_range = range(2, 8)
-    
-    for k in K_range:
-        kmeans_temp = KMeans(n_clusters=k, random_state=42, n_init=10)
-        kmeans_temp.fit(X_scaled[:10000] if len(X_scaled) > 10000 else X_scaled)  # Sample for speed
-        inertias.append(kmeans_temp.inertia_)
-        
-        labels_temp = kmeans_temp.labels_
-        if len(set(labels_temp)) > 1:
-            sil = silhouette_score(X_scaled[:10000] if len(X_scaled) > 10000 else X_scaled, labels_temp)
-            silhouettes.append(sil)
-        else:
-            silhouettes.append(0)
+    phase('k_sweep', rows=len(X_scaled))
+    K_range = range(params['k_min'], params['k_max'] + 1)
+    sweep = kmeans_sweep(
+        X_scaled, K_range, sample_idx,
+        batch_size=params['batch_size'],
+        n_init=params['n_init'],
+        max_iter=params['max_iter'],
+        chunk_rows=params['chunk_rows'],
+        random_state=params['random_state'],
+        n_jobs=n_jobs
+    )
+    for candidate in sweep:
+        print(f"   k={candidate['k']}: silhouette {candidate['silhouette']:.4f}, "
+              f"inertia {candidate['inertia']:,.0f} ({candidate['seconds']:.1f}s)")
     
     # Choose k with best silhouette
-    best_k = K_range[np.argmax(silhouettes)]
-    print(f"📊 Optimal clusters: {best_k} (silhouette: {max(silhouettes):.4f})")
+    best = max(sweep, key=lambda candidate: candidate['silhouette'])
+    best_k = best['k']
+    print(f"📊 Optimal clusters: {best_k} (silhouette: {best['silhouette']:.4f})")
     print()
     
-    # Train final model
+    # Final model: partial_fit over shuffled chunks of every record
     print(f"🔄 Training K-Means with {best_k} clusters...")
-    model = KMeans(
-        n_clusters=best_k,
-        init='k-means++',
-        n_init=10,
-        max_iter=300,
-        random_state=42
+    phase('fit', rows=len(X_scaled))
+    model = streaming_kmeans(
+        X_scaled, best['model'].cluster_centers_,
+        chunk_rows=params['chunk_rows'],
+        batch_size=params['batch_size'],
+        epochs=params['epochs'],
+        random_state=params['random_state']
     )
-    
-    # Sample if too large
-    if len(X_scaled) > 100000:
-        sample_idx = np.random.choice(len(X_scaled), 100000, replace=False)
-        model.fit(X_scaled[sample_idx])
-        labels = model.predict(X_scaled)
-    else:
-        labels = model.fit_predict(X_scaled)
+    labels = predict_chunked(model, X_scaled, params['chunk_rows'])
     
     # Calculate metrics
-    silhouette = silhouette_score(X_scaled[:50000] if len(X_scaled) > 50000 else X_scaled, 
-                                   labels[:50000] if len(labels) > 50000 else labels)
+    phase('metrics', rows=len(sample_idx))
+    silhouette = silhouette_score(X_scaled[sample_idx], labels[sample_idx])
     
     # Cluster distribution
     unique, counts = np.unique(labels, return_counts=True)
@@ -646,6 +776,7 @@ def train_kmeans(data):
     model_path = os.path.join(MODELS_DIR, 'kmeans_model.pkl')
     scaler_path = os.path.join(MODELS_DIR, 'kmeans_scaler.pkl')
     
+    phase('save')
     joblib.dump(model, model_path)
     joblib.dump(scaler, scaler_path)
     
@@ -664,8 +795,16 @@ def train_kmeans(data):
     metrics = {
         'model': 'K-Means',
         'n_clusters': int(best_k),
-        'silhouette_score': round(silhouette, 4),
-        'cluster_distribution': {int(k): int(v) for k, v in zip(unique, counts)}
+        'silhouette_score': round(float(silhouette), 4),
+        'cluster_distribution': {int(k): int(v) for k, v in zip(unique, counts)},
+        'rows_clustered': int(len(labels)),
+        'silhouette_sample': int(len(sample_idx)),
+        'k_sweep': [
+            {'k': c['k'], 'silhouette': round(c['silhouette'], 4),
+             'inertia': round(c['inertia'], 2), 'seconds': round(c['seconds'], 2)}
+            for c in sweep
+        ],
+        'features': COUNT_COLUMNS
     }
     
     print()
@@ -675,62 +814,271 @@ def train_kmeans(data):
 # ============================================
 # MAIN TRAINING PIPELINE
 # ============================================
-def main():
-    """Run the complete training pipeline"""
+# ============================================
+# TRAINING STAGES (cached)
+# ============================================
+# Metrics key -> (label, trainer, artifacts the trainer writes: cache name -> path)
+TRAINING_STAGES = {
+    'isolation_forest': ('Isolation Forest', train_isolation_forest, {
+        'isolation_forest_model.pkl': os.path.join(MODELS_DIR, 'isolation_forest_model.pkl'),
+        'isolation_forest_scaler.pkl': os.path.join(MODELS_DIR, 'isolation_forest_scaler.pkl'),
+        FLAT_FILES['isolation_forest']: os.path.join(MODELS_DIR, FLAT_FILES['isolation_forest']),
+        'fraud_predictions.csv': os.path.join(OUTPUT_DIR, 'fraud_predictions.csv'),
+    }),
+    'dbscan': ('DBSCAN', train_dbscan, {
+        'dbscan_model.pkl': os.path.join(MODELS_DIR, 'dbscan_model.pkl'),
+        'dbscan_scaler.pkl': os.path.join(MODELS_DIR, 'dbscan_scaler.pkl'),
+        'cluster_results.csv': os.path.join(OUTPUT_DIR, 'cluster_results.csv'),
+    }),
+    'random_forest': ('Random Forest', train_demand_forecast, {
+        'random_forest_forecast.pkl': os.path.join(MODELS_DIR, 'random_forest_forecast.pkl'),
+        'forecast_scaler.pkl': os.path.join(MODELS_DIR, 'forecast_scaler.pkl'),
+        FLAT_FILES['random_forest']: os.path.join(MODELS_DIR, FLAT_FILES['random_forest']),
+        HISTORY_FILE: os.path.join(MODELS_DIR, HISTORY_FILE),
+    }),
+    'gradient_boosting': ('Gradient Boosting', train_xgboost_model, {
+        'gradient_boost_model.pkl': os.path.join(MODELS_DIR, 'gradient_boost_model.pkl'),
+        'gradient_boost_scaler.pkl': os.path.join(MODELS_DIR, 'gradient_boost_scaler.pkl'),
+    }),
+    'kmeans': ('K-Means', train_kmeans, {
+        'kmeans_model.pkl': os.path.join(MODELS_DIR, 'kmeans_model.pkl'),
+        'kmeans_scaler.pkl': os.path.join(MODELS_DIR, 'kmeans_scaler.pkl'),
+        'geographic_segments.csv': os.path.join(OUTPUT_DIR, 'geographic_segments.csv'),
+    }),
+}
+
+
+def enrollment_data_key():
+    """
+    Content hashes of the enrolment shards behind the training data.
     
-    # Load data
-    data = load_all_data()
+    Ingests new shards first so the key describes what load_dataset will
+    return. None if the store is unavailable (nothing is cached then).
+    """
+    if not HAS_PYARROW:
+        return None
+    build_store(['enrolment'], workers=LOAD_WORKERS, memory_limit_mb=LOAD_MEMORY_LIMIT_MB)
+    entries = load_manifest(STORE_DIR).get('enrolment', {})
+    return sorted((key, entry.get('sha256')) for key, entry in entries.items())
+
+
+def stage_cache_key(name, data_key):
+    """
+    Cache key of a training stage.
     
-    if not data or 'enrollment' not in data:
-        print("❌ ERROR: Could not load enrollment data!")
-        return
+    Covers the input shard hashes, the model's hyperparameters and the
+    source of its trainer and of the shared pipeline code, so any change
+    to those retrains just this model. None when the inputs are unknown.
+    """
+    if data_key is None:
+        return None
+    _, trainer, _ = TRAINING_STAGES[name]
+    # Gradient Boosting trains on the Random Forest's features and split
+    shared = MODEL_PARAMS['random_forest'] if name == 'gradient_boosting' else None
+    return stage_cache.stage_key(name, data_key, MODEL_PARAMS[name], shared, HAS_XGBOOST, trainer,
+                                 feature_module, clustering, streaming, artifacts, timeseries, tuning,
+                                 normalize)
+
+
+def run_stage(name, data, key, use_cache=True, n_jobs=-1):
+    """
+    Train one model, or restore it from the stage cache.
     
-    all_metrics = {}
+    Args:
+        data: Loaded datasets (None if every stage is cached)
+        key: Stage cache key (None disables caching)
+        n_jobs: Cores this trainer may use
+    
+    Returns:
+        (metrics, restored from cache?)
+    """
+    label, trainer, artifacts = TRAINING_STAGES[name]
+    
+    if use_cache and key is not None:
+        metrics = stage_cache.restore(CACHE_DIR, name, key, artifacts)
+        if metrics is not None:
+            print(f"♻️ {label}: inputs unchanged, restored from cache ({key[:12]})")
+            return metrics, True
+    
+    # Never write through hard links into cached artifacts
+    stage_cache.release(artifacts)
+    _, _, metrics = trainer(data, MODEL_PARAMS[name], n_jobs=n_jobs)
+    if key is not None and metrics:
+        stage_cache.store(CACHE_DIR, name, key, artifacts, metrics)
+    return metrics, False
+
+
+def apply_best_params(path=BEST_PARAMS_PATH):
+    """Merge the hyperparameters found by --tune into MODEL_PARAMS."""
+    for name, best in load_best_params(path).items():
+        if name in MODEL_PARAMS:
+            MODEL_PARAMS[name].update(best)
+            print(f"🎛️ {TRAINING_STAGES[name][0]}: using tuned hyperparameters from {path}")
+
+
+def tune_models(workers=None):
+    """
+    Successive-halving search for the forecast models (see pipeline/tuning.py).
+    
+    Searches on the cached series features, validating on temporal folds of
+    the training periods (the test periods are left out), and saves the
+    best configurations to BEST_PARAMS_PATH.
+    """
+    print("="*70)
+    print("🎛️ HYPERPARAMETER SEARCH (successive halving)")
+    print("="*70)
+    
+    rf_params = MODEL_PARAMS['random_forest']
+    df = load_dataset('enrolment', workers=LOAD_WORKERS, memory_limit_mb=LOAD_MEMORY_LIMIT_MB)
+    frame = cached_feature_frame(df, enrollment_data_key(), rf_params['level'], rf_params['freq'])
+    periods = frame['period'].to_numpy()
+    split_idx = period_split(periods, rf_params['test_fraction'])
+    X = frame[feature_columns(rf_params['freq'])].to_numpy()[:split_idx]
+    y = frame[SERIES_TARGET].to_numpy()[:split_idx]
+    print(f"📊 Search rows: {len(X):,} (test periods excluded)")
+    
+    results = {}
+    for name in TUNED_MODELS:
+        results[name] = successive_halving(name, X, y, periods[:split_idx], MODEL_PARAMS[name],
+                                           workers=workers or TRAIN_CORES)
+        print(f"✅ {TRAINING_STAGES[name][0]}: CV MAE {results[name]['cv_mae']:.3f} "
+              f"({results[name]['evaluations']} fits in {results[name]['seconds']:.1f}s)")
+    
+    save_best_params(results, BEST_PARAMS_PATH)
+    print(f"💾 Best configurations saved: {BEST_PARAMS_PATH}")
+    print()
+    return results
+
+
+def main(use_cache=True, profile_mode=None):
+    """
+    Run the complete training pipeline
+    
+    Args:
+        use_cache: Restore unchanged stages from the stage cache
+        profile_mode: 'cprofile' or 'stacks' to dump a profile per stage
+            into PROFILE_DUMP_DIR (timings are always recorded; 'cprofile'
+            runs the stages one at a time)
+    """
+    
+    run_start = time.perf_counter()
+    profiler = Profiler(PROFILE_DUMP_DIR if profile_mode else None, profile_mode)
+    apply_best_params()
+    data_key = enrollment_data_key()
+    keys = {name: stage_cache_key(name, data_key) for name in TRAINING_STAGES}
+    to_train = [name for name, key in keys.items()
+                if not (use_cache and key is not None and stage_cache.has(CACHE_DIR, name, key))]
+    
+    # Split the cores evenly between the trainers that actually run
+    # (one at a time under cProfile, which is process-wide)
+    parallel = 1 if profiler.serial else max(1, min(len(to_train), TRAIN_CORES))
+    cores_per_stage = max(1, TRAIN_CORES // parallel)
+    
+    # Stages that train on the loaded frame (the streaming Isolation Forest
+    # reads the store month by month, so its memory stays flat as shards grow)
+    streaming = streaming_available()
+    in_memory = [name for name in TRAINING_STAGES if not (streaming and name in STREAMING_STAGES)]
+    
+    def load_data(_):
+        if not set(in_memory) & set(to_train):
+            return None  # every in-memory model is cached
+        with profiler.stage('data') as span:
+            phase('load')
+            data = load_training_data()
+            span.rows = sum(len(df) for df in data.values())
+        if not data or 'enrollment' not in data:
+            raise RuntimeError("Could not load enrollment data!")
+        return data
+    
+    def build_series_features(deps):
+        # Built once for the forecast trainers, which would otherwise race on the cache file
+        if deps['data'] is None or not set(SERIES_FEATURE_STAGES) & set(to_train):
+            return None
+        with profiler.stage('series_features', rows=len(deps['data']['enrollment'])):
+            phase('features')
+            return series_feature_frame(deps['data'])
+    
+    def trainer_stage(name):
+        def run(deps):
+            data = deps.get('data')
+            if data is not None and deps.get('series_features') is not None:
+                data = {**data, 'series_features': deps['series_features']}
+            rows = len(data['enrollment']) if data else None
+            with profiler.stage(name, rows=rows):
+                return run_stage(name, data, keys[name], use_cache, cores_per_stage)
+        return run
+    
+    def stage_deps(name):
+        if name not in in_memory:
+            return []
+        return ['data', 'series_features'] if name in SERIES_FEATURE_STAGES else ['data']
+    
+    # DAG: data -> series features -> forecast trainers; data -> other in-memory
+    # trainers; streaming trainers start right away without the loaded frame
+    stages = [Stage('data', load_data), Stage('series_features', build_series_features, deps=['data'])]
+    stages += [Stage(name, trainer_stage(name), deps=stage_deps(name)) for name in TRAINING_STAGES]
     
     # Train all models
     print("\n" + "🚀 STARTING MODEL TRAINING PIPELINE".center(70))
-    print("="*70 + "\n")
-    
-    # Model 1: Isolation Forest
-    try:
-        _, _, metrics1 = train_isolation_forest(data)
-        all_metrics['isolation_forest'] = metrics1
-    except Exception as e:
-        print(f"❌ Isolation Forest failed: {e}")
-    
-    # Model 2: DBSCAN
-    try:
-        _, _, metrics2 = train_dbscan(data)
-        all_metrics['dbscan'] = metrics2
-    except Exception as e:
-        print(f"❌ DBSCAN failed: {e}")
-    
-    # Model 3: Random Forest Forecast
-    try:
-        _, _, metrics3 = train_demand_forecast(data)
-        all_metrics['random_forest'] = metrics3
-    except Exception as e:
-        print(f"❌ Random Forest failed: {e}")
-    
-    # Model 4: Gradient Boosting
-    try:
-        _, _, metrics4 = train_xgboost_model(data)
-        all_metrics['gradient_boosting'] = metrics4
-    except Exception as e:
-        print(f"❌ Gradient Boosting failed: {e}")
-    
-    # Model 5: K-Means
-    try:
-        _, _, metrics5 = train_kmeans(data)
-        all_metrics['kmeans'] = metrics5
-    except Exception as e:
-        print(f"❌ K-Means failed: {e}")
+    print("="*70)
+    print(f"⚙️ {len(to_train)} models to train, {parallel} at a time, {cores_per_stage} cores each\n")
+    
+    def report(name, result):
+        label = TRAINING_STAGES[name][0] if name in TRAINING_STAGES else \
+            {'data': 'Data loading', 'series_features': 'Series features'}[name]
+        if result.error is not None:
+            print(f"❌ {label} failed: {result.error}")
+        else:
+            print(f"⏱️ {label} finished in {result.wall_time:.1f}s")
+    
+    # BLAS/OpenMP pools are process-wide: cap them at the per-stage budget too
+    with threadpool_limits(limits=cores_per_stage):
+        results = run_dag(stages, max_workers=parallel, on_finish=report)
+    profiler.close()
+    
+    all_metrics = {}
+    run_info = {
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'cores': TRAIN_CORES,
+        'parallel_stages': parallel,
+        'cores_per_stage': cores_per_stage,
+        'stages': {},
+    }
+    for name in ['data', 'series_features', *TRAINING_STAGES]:
+        result = results[name]
+        stage_info = {
+            'wall_time_s': round(result.wall_time, 3),
+            'started_at_s': round(result.started_at, 3),
+        }
+        if result.error is not None:
+            stage_info['error'] = str(result.error)
+        elif name in TRAINING_STAGES:
+            all_metrics[name], stage_info['cached'] = result.value
+        run_info['stages'][name] = stage_info
+    run_info['wall_time_s'] = round(time.perf_counter() - run_start, 3)
+    
+    if not all_metrics:
+        print("❌ ERROR: No model could be trained!")
+        return
     
     # Save all metrics
     metrics_path = os.path.join(OUTPUT_DIR, 'metrics', 'model_metrics.json')
     with open(metrics_path, 'w') as f:
         json.dump(all_metrics, f, indent=2)
     
+    # Scheduling and per-stage wall times of this run
+    run_path = os.path.join(OUTPUT_DIR, 'metrics', 'training_run.json')
+    with open(run_path, 'w') as f:
+        json.dump(run_info, f, indent=2)
+    
+    # Per-stage / per-phase time, memory and throughput, compared with the last run
+    profile = profiler.report()
+    if os.path.exists(PROFILE_PATH):
+        with open(PROFILE_PATH) as f:
+            profile['regressions'] = compare_profiles(json.load(f), profile)
+    with open(PROFILE_PATH, 'w') as f:
+        json.dump(profile, f, indent=2)
+    
     # Print Summary
     print("\n" + "="*70)
     print("📊 TRAINING SUMMARY".center(70))
@@ -745,8 +1093,9 @@ def main():
     
     print()
     print("💾 FILES CREATED:")
-    for f in os.listdir(MODELS_DIR):
-        print(f"   • models/trained/{f}")
+    for f in sorted(os.listdir(MODELS_DIR)):
+        if os.path.isfile(os.path.join(MODELS_DIR, f)):
+            print(f"   • models/trained/{f}")
     
     print()
     print("📈 KEY METRICS:")
@@ -757,6 +1106,18 @@ def main():
     if 'kmeans' in all_metrics:
         print(f"   • Clustering Silhouette: {all_metrics['kmeans'].get('silhouette_score', 'N/A')}")
     
+    print()
+    print("⏱️ STAGE PROFILE:")
+    for name, stats in profile['stages'].items():
+        throughput = f", {stats['rows_per_s']:,.0f} rows/s" if 'rows_per_s' in stats else ''
+        slowest = max(stats['phases'].items(), key=lambda item: item[1]['wall_s'], default=None)
+        print(f"   • {name}: {stats['wall_s']:.1f}s wall, {stats['cpu_s']:.1f}s CPU, "
+              f"peak RSS {stats['peak_rss_mb']} MB{throughput}"
+              + (f" (slowest phase: {slowest[0]} {slowest[1]['wall_s']:.1f}s)" if slowest else ''))
+    for regression in profile.get('regressions', []):
+        print(f"   ⚠️ Slower than last run: {regression}")
+    print(f"   Details: {PROFILE_PATH}")
+    
     print()
     print(f"📅 Training Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*70)
@@ -765,5 +1126,16 @@ def main():
 
 
 if __name__ == "__main__":
-    metrics = main()
+    parser = argparse.ArgumentParser(description="Train all Aadhaar Intelligence models")
+    parser.add_argument('--no-cache', action='store_true', help="Retrain every model, ignoring the stage cache")
+    parser.add_argument('--tune', action='store_true',
+                        help="Search forest/boosting hyperparameters first and train with the best ones")
+    parser.add_argument('--tune-workers', type=int, help="Search processes (default: AADHAAR_TRAIN_CORES)")
+    parser.add_argument('--profile', choices=PROFILE_MODES,
+                        help=f"Dump a cProfile (.prof) or sampled stack (.folded) profile per stage to {PROFILE_DUMP_DIR} "
+                             "(cprofile runs the stages one at a time)")
+    args = parser.parse_args()
+    if args.tune:
+        tune_models(workers=args.tune_workers)
+    metrics = main(use_cache=not args.no_cache, profile_mode=args.profile)
 
@@ -8,10 +8,14 @@ import numpy as np
 from scipy import stats
 from scipy.stats import chi2_contingency, ttest_ind, f_oneway, pearsonr
 import os
-import glob
+import sys
 import json
 from datetime import datetime
 
+# Shared ingestion store (pipeline/ lives at the repository root)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline.store import load_dataset
+
 # Configuration
 DATA_DIR = '../data/'
 OUTPUT_DIR = '../outputs/'
@@ -25,17 +29,14 @@ print(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
 # Load Datasets
 print("\nLoading UIDAI Datasets...")
 
-def load_all_csvs(folder_path):
-    """Load and concatenate all CSV files from a folder."""
-    all_files = glob.glob(os.path.join(folder_path, "**/*.csv"), recursive=True)
-    if not all_files:
-        return None
-    dfs = [pd.read_csv(file) for file in all_files]
-    return pd.concat(dfs, ignore_index=True)
-
-df_enrolment = load_all_csvs(f"{DATA_DIR}enrolment/")
-df_demographic = load_all_csvs(f"{DATA_DIR}demographic/")
-df_biometric = load_all_csvs(f"{DATA_DIR}biometric/")
+def load_from_store(dataset):
+    """Load a dataset from the columnar store (built from the CSV shards on first use)."""
+    # Plain string state/district keep the groupby results below unchanged
+    return load_dataset(dataset, categorical=False)
+
+df_enrolment = load_from_store("enrolment")
+df_demographic = load_from_store("demographic")
+df_biometric = load_from_store("biometric")
 
 print(f"Enrolment: {len(df_enrolment):,} records")
 print(f"Demographic: {len(df_demographic):,} records")
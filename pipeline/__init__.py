@@ -0,0 +1,33 @@
+"""
+🇮🇳 AADHAAR INTELLIGENCE SYSTEM - Data Pipeline
+===============================================
+Shared ingestion and processing components used by the training script
+(models/train_models.py), the notebooks and the backend API.
+
+Modules:
+    store      - Columnar Parquet store built from the raw CSV shards
+    loader     - Parallel, memory-bounded CSV shard loader
+    manifest   - Shard manifest (size, mtime, hash, rows) for incremental ingestion
+    aggregates - Incrementally maintained pincode/state aggregates
+    dimensions - Pincode dimension table and the keyed pincode fact tables
+    features   - Model feature construction shared by training and serving
+    normalize  - Canonical state/district names, remapped through categorical codes
+    scoring    - Vectorized scoring of records with the trained models
+    stage_cache - Content-addressed cache of trained model stages
+    dag        - Thread-pool scheduler for a DAG of pipeline stages
+    clustering - Partitioned DBSCAN and mini-batch K-Means over the full dataset
+    streaming  - Out-of-core profile accumulation and reservoir sampling
+    artifacts  - Memory-mappable flat forests and their inference engine
+    timeseries - Per-series lag, rolling-window and calendar forecast features
+    forecasting - Reconciled pincode/district/state forecasts and staffing plans
+    tuning     - Successive-halving hyperparameter search for the forecast models
+    profiling  - Wall/CPU time, peak RSS and throughput of pipeline stages
+    spatial    - BallTree / latitude-sorted index for radius, nearest and viewport queries
+    tiles      - Z-order map tile cells aggregated at every zoom for the heatmap
+    listing    - Pre-sorted per-state slices for paged, filtered pincode reads
+"""
+
+from .store import load_dataset, load_all_datasets, build_store
+from .aggregates import refresh
+
+__all__ = ['load_dataset', 'load_all_datasets', 'build_store', 'refresh']
@@ -0,0 +1,371 @@
+"""
+🌲 AADHAAR INTELLIGENCE SYSTEM - Flat Forest Artifacts & Inference
+===================================================================
+Memory-mappable export of the tree ensembles (Isolation Forest, Random
+Forest) and a fast inference engine over it.
+
+Unpickling a fitted forest rebuilds every tree in private memory, so each
+API worker holds its own copy of the node arrays. ``export_forest`` flattens
+all trees into a handful of contiguous arrays (one node table for the whole
+forest) written uncompressed with joblib; ``load_forest`` maps them with
+``mmap_mode='r'``, so loading takes milliseconds and every worker process
+shares one copy through the page cache.
+
+Node table layout: ``children[node] = (left, right)`` in global node ids,
+and leaves point to themselves (feature 0, threshold +inf), so every row
+can walk ``max_depth`` steps without branching on leaves.
+
+``FlatForest`` evaluates the arrays and exposes the subset of the sklearn
+API used by scoring (``predict``, ``score_samples``, ``decision_function``,
+``offset_``) plus ``tree_predictions`` for per-tree forecast intervals.
+Two backends:
+
+    - numba: compiled per-row traversal, used when numba is installed.
+    - numpy: vectorized traversal of all trees at once.
+
+Large batches are split into row chunks evaluated on a thread pool (both
+backends release the GIL), so bulk scoring uses every core.
+
+Inputs are compared as float32 like sklearn's trees, so outputs match
+sklearn's. ``check_parity`` verifies this for an exported model (the
+trainer records it in the metrics), and running the module checks every
+artifact in models/trained::
+
+    python -m pipeline.artifacts            # parity + latency of each artifact
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import os
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+import joblib
+import numpy as np
+from sklearn.ensemble import IsolationForest
+
+# Numba compiles the tree traversal (optional - falls back to numpy)
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Bump when the array layout changes (older artifacts must be re-exported)
+FORMAT_VERSION = 2
+
+# Rows evaluated at once per thread (bounds the rows x trees node buffers)
+EVAL_CHUNK_ROWS = 20000
+
+# Rows per block of the compiled kernel (one tree at a time per block)
+KERNEL_BLOCK_ROWS = 256
+
+# Rows per thread below which a batch is not worth splitting
+PARALLEL_MIN_ROWS = 2000
+
+BACKENDS = ['numba', 'numpy']
+DEFAULT_BACKEND = os.environ.get('AADHAAR_INFERENCE_BACKEND', 'numba' if HAS_NUMBA else 'numpy')
+
+KIND_ISOLATION = 'isolation_forest'
+KIND_REGRESSION = 'regression_forest'
+
+# Largest differences tolerated by check_parity (float summation order only)
+PARITY_TOLERANCE = 1e-9
+
+
+def _average_path_length(n_samples: np.ndarray) -> np.ndarray:
+    """Average path length of an unsuccessful BST search (Isolation Forest c(n))."""
+    n = np.asarray(n_samples, dtype=np.float64)
+    out = np.zeros_like(n)
+    out[n == 2] = 1.0
+    big = n > 2
+    out[big] = 2.0 * (np.log(n[big] - 1.0) + np.euler_gamma) - 2.0 * (n[big] - 1.0) / n[big]
+    return out
+
+
+def _node_depths(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    depth = np.zeros(len(left), dtype=np.int64)
+    for node in range(len(left)):  # children always follow their parent
+        if left[node] >= 0:
+            depth[left[node]] = depth[node] + 1
+            depth[right[node]] = depth[node] + 1
+    return depth
+
+
+def flatten_forest(model) -> Dict[str, Any]:
+    """
+    Node arrays of a fitted IsolationForest or RandomForestRegressor.
+
+    Returns:
+        Dict of arrays (``roots``, ``feature``, ``threshold``, ``children``,
+        ``value``) and a ``meta`` dict
+    """
+    isolation = isinstance(model, IsolationForest)
+    features_of = getattr(model, 'estimators_features_', None)
+    subsample = isolation and getattr(model, '_max_features', model.n_features_in_) != model.n_features_in_
+
+    roots, feature, threshold, children, value = [], [], [], [], []
+    offset, max_depth = 0, 0
+    for i, estimator in enumerate(model.estimators_):
+        tree = estimator.tree_
+        ids = np.arange(tree.node_count)
+        leaf = tree.children_left < 0
+
+        tree_feature = np.where(leaf, 0, tree.feature).astype(np.int32)
+        if subsample:
+            tree_feature[~leaf] = np.asarray(features_of[i])[tree_feature[~leaf]]
+        depth = _node_depths(tree.children_left, tree.children_right)
+        if isolation:
+            # Path length of a leaf: its depth plus c(samples left in it)
+            node_value = depth + _average_path_length(tree.n_node_samples)
+        else:
+            node_value = tree.value[:, 0, 0]
+
+        roots.append(offset)
+        feature.append(tree_feature)
+        threshold.append(np.where(leaf, np.inf, tree.threshold))
+        children.append(np.column_stack([
+            np.where(leaf, ids, tree.children_left),
+            np.where(leaf, ids, tree.children_right),
+        ]) + offset)
+        value.append(node_value)
+        offset += tree.node_count
+        max_depth = max(max_depth, int(depth.max()))
+
+    meta = {
+        'format': FORMAT_VERSION,
+        'kind': KIND_ISOLATION if isolation else KIND_REGRESSION,
+        'n_trees': len(model.estimators_),
+        'n_features': int(model.n_features_in_),
+        'max_depth': max_depth,
+    }
+    if isolation:
+        meta['offset'] = float(model.offset_)
+        meta['denominator'] = float(len(model.estimators_) * _average_path_length([model.max_samples_])[0])
+
+    return {
+        'meta': meta,
+        'roots': np.asarray(roots, dtype=np.int64),
+        'feature': np.concatenate(feature).astype(np.int32),
+        'threshold': np.concatenate(threshold).astype(np.float64),
+        'children': np.ascontiguousarray(np.concatenate(children), dtype=np.int64),
+        'value': np.concatenate(value).astype(np.float64),
+    }
+
+
+def export_forest(model, path: str) -> int:
+    """
+    Write the flat arrays of ``model`` to ``path``.
+
+    The file is written next to ``path`` and renamed into place, so API
+    workers mapping the previous version never see a truncated file.
+
+    Returns:
+        Size of the artifact in bytes
+    """
+    tmp = path + '.tmp'
+    joblib.dump(flatten_forest(model), tmp)
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+
+# ============================================
+# TRAVERSAL KERNELS
+# ============================================
+def _leaf_values(X, roots, feature, threshold, children, value, max_depth, out):
+    """out[i, t] = value of the leaf row i reaches in tree t (numba kernel body)."""
+    # Blocks of rows walk one tree at a time, so that tree's nodes stay in cache.
+    # Leaves loop onto themselves: a fixed max_depth steps, no data-dependent branch.
+    for first in range(0, X.shape[0], KERNEL_BLOCK_ROWS):
+        last = min(first + KERNEL_BLOCK_ROWS, X.shape[0])
+        for t in range(roots.shape[0]):
+            for i in range(first, last):
+                node = roots[t]
+                for _ in range(max_depth):
+                    node = children[node, np.int64(not X[i, feature[node]] <= threshold[node])]
+                out[i, t] = value[node]
+
+
+if HAS_NUMBA:
+    # nogil: chunks run truly in parallel on the thread pool (no numba threading layer)
+    _leaf_values_compiled = njit(cache=True, nogil=True)(_leaf_values)
+
+
+class FlatForest:
+    """A forest evaluated from flat (typically memory-mapped) node arrays."""
+
+    def __init__(self, arrays: Dict[str, Any], backend: Optional[str] = None):
+        self.meta = arrays['meta']
+        if self.meta.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Flat forest format {self.meta.get('format')} != {FORMAT_VERSION}, re-export the model")
+        # Plain ndarray views of the (memory-mapped) arrays: no copy
+        self.roots = np.asarray(arrays['roots'])
+        self.feature = np.asarray(arrays['feature'])
+        self.threshold = np.asarray(arrays['threshold'])
+        self.children = np.asarray(arrays['children'])
+        self.value = np.asarray(arrays['value'])
+        self._children_flat = self.children.reshape(-1)
+        self.n_features_in_ = self.meta['n_features']
+        self.offset_ = self.meta.get('offset', 0.0)
+        self.backend = backend or DEFAULT_BACKEND
+        if self.backend not in BACKENDS or (self.backend == 'numba' and not HAS_NUMBA):
+            raise ValueError(f"Inference backend '{self.backend}' is not available")
+
+    @property
+    def n_trees(self) -> int:
+        return self.meta['n_trees']
+
+    def _tree_values_numpy(self, X: np.ndarray) -> np.ndarray:
+        """All trees at once: one gather per depth level."""
+        flat_x = X.reshape(-1)
+        row_start = (np.arange(len(X)) * X.shape[1])[:, None]
+        node = np.repeat(self.roots[None, :], len(X), axis=0)
+        for _ in range(self.meta['max_depth']):
+            go_right = ~(flat_x[row_start + self.feature[node]] <= self.threshold[node])
+            node = self._children_flat[2 * node + go_right]
+        return self.value[node]
+
+    def _tree_values_numba(self, X: np.ndarray) -> np.ndarray:
+        out = np.empty((len(X), self.n_trees))
+        _leaf_values_compiled(X, self.roots, self.feature, self.threshold, self.children,
+                              self.value, self.meta['max_depth'], out)
+        return out
+
+    def tree_predictions(self, X: np.ndarray) -> np.ndarray:
+        """Leaf value of every row in every tree, shape (rows, trees)."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if len(X) == 0:
+            return np.empty((0, self.n_trees))
+        evaluate = self._tree_values_numba if self.backend == 'numba' else self._tree_values_numpy
+
+        workers = min(os.cpu_count() or 1, len(X) // PARALLEL_MIN_ROWS)
+        if workers <= 1 and len(X) <= EVAL_CHUNK_ROWS:
+            return evaluate(X)
+        # Large batches: row chunks on a thread pool (both backends release the GIL)
+        chunk_rows = min(EVAL_CHUNK_ROWS, -(-len(X) // max(workers, 1)))
+        chunks = [X[start:start + chunk_rows] for start in range(0, len(X), chunk_rows)]
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            return np.concatenate(list(pool.map(evaluate, chunks)))
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        """Isolation Forest ``score_samples`` (lower = more abnormal)."""
+        depths = self.tree_predictions(X).sum(axis=1)
+        denominator = self.meta['denominator']
+        return -2.0 ** (-depths / denominator) if denominator else -np.ones(len(depths))
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        return self.score_samples(X) - self.offset_
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Regression: mean of the trees. Isolation: -1 for outliers, 1 for inliers."""
+        if self.meta['kind'] == KIND_ISOLATION:
+            return np.where(self.decision_function(X) < 0, -1, 1)
+        return self.tree_predictions(X).mean(axis=1)
+
+
+def load_forest(path: str, mmap: bool = True, backend: Optional[str] = None) -> FlatForest:
+    """Load a flat forest artifact (memory-mapped unless ``mmap`` is False)."""
+    return FlatForest(joblib.load(path, mmap_mode='r' if mmap else None), backend)
+
+
+# ============================================
+# PARITY & BENCHMARKS
+# ============================================
+def check_parity(model, flat: FlatForest, X: Optional[np.ndarray] = None,
+                 n_rows: int = 2000, random_state: int = 42) -> Dict[str, Any]:
+    """
+    Compare a flat forest with the sklearn model it was exported from.
+
+    Args:
+        X: Inputs to compare on (default: ``n_rows`` standard-normal rows,
+            which cover the scaled feature space)
+
+    Returns:
+        Dict with ``rows``, ``max_abs_diff``, ``label_mismatches`` and ``passed``
+    """
+    if X is None:
+        X = np.random.RandomState(random_state).normal(0, 2, (n_rows, flat.n_features_in_))
+    if flat.meta['kind'] == KIND_ISOLATION:
+        diff = np.abs(model.score_samples(X) - flat.score_samples(X))
+        mismatches = int((model.predict(X) != flat.predict(X)).sum())
+    else:
+        diff = np.abs(model.predict(X) - flat.predict(X))
+        mismatches = 0
+    max_diff = float(diff.max(initial=0.0))
+    return {
+        'backend': flat.backend,
+        'rows': int(len(X)),
+        'max_abs_diff': max_diff,
+        'label_mismatches': mismatches,
+        'passed': bool(max_diff <= PARITY_TOLERANCE and mismatches == 0),
+    }
+
+
+def benchmark(model, X: np.ndarray, repeats: int = 200) -> Dict[str, float]:
+    """Single-row latency (microseconds) and batch throughput (rows/s) of ``model.predict``."""
+    row = X[:1]
+    model.predict(row)  # warm-up (numba compilation)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        model.predict(row)
+    latency = (time.perf_counter() - start) / repeats * 1e6
+    start = time.perf_counter()
+    model.predict(X)
+    return {'row_latency_us': round(latency, 1),
+            'batch_rows_per_s': round(len(X) / (time.perf_counter() - start))}
+
+
+def artifact_stats(pickle_path: str, flat_path: Optional[str] = None) -> Dict[str, Any]:
+    """Size and load time of a pickled model and of its flat export."""
+    def timed(load, path):
+        start = time.perf_counter()
+        load(path)
+        return round((time.perf_counter() - start) * 1000, 2)
+
+    stats = {
+        'pickle_bytes': os.path.getsize(pickle_path),
+        'pickle_load_ms': timed(joblib.load, pickle_path),
+    }
+    if flat_path is not None and os.path.exists(flat_path):
+        stats['flat_file'] = os.path.basename(flat_path)
+        stats['flat_bytes'] = os.path.getsize(flat_path)
+        stats['flat_load_ms'] = timed(load_forest, flat_path)
+    return stats
+
+
+def main():
+    from .scoring import FLAT_FILES, MODEL_FILES, MODELS_DIR
+
+    parser = argparse.ArgumentParser(description="Check flat forest artifacts against their pickles")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--rows', type=int, default=20000, help="Random rows compared and benchmarked")
+    args = parser.parse_args()
+
+    failed = False
+    for name, flat_file in FLAT_FILES.items():
+        pickle_path = os.path.join(args.models_dir, MODEL_FILES[name][0])
+        flat_path = os.path.join(args.models_dir, flat_file)
+        if not (os.path.exists(pickle_path) and os.path.exists(flat_path)):
+            print(f"⚠️ {name}: not trained/exported, skipped")
+            continue
+        model = joblib.load(pickle_path)
+        X = np.random.RandomState(0).normal(0, 2, (args.rows, model.n_features_in_))
+        if hasattr(model, 'n_jobs'):
+            model.n_jobs = 1
+        print(f"🌲 {name}: sklearn {benchmark(model, X)}")
+        for backend in BACKENDS:
+            if backend == 'numba' and not HAS_NUMBA:
+                continue
+            flat = load_forest(flat_path, backend=backend)
+            parity = check_parity(model, flat, X)
+            failed |= not parity['passed']
+            print(f"   {'✅' if parity['passed'] else '❌'} {backend}: {parity} {benchmark(flat, X)}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
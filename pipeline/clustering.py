@@ -0,0 +1,306 @@
+"""
+🕵️ AADHAAR INTELLIGENCE SYSTEM - Scalable Clustering
+=====================================================
+Clustering of every enrolment record within bounded memory.
+
+Partitioned DBSCAN (fraud rings)
+--------------------------------
+sklearn's DBSCAN materialises the eps-neighbourhood of every point at once,
+which does not fit at national scale. ``partitioned_dbscan`` gives the same
+clustering in pieces:
+
+    1. Identical feature rows are collapsed into unique points weighted by
+       their multiplicity (enrolment counts are small integers, so this
+       alone shrinks the problem by orders of magnitude).
+    2. The unique points are split KD-tree style (median of the widest
+       dimension) into partitions of at most ``partition_points`` points.
+       Each partition is processed with a halo of the points within ``eps``
+       of its box, so neighbourhoods of its own points are complete.
+    3. Pass 1 flags core points (weighted neighbour count >= min_samples).
+    4. Pass 2 links core points within ``eps`` into per-partition
+       components; components sharing a core point across partitions are
+       merged with a union-find. Non-core points join the component of their
+       nearest core point within ``eps``, otherwise they are noise (-1).
+
+Memory is bounded by the neighbour graph of one partition plus its halo.
+Timings and sizes of every partition are reported.
+
+Mini-batch K-Means (segmentation)
+---------------------------------
+``kmeans_sweep`` fits a MiniBatchKMeans per candidate k on the whole
+dataset, candidates in parallel, and scores each by silhouette on a
+stratified sample (``stratified_sample``) instead of the first rows.
+``streaming_kmeans`` refits the chosen k with ``partial_fit`` over shuffled
+chunks of all records.
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+from scipy.sparse.csgraph import connected_components
+from sklearn.cluster import DBSCAN, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from sklearn.neighbors import NearestNeighbors
+from threadpoolctl import threadpool_limits
+
+DEFAULT_PARTITION_POINTS = 20000
+
+
+@dataclass
+class PartitionedDBSCANResult:
+    labels: np.ndarray                # label of every input row (-1 = noise)
+    model: DBSCAN                     # labels_/components_ over the unique points
+    unique_points: int
+    partitions: List[Dict] = field(default_factory=list)
+
+
+def split_partitions(X: np.ndarray, max_points: int) -> List[np.ndarray]:
+    """KD-tree style split of ``X`` into index sets of at most ``max_points`` rows."""
+    leaves = []
+    stack = [np.arange(len(X))]
+    while stack:
+        idx = stack.pop()
+        if len(idx) <= max_points:
+            leaves.append(idx)
+            continue
+        points = X[idx]
+        spread = points.max(axis=0) - points.min(axis=0)
+        dim = int(np.argmax(spread))
+        if spread[dim] == 0:
+            leaves.append(idx)  # all points identical (cannot happen after dedup)
+            continue
+        values = points[:, dim]
+        cut = np.median(values)
+        left = values <= cut
+        if left.all():
+            left = values < cut
+        stack.append(idx[~left])
+        stack.append(idx[left])
+    return leaves
+
+
+def _halo(X: np.ndarray, owned: np.ndarray, eps: float) -> np.ndarray:
+    """Indices of points outside ``owned`` but within ``eps`` of its bounding box."""
+    lo = X[owned].min(axis=0) - eps
+    hi = X[owned].max(axis=0) + eps
+    inside = np.all((X >= lo) & (X <= hi), axis=1)
+    inside[owned] = False
+    return np.flatnonzero(inside)
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = np.arange(size)
+
+    def find(self, node: int) -> int:
+        root = node
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[node] != root:
+            self.parent[node], node = root, self.parent[node]
+        return root
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def partitioned_dbscan(X: np.ndarray, eps: float = 0.5, min_samples: int = 5,
+                       partition_points: int = DEFAULT_PARTITION_POINTS,
+                       n_jobs: Optional[int] = None, verbose: bool = True) -> PartitionedDBSCANResult:
+    """
+    Cluster every row of ``X`` with DBSCAN semantics (euclidean metric).
+
+    Args:
+        X: Feature matrix (already scaled)
+        eps: Neighbourhood radius
+        min_samples: Weighted neighbours (including the point) for a core point
+        partition_points: Maximum unique points per partition (excluding halo)
+        n_jobs: Threads for the neighbour queries
+
+    Returns:
+        PartitionedDBSCANResult with per-row labels and per-partition stats
+    """
+    unique, inverse, weights = np.unique(X, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.reshape(-1)
+    n_unique = len(unique)
+    leaves = split_partitions(unique, partition_points)
+    halos = [_halo(unique, owned, eps) for owned in leaves]
+    stats = [{'partition': i, 'points': int(len(owned)), 'halo_points': int(len(halo))}
+             for i, (owned, halo) in enumerate(zip(leaves, halos))]
+
+    # Pass 1: core flags of every unique point (neighbourhoods are complete within owned + halo)
+    is_core = np.zeros(n_unique, dtype=bool)
+    for owned, halo, stat in zip(leaves, halos, stats):
+        start = time.perf_counter()
+        context = np.concatenate([owned, halo])
+        index = NearestNeighbors(radius=eps, n_jobs=n_jobs).fit(unique[context])
+        graph = index.radius_neighbors_graph(unique[owned], mode='connectivity')
+        is_core[owned] = graph @ weights[context] >= min_samples
+        stat['core_points'] = int(is_core[owned].sum())
+        stat['seconds'] = time.perf_counter() - start
+
+    # Pass 2: components of core points per partition, linked across partitions
+    owner_node = np.full(n_unique, -1, dtype=np.int64)   # component node of each owned core point
+    links = []                                             # (node, unique index of a halo core point)
+    border = []                                            # (unique index, node) of border points
+    n_nodes = 0
+    for owned, halo, stat in zip(leaves, halos, stats):
+        start = time.perf_counter()
+        context = np.concatenate([owned, halo])
+        cores = context[is_core[context]]
+        if len(cores):
+            index = NearestNeighbors(radius=eps, n_jobs=n_jobs).fit(unique[cores])
+            graph = index.radius_neighbors_graph(unique[cores], mode='connectivity')
+            n_components, component = connected_components(graph, directed=False)
+            nodes = component + n_nodes
+            n_nodes += n_components
+
+            is_owned = np.zeros(n_unique, dtype=bool)
+            is_owned[owned] = True
+            owned_core = is_owned[cores]
+            owner_node[cores[owned_core]] = nodes[owned_core]
+            links.extend(zip(nodes[~owned_core], cores[~owned_core]))
+
+            # Border points: nearest core point within eps
+            candidates = owned[~is_core[owned]]
+            if len(candidates):
+                distance, nearest = index.kneighbors(unique[candidates], n_neighbors=1)
+                reachable = distance[:, 0] <= eps
+                border.extend(zip(candidates[reachable], nodes[nearest[reachable, 0]]))
+        stat['seconds'] += time.perf_counter() - start
+
+    union = _UnionFind(n_nodes)
+    for node, point in links:
+        union.union(int(node), int(owner_node[point]))
+
+    unique_labels = np.full(n_unique, -1, dtype=np.int64)
+    core_idx = np.flatnonzero(is_core)
+    roots = np.array([union.find(int(node)) for node in owner_node[core_idx]], dtype=np.int64)
+    unique_labels[core_idx] = roots
+    for point, node in border:
+        unique_labels[point] = union.find(int(node))
+
+    # Consecutive cluster ids
+    clustered = unique_labels >= 0
+    _, unique_labels[clustered] = np.unique(unique_labels[clustered], return_inverse=True)
+
+    model = DBSCAN(eps=eps, min_samples=min_samples)
+    model.core_sample_indices_ = core_idx
+    model.components_ = unique[core_idx]
+    model.labels_ = unique_labels
+    model.n_features_in_ = X.shape[1]
+
+    if verbose:
+        for stat in stats:
+            print(f"   Partition {stat['partition']}: {stat['points']:,} points "
+                  f"(+{stat['halo_points']:,} halo), {stat['core_points']:,} core, {stat['seconds']:.2f}s")
+
+    return PartitionedDBSCANResult(labels=unique_labels[inverse], model=model,
+                                   unique_points=n_unique, partitions=stats)
+
+
+# ============================================
+# MINI-BATCH K-MEANS
+# ============================================
+def stratified_sample(strata: np.ndarray, size: int, random_state: int = 42) -> np.ndarray:
+    """
+    Sorted row indices of a sample spread proportionally over ``strata``.
+
+    Every stratum keeps at least one row, so small states are not lost.
+
+    Args:
+        strata: Stratum (e.g. state) of every row
+        size: Approximate sample size
+    """
+    rng = np.random.RandomState(random_state)
+    if size >= len(strata):
+        return np.arange(len(strata))
+    codes, counts = np.unique(strata, return_inverse=True, return_counts=True)[1:]
+    quota = np.maximum(1, np.floor(counts * size / len(strata))).astype(np.int64)
+    order = np.argsort(codes, kind='stable')
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    picked = [rng.choice(order[start:start + count], q, replace=False)
+              for start, count, q in zip(starts, counts, quota)]
+    return np.sort(np.concatenate(picked))
+
+
+def iter_chunks(n_rows: int, chunk_rows: int, random_state: int = 42) -> Iterator[np.ndarray]:
+    """Row indices of ``n_rows`` in shuffled chunks of ``chunk_rows``."""
+    order = np.random.RandomState(random_state).permutation(n_rows)
+    for start in range(0, n_rows, chunk_rows):
+        yield order[start:start + chunk_rows]
+
+
+def predict_chunked(model: MiniBatchKMeans, X: np.ndarray, chunk_rows: int = 100000) -> np.ndarray:
+    """Cluster of every row of ``X``, predicted chunk by chunk."""
+    if not len(X):
+        return np.array([], dtype=np.int32)
+    return np.concatenate([model.predict(X[start:start + chunk_rows])
+                           for start in range(0, len(X), chunk_rows)])
+
+
+def kmeans_sweep(X: np.ndarray, k_values: Sequence[int], sample_idx: np.ndarray,
+                 batch_size: int = 4096, n_init: int = 3, max_iter: int = 100,
+                 chunk_rows: int = 100000, random_state: int = 42,
+                 n_jobs: Optional[int] = None) -> List[Dict]:
+    """
+    Fit one MiniBatchKMeans per candidate k, in parallel.
+
+    Args:
+        X: Scaled feature matrix (all records)
+        k_values: Candidate cluster counts
+        sample_idx: Rows used for the silhouette score (see stratified_sample)
+        n_jobs: Core budget (-1/None: all cores), split between candidates
+            fitted at the same time and the OpenMP/BLAS threads of each fit
+
+    Returns:
+        One dict per k (in ``k_values`` order) with the fitted ``model``,
+        ``inertia``, ``silhouette`` and ``seconds``
+    """
+    sample = X[sample_idx]
+
+    def fit(k: int) -> Dict:
+        start = time.perf_counter()
+        model = MiniBatchKMeans(n_clusters=k, batch_size=batch_size, n_init=n_init,
+                                max_iter=max_iter, random_state=random_state)
+        model.fit(X)
+        labels = predict_chunked(model, sample, chunk_rows)
+        silhouette = silhouette_score(sample, labels) if len(np.unique(labels)) > 1 else 0.0
+        return {'k': k, 'model': model, 'inertia': float(model.inertia_),
+                'silhouette': float(silhouette), 'seconds': time.perf_counter() - start}
+
+    cores = n_jobs if n_jobs and n_jobs > 0 else (os.cpu_count() or 1)
+    workers = max(1, min(cores, len(k_values)))
+    # workers x threads per fit stays within the budget (no cores^2 oversubscription)
+    with threadpool_limits(limits=max(1, cores // workers)):
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(fit, k_values))
+
+
+def streaming_kmeans(X: np.ndarray, init_centers: np.ndarray, chunk_rows: int = 100000,
+                     batch_size: int = 4096, epochs: int = 2,
+                     random_state: int = 42) -> MiniBatchKMeans:
+    """
+    Refit K-Means with ``partial_fit`` over shuffled chunks of every record.
+
+    Args:
+        X: Scaled feature matrix (all records)
+        init_centers: Starting centers (e.g. the best sweep candidate)
+        epochs: Passes over the data
+    """
+    model = MiniBatchKMeans(n_clusters=len(init_centers), init=init_centers, n_init=1,
+                            batch_size=batch_size, random_state=random_state)
+    for epoch in range(epochs):
+        for chunk in iter_chunks(len(X), chunk_rows, random_state + epoch):
+            model.partial_fit(X[chunk])
+    return model
+
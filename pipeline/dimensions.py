@@ -0,0 +1,120 @@
+"""
+🧭 AADHAAR INTELLIGENCE SYSTEM - Pincode Dimension
+===================================================
+One row per pincode with its descriptive attributes, referenced by the
+pincode-level output tables through a stable integer key.
+
+    outputs/pincode_dimension.csv:  pincode_key, pincode, state, district,
+                                    latitude, longitude
+
+A pincode whose records name several (state, district) places gets the
+place with the most enrolments. ``pincode_key`` never changes for a
+pincode: keys of the previous dimension are kept and new pincodes are
+appended after the largest key.
+
+Fact tables (master_pincode_analysis.csv, priority_deployment_pincodes.csv)
+keep ``pincode_key`` and ``pincode`` with their measures and drop the
+descriptive columns (``to_fact``). Readers put them back with
+``join_dimension``, a positional take on the dimension's columns instead
+of a merge.
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import os
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+DIMENSION_FILE = 'pincode_dimension.csv'
+KEY_COLUMN = 'pincode_key'
+ATTRIBUTE_COLUMNS = ['state', 'district', 'latitude', 'longitude']
+DIMENSION_COLUMNS = [KEY_COLUMN, 'pincode'] + ATTRIBUTE_COLUMNS
+
+
+def dedupe_pincodes(df: pd.DataFrame, measures: List[str], weight: str = 'total_enrolments') -> pd.DataFrame:
+    """
+    Collapse a pincode-level table to one row per pincode.
+
+    ``measures`` are summed over the pincode's rows; every other column is
+    taken from its row with the largest ``weight``.
+    """
+    if not df['pincode'].duplicated().any():
+        return df
+    order = np.lexsort((-df[weight].to_numpy(dtype=np.float64), df['pincode'].to_numpy()))
+    ranked = df.iloc[order]
+    first = ~ranked['pincode'].duplicated().to_numpy()
+    sums = ranked.groupby('pincode', sort=True)[measures].sum()
+    out = ranked[first].reset_index(drop=True)
+    out[measures] = sums.to_numpy()
+    return out
+
+
+def build_pincode_dimension(df: pd.DataFrame, previous: Optional[pd.DataFrame] = None,
+                            weight: str = 'total_enrolments') -> pd.DataFrame:
+    """
+    Dimension rows of every pincode of a pincode-level table.
+
+    Args:
+        df: Rows with ``pincode`` and the attribute columns (several rows
+            per pincode allowed)
+        previous: Previous dimension, whose keys are kept
+    """
+    columns = ['pincode'] + [col for col in ATTRIBUTE_COLUMNS if col in df.columns]
+    if weight in df.columns and df['pincode'].duplicated().any():
+        order = np.lexsort((-df[weight].to_numpy(dtype=np.float64), df['pincode'].to_numpy()))
+        df = df.iloc[order]
+    dimension = df[columns].drop_duplicates(subset='pincode').sort_values('pincode').reset_index(drop=True)
+
+    keys = np.full(len(dimension), -1, dtype=np.int64)
+    if previous is not None and len(previous):
+        known = pd.Series(previous[KEY_COLUMN].to_numpy(), index=previous['pincode'].to_numpy())
+        keys = known.reindex(dimension['pincode'].to_numpy()).fillna(-1).to_numpy(dtype=np.int64)
+    new = keys < 0
+    start = int(previous[KEY_COLUMN].max()) + 1 if previous is not None and len(previous) else 1
+    keys[new] = np.arange(start, start + int(new.sum()))
+    dimension.insert(0, KEY_COLUMN, keys)
+    return dimension
+
+
+def to_fact(df: pd.DataFrame, dimension: pd.DataFrame) -> pd.DataFrame:
+    """Replace the descriptive columns of a pincode-level table by ``pincode_key``."""
+    position = pd.Index(dimension['pincode']).get_indexer(df['pincode'])
+    if (position < 0).any():
+        raise ValueError(f"{int((position < 0).sum())} pincodes are missing from the dimension")
+    fact = df.drop(columns=[col for col in ATTRIBUTE_COLUMNS + [KEY_COLUMN] if col in df.columns])
+    fact.insert(0, KEY_COLUMN, dimension[KEY_COLUMN].to_numpy()[position])
+    return fact
+
+
+def join_dimension(fact: pd.DataFrame, dimension: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the dimension attributes to a fact table by ``pincode_key``.
+
+    Keys unknown to the dimension get missing attributes. Columns the fact
+    already has are left as they are.
+    """
+    position = pd.Index(dimension[KEY_COLUMN]).get_indexer(fact[KEY_COLUMN])
+    found = position >= 0
+    joined = fact.copy(deep=False)
+    for col in ATTRIBUTE_COLUMNS:
+        if col in joined.columns or col not in dimension.columns:
+            continue
+        values = dimension[col].to_numpy()[np.maximum(position, 0)]
+        joined[col] = np.where(found, values, None) if values.dtype == object else np.where(found, values, np.nan)
+    return joined
+
+
+def save_dimension(dimension: pd.DataFrame, output_dir: str):
+    path = os.path.join(output_dir, DIMENSION_FILE)
+    tmp = path + '.tmp'
+    dimension.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def load_dimension(output_dir: str) -> Optional[pd.DataFrame]:
+    """The pincode dimension, or None before the first refresh."""
+    path = os.path.join(output_dir, DIMENSION_FILE)
+    return pd.read_csv(path) if os.path.exists(path) else None
@@ -0,0 +1,65 @@
+"""
+🧮 AADHAAR INTELLIGENCE SYSTEM - Model Features
+================================================
+Feature construction shared by model training and the API.
+
+``models/train_models.py`` builds its training matrices with these functions
+and ``backend/api.py`` builds prediction inputs with the same ones, so a
+served model always sees features in the order and scale it was fitted on.
+
+    - Isolation Forest: pincode-day profile (sum/mean/std of each age count)
+    - K-Means: the raw age counts of a record
+    - Random Forest: lag / rolling / calendar features of pincode series
+      (see ``pipeline/timeseries.py``)
+
+``pincode`` is an identifier, not a measurement, and is never used as a
+feature or target.
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Enrolment count columns, in feature order
+COUNT_COLUMNS = ['age_0_5', 'age_5_17', 'age_18_greater']
+
+# Isolation Forest observations: one profile per pincode-day
+PROFILE_KEYS = ['pincode', 'date']
+PROFILE_AGGREGATIONS = ['sum', 'mean', 'std']
+PROFILE_COLUMNS = [f'{col}_{agg}' for col in COUNT_COLUMNS for agg in PROFILE_AGGREGATIONS]
+
+def _counts(df: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    return df[columns].fillna(0).to_numpy(dtype=np.float64)
+
+
+def pincode_profile(df: pd.DataFrame, keys: Sequence[str] = tuple(PROFILE_KEYS)) -> pd.DataFrame:
+    """
+    Enrolment profile used by the Isolation Forest.
+
+    A group with a single record has a std of 0.
+
+    Args:
+        df: Enrolment records
+        keys: Grouping columns (default: one profile per pincode-day)
+
+    Returns:
+        DataFrame with the key columns followed by PROFILE_COLUMNS
+    """
+    grouped = df.groupby(list(keys), observed=True, dropna=False)[COUNT_COLUMNS]
+    profile = grouped.agg(PROFILE_AGGREGATIONS)
+    profile.columns = [f'{col}_{agg}' for col, agg in profile.columns]
+    return profile[PROFILE_COLUMNS].fillna(0).reset_index()
+
+
+def profile_features(profile: pd.DataFrame) -> np.ndarray:
+    """Isolation Forest input matrix from a ``pincode_profile`` frame."""
+    return profile[PROFILE_COLUMNS].to_numpy(dtype=np.float64)
+
+
+def cluster_features(df: pd.DataFrame) -> np.ndarray:
+    """K-Means input matrix: one row of age counts per record."""
+    return _counts(df, COUNT_COLUMNS)
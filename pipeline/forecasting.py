@@ -0,0 +1,399 @@
+"""
+🗺️ AADHAAR INTELLIGENCE SYSTEM - Hierarchical Demand Forecasts
+===============================================================
+Monthly enrolment forecasts for every pincode, district and state (and
+the national total), consistent across the hierarchy.
+
+    1. Monthly series per pincode (``timeseries.series_matrix``); district,
+       state and national series are their sums.
+    2. Every series of every level gets a damped Holt (level + trend)
+       model. Smoothing parameters are picked per series from a small grid
+       by one-step-ahead error. Blocks of series are fitted in a process
+       pool; within a block all series and grid points are updated at once.
+    3. Bottom-up reconciliation: a district forecast is the sum of its
+       pincodes, a state forecast the sum of its districts. The level's own
+       fit is kept as ``base_forecast``. Intervals add the children's
+       variances.
+    4. A holdout of the latest months scores base and reconciled forecasts
+       per level (WAPE).
+
+History and forecasts of all levels are written as one long Parquet table
+(``data/store/_forecasts/forecasts.parquet``) with a JSON summary next to
+it; the API reads them for ``/api/demand-forecast`` and derives staffing
+plans for any geography (``staffing_plan``). Nightly refit::
+
+    python -m pipeline.forecasting [--workers N] [--horizon MONTHS]
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .features import COUNT_COLUMNS
+from .loader import default_workers
+from .store import STORE_DIR, HAS_PYARROW, load_dataset
+from .timeseries import series_matrix
+
+FORECAST_DIR = os.path.join(STORE_DIR, '_forecasts')
+FORECAST_FILE = 'forecasts.parquet'
+SUMMARY_FILE = 'summary.json'
+
+LEVELS = ['national', 'state', 'district', 'pincode']
+NATIONAL_KEY = 'India'
+
+HORIZON = 6                 # Months forecast
+HOLDOUT = 2                 # Latest months held out to score the forecasts
+FIT_BLOCK_SERIES = 4096     # Series per process-pool task
+
+# Damped Holt smoothing grid (level alpha x trend beta), damping phi
+ALPHAS = np.array([0.2, 0.4, 0.6, 0.8])
+BETAS = np.array([0.05, 0.2, 0.4])
+PHI = 0.9
+INTERVAL_Z = 1.2816         # 80% interval
+
+# Staffing: enrolments one operator handles per working day (as /api/predict)
+ENROLMENTS_PER_STAFF_DAY = 50
+WORKING_DAYS_PER_MONTH = 25
+
+
+# ============================================
+# FITTING
+# ============================================
+def fit_holt(values: np.ndarray, horizon: int = HORIZON):
+    """
+    Damped Holt forecasts of a block of series.
+
+    Args:
+        values: (n_series, n_periods) history
+        horizon: Periods to forecast
+
+    Returns:
+        (forecast (n_series, horizon), residual std (n_series,))
+    """
+    n, periods = values.shape
+    if periods < 3:
+        last = values[:, -1:] if periods else np.zeros((n, 1))
+        return np.repeat(last, horizon, axis=1), np.zeros(n)
+
+    alpha = np.repeat(ALPHAS, len(BETAS))[:, None]       # (grid, 1)
+    beta = np.tile(BETAS, len(ALPHAS))[:, None]
+    level = np.broadcast_to(values[:, 0], (len(alpha), n)).copy()
+    trend = np.broadcast_to(values[:, 1] - values[:, 0], (len(alpha), n)).copy()
+    sse = np.zeros((len(alpha), n))
+    for t in range(1, periods):
+        expected = level + PHI * trend
+        sse += (values[:, t] - expected) ** 2
+        new_level = alpha * values[:, t] + (1 - alpha) * expected
+        trend = beta * (new_level - level) + (1 - beta) * PHI * trend
+        level = new_level
+
+    best = np.argmin(sse, axis=0)
+    columns = np.arange(n)
+    damping = np.cumsum(PHI ** np.arange(1, horizon + 1))
+    forecast = level[best, columns][:, None] + trend[best, columns][:, None] * damping
+    sigma = np.sqrt(sse[best, columns] / (periods - 1))
+    return np.clip(forecast, 0, None), sigma
+
+
+def fit_series(values: np.ndarray, horizon: int = HORIZON, workers: Optional[int] = None):
+    """
+    ``fit_holt`` over many series, in blocks of FIT_BLOCK_SERIES on a process pool.
+    """
+    workers = workers or default_workers()
+    blocks = [values[start:start + FIT_BLOCK_SERIES] for start in range(0, len(values), FIT_BLOCK_SERIES)]
+    if workers == 1 or len(blocks) <= 1:
+        results = [fit_holt(block, horizon) for block in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(blocks))) as pool:
+            results = list(pool.map(fit_holt, blocks, [horizon] * len(blocks)))
+    if not results:
+        return np.zeros((0, horizon)), np.zeros(0)
+    return np.vstack([f for f, _ in results]), np.concatenate([s for _, s in results])
+
+
+# ============================================
+# HIERARCHY
+# ============================================
+@dataclass
+class Hierarchy:
+    """Pincode series and the district / state each pincode rolls up to."""
+    periods: np.ndarray          # datetime64[D], first day of each month
+    keys: Dict[str, np.ndarray]  # level -> series keys
+    parent: Dict[str, np.ndarray]  # level -> index of each series' parent in the level above
+    states: Dict[str, np.ndarray]  # level -> state of each series (None for national)
+    values: Dict[str, np.ndarray]  # level -> (n_series, n_periods)
+
+
+def _aggregate(values: np.ndarray, groups: np.ndarray, n_groups: int) -> np.ndarray:
+    """Sum rows of ``values`` into ``n_groups`` rows."""
+    out = np.zeros((n_groups,) + values.shape[1:])
+    np.add.at(out, groups, values)
+    return out
+
+
+def build_hierarchy(df: pd.DataFrame) -> Hierarchy:
+    """
+    Monthly series of all levels from enrolment records.
+
+    A pincode whose records name several districts is assigned to the one
+    with the most records. Districts are keyed by (state, district).
+    """
+    matrix = series_matrix(df, 'pincode', 'M')
+    pincodes = matrix.keys
+
+    places = (df[df['date'].notna()]
+              .astype({'state': str, 'district': str})
+              .groupby(['pincode', 'state', 'district'], observed=True).size()
+              .sort_values(ascending=False, kind='stable').reset_index())
+    places = places.drop_duplicates('pincode').set_index('pincode').reindex(pincodes)
+
+    district_code, districts = pd.MultiIndex.from_arrays(
+        [places['state'].to_numpy(), places['district'].to_numpy()]).factorize(sort=True)
+    district_states = districts.get_level_values(0).to_numpy()
+    state_code, states = pd.factorize(district_states, sort=True)
+
+    values = {'pincode': matrix.values}
+    values['district'] = _aggregate(values['pincode'], district_code, len(districts))
+    values['state'] = _aggregate(values['district'], state_code, len(states))
+    values['national'] = values['state'].sum(axis=0, keepdims=True)
+
+    return Hierarchy(
+        periods=matrix.periods,
+        keys={'pincode': pincodes.astype(str), 'district': districts.get_level_values(1).to_numpy(),
+              'state': np.asarray(states), 'national': np.array([NATIONAL_KEY])},
+        parent={'pincode': district_code, 'district': state_code, 'state': np.zeros(len(states), dtype=np.int64)},
+        states={'pincode': places['state'].to_numpy(), 'district': district_states,
+                'state': np.asarray(states), 'national': np.array([None])},
+        values=values,
+    )
+
+
+def reconcile(hierarchy: Hierarchy, fits: Dict[str, tuple]) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Bottom-up reconciliation of per-level fits.
+
+    Args:
+        fits: level -> (forecast, sigma) from ``fit_series``
+
+    Returns:
+        level -> {'forecast', 'variance', 'base_forecast'}, each (n_series, horizon)
+    """
+    forecast, sigma = fits['pincode']
+    steps = np.arange(1, forecast.shape[1] + 1)
+    variance = sigma[:, None] ** 2 * steps
+    out = {'pincode': {'forecast': forecast, 'variance': variance, 'base_forecast': forecast}}
+    for child, level in zip(LEVELS[:0:-1], LEVELS[-2::-1]):
+        n = len(hierarchy.keys[level])
+        forecast = _aggregate(forecast, hierarchy.parent[child], n)
+        variance = _aggregate(variance, hierarchy.parent[child], n)
+        out[level] = {'forecast': forecast, 'variance': variance, 'base_forecast': fits[level][0]}
+    return out
+
+
+def forecast_hierarchy(hierarchy: Hierarchy, horizon: int = HORIZON,
+                       workers: Optional[int] = None) -> Dict[str, Dict[str, np.ndarray]]:
+    """Fit every level and reconcile bottom-up."""
+    fits = {level: fit_series(hierarchy.values[level], horizon, workers) for level in LEVELS}
+    return reconcile(hierarchy, fits)
+
+
+def holdout_scores(hierarchy: Hierarchy, holdout: int = HOLDOUT,
+                   workers: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+    """
+    WAPE (%) of base and reconciled forecasts of the last ``holdout`` months.
+
+    Empty if the history is too short to hold months out.
+    """
+    if hierarchy.periods.size < holdout + 3:
+        return {}
+    train = Hierarchy(hierarchy.periods[:-holdout], hierarchy.keys, hierarchy.parent, hierarchy.states,
+                      {level: values[:, :-holdout] for level, values in hierarchy.values.items()})
+    result = forecast_hierarchy(train, holdout, workers)
+    scores = {}
+    for level in LEVELS:
+        actual = hierarchy.values[level][:, -holdout:]
+        total = max(actual.sum(), 1e-9)
+        scores[level] = {
+            'base_wape': round(float(np.abs(result[level]['base_forecast'] - actual).sum() / total * 100), 2),
+            'wape': round(float(np.abs(result[level]['forecast'] - actual).sum() / total * 100), 2),
+        }
+    return scores
+
+
+def forecast_frame(hierarchy: Hierarchy, result: Dict[str, Dict[str, np.ndarray]]) -> pd.DataFrame:
+    """
+    Long table of history and forecasts of every series.
+
+    Returns:
+        DataFrame with ``level``, ``key``, ``state``, ``period``, ``actual``
+        (history rows) and ``forecast``, ``lower``, ``upper``,
+        ``base_forecast`` (forecast rows)
+    """
+    horizon = next(iter(result.values()))['forecast'].shape[1]
+    last_month = hierarchy.periods[-1].astype('datetime64[M]')
+    future = (last_month + np.arange(1, horizon + 1)).astype('datetime64[D]')
+    periods = np.concatenate([hierarchy.periods, future])
+    n_hist = len(hierarchy.periods)
+
+    parts = []
+    for level in LEVELS:
+        n = len(hierarchy.keys[level])
+        reconciled = result[level]
+        spread = INTERVAL_Z * np.sqrt(reconciled['variance'])
+        blank = np.full((n, horizon), np.nan)
+        history = np.full((n, n_hist), np.nan)
+        parts.append(pd.DataFrame({
+            'level': level,
+            'key': np.repeat(hierarchy.keys[level], len(periods)),
+            'state': np.repeat(hierarchy.states[level], len(periods)),
+            'period': np.tile(periods, n),
+            'actual': np.hstack([hierarchy.values[level], blank]).ravel(),
+            'forecast': np.hstack([history, reconciled['forecast']]).ravel(),
+            'lower': np.hstack([history, np.clip(reconciled['forecast'] - spread, 0, None)]).ravel(),
+            'upper': np.hstack([history, reconciled['forecast'] + spread]).ravel(),
+            'base_forecast': np.hstack([history, reconciled['base_forecast']]).ravel(),
+        }))
+    frame = pd.concat(parts, ignore_index=True)
+    frame['period'] = frame['period'].astype('datetime64[ns]')
+    return frame
+
+
+# ============================================
+# PERSISTENCE
+# ============================================
+def refit(df: pd.DataFrame, output_dir: Optional[str] = None, horizon: int = HORIZON,
+          workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Fit, reconcile and persist forecasts of all levels.
+
+    Returns:
+        The summary written next to the forecasts
+    """
+    output_dir = output_dir or FORECAST_DIR
+    start = time.time()
+    hierarchy = build_hierarchy(df)
+    result = forecast_hierarchy(hierarchy, horizon, workers)
+    frame = forecast_frame(hierarchy, result)
+    fit_seconds = time.time() - start
+
+    summary = {
+        'generated_at': datetime.now().isoformat(),
+        'horizon': horizon,
+        'history_start': str(hierarchy.periods[0])[:7] if hierarchy.periods.size else None,
+        'history_end': str(hierarchy.periods[-1])[:7] if hierarchy.periods.size else None,
+        'series': {level: int(len(hierarchy.keys[level])) for level in LEVELS},
+        'fit_seconds': round(fit_seconds, 2),
+        'holdout_months': HOLDOUT,
+        'holdout': holdout_scores(hierarchy, HOLDOUT, workers),
+    }
+
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, FORECAST_FILE)
+    frame.to_parquet(path + '.tmp', index=False)
+    os.replace(path + '.tmp', path)
+    summary_path = os.path.join(output_dir, SUMMARY_FILE)
+    with open(summary_path + '.tmp', 'w') as f:
+        json.dump(summary, f, indent=2)
+    os.replace(summary_path + '.tmp', summary_path)
+    return summary
+
+
+def load_forecasts(output_dir: Optional[str] = None):
+    """
+    Persisted forecasts and their summary.
+
+    Returns:
+        (forecast frame, summary dict), or (None, {}) if not generated yet
+    """
+    output_dir = output_dir or FORECAST_DIR
+    path = os.path.join(output_dir, FORECAST_FILE)
+    if not HAS_PYARROW or not os.path.exists(path):
+        return None, {}
+    frame = pd.read_parquet(path)
+    frame['level'] = frame['level'].astype('category')
+    summary_path = os.path.join(output_dir, SUMMARY_FILE)
+    summary = {}
+    if os.path.exists(summary_path):
+        with open(summary_path) as f:
+            summary = json.load(f)
+    return frame, summary
+
+
+def select_series(frame: pd.DataFrame, level: str = 'national', key: Optional[str] = None,
+                  state: Optional[str] = None) -> pd.DataFrame:
+    """
+    Rows of one series, in period order.
+
+    ``state`` disambiguates district names used in several states.
+    """
+    rows = frame[frame['level'] == level]
+    if key is not None:
+        rows = rows[rows['key'] == str(key)]
+    if state is not None:
+        rows = rows[rows['state'] == state]
+    keys = rows['key'].unique()
+    if len(keys) > 1:
+        rows = rows[rows['key'] == keys[0]]
+    return rows.sort_values('period')
+
+
+def staffing_plan(series: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Staff needed per forecast month of one series.
+
+    The base is the staff the last observed month needed.
+    """
+    per_staff = ENROLMENTS_PER_STAFF_DAY * WORKING_DAYS_PER_MONTH
+    history = series[series['actual'].notna()]
+    future = series[series['forecast'].notna()]
+    last_actual = float(history['actual'].iloc[-1]) if len(history) else 0.0
+    base_staff = int(np.ceil(last_actual / per_staff))
+
+    plan = []
+    for row in future.itertuples(index=False):
+        required = int(np.ceil(row.forecast / per_staff))
+        plan.append({
+            "month": pd.Timestamp(row.period).strftime("%b '%y"),
+            "predicted": int(round(row.forecast)),
+            "staff_required": required,
+            "staff_change": required - base_staff,
+        })
+    return {"base_staff": base_staff, "enrolments_per_staff_month": per_staff, "plan": plan}
+
+
+def main():
+    """Command-line entry point for the nightly forecast refit."""
+    parser = argparse.ArgumentParser(description="Refit hierarchical enrolment forecasts")
+    parser.add_argument('--horizon', type=int, default=HORIZON, help="Months to forecast")
+    parser.add_argument('--workers', type=int, help="Fitting processes (default: one per core)")
+    parser.add_argument('--output-dir', help=f"Output folder (default: {FORECAST_DIR})")
+    args = parser.parse_args()
+
+    if not HAS_PYARROW:
+        raise SystemExit("❌ pyarrow is required to persist forecasts")
+
+    # Ingests new CSV shards first
+    start = time.time()
+    df = load_dataset('enrolment', columns=['date', 'state', 'district', 'pincode'] + COUNT_COLUMNS,
+                      workers=args.workers)
+    summary = refit(df, args.output_dir, args.horizon, args.workers)
+    series = ', '.join(f"{n:,} {level}" for level, n in summary['series'].items())
+    print(f"✅ Forecast {series} series {args.horizon} months ahead in "
+          f"{time.time() - start:.1f}s -> {args.output_dir or FORECAST_DIR}")
+    for level, scores in summary['holdout'].items():
+        print(f"   {level}: holdout WAPE {scores['wape']:.1f}% (base fit {scores['base_wape']:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
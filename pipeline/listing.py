@@ -0,0 +1,193 @@
+"""
+📄 AADHAAR INTELLIGENCE SYSTEM - Pincode Listings
+=================================================
+Paged, filtered and projected reads of the pincode-level tables
+(master_pincode_analysis, priority_deployment_pincodes) for the API.
+
+Everything a page needs is built once per data load:
+
+    - columns:  one numpy array per column (no DataFrame at request time)
+    - ranks:    per sort key, the position of every row in that order
+    - slices:   per sort key and state, the state's row positions in that
+                order (None = all states), with their ranks
+    - district / category codes for vectorized equality filters
+
+A page takes the slice of the requested state and sort key, skips to the
+cursor with a binary search on the slice's ranks, masks the district and
+category filters over what follows and converts only the ``limit`` rows
+(and requested fields) it returns to Python values.
+
+Cursors are keyset cursors (the rank of the last row returned), so pages
+do not shift or repeat while being walked; they are only valid for the
+data version they were issued in.
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import base64
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Sortable columns ('row' is the file order); missing columns are skipped
+SORT_KEYS = ['row', 'pincode', 'total_enrolments', 'total_activity', 'daily_enrolment_rate',
+             'enrolment_days', 'total_demo_updates', 'total_bio_updates']
+MAX_PAGE_SIZE = 5000
+
+
+class CursorError(ValueError):
+    """A well-formed cursor from another data version or query (expired)."""
+
+
+class MalformedCursorError(ValueError):
+    """A cursor that was not issued by ``encode_cursor``."""
+
+
+def encode_cursor(version: int, sort: str, descending: bool, rank: int) -> str:
+    raw = json.dumps([version, sort, int(descending), int(rank)], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, version: int, sort: str, descending: bool) -> int:
+    """
+    Rank of the last row of the previous page.
+
+    Raises:
+        MalformedCursorError: Not a cursor; CursorError: a cursor of
+            another data version or sort order
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_version, cursor_sort, cursor_desc, rank = json.loads(raw)
+        rank = int(rank)
+    except (ValueError, TypeError) as e:
+        raise MalformedCursorError(f"Malformed cursor: {e}") from e
+    if cursor_version != version:
+        raise CursorError("Cursor is from an older data version; restart from the first page")
+    if cursor_sort != sort or bool(cursor_desc) != descending:
+        raise CursorError("Cursor was issued for a different sort order")
+    return rank
+
+
+def _key(values: pd.Series) -> np.ndarray:
+    """Case- and whitespace-insensitive filter key of a text column."""
+    return values.astype('string').str.strip().str.lower().fillna('').to_numpy(dtype=object)
+
+
+class PincodeListing:
+    """Pre-sorted, pre-sliced columns of a pincode-level table."""
+
+    def __init__(self, frame: pd.DataFrame, version: int = 0):
+        frame = frame.reset_index(drop=True)
+        self.version = version
+        self.fields = list(frame.columns)
+        self.columns = {name: frame[name].to_numpy() for name in self.fields}
+        n = len(frame)
+
+        states = _key(frame['state']) if 'state' in frame.columns else np.full(n, '', dtype=object)
+        state_codes, state_names = pd.factorize(states)
+        self._codes: Dict[str, tuple] = {}
+        for name in ['district', 'activity_category']:
+            if name in frame.columns:
+                codes, uniques = pd.factorize(_key(frame[name]))
+                self._codes[name] = (codes, {value: i for i, value in enumerate(uniques)})
+
+        self.sort_keys = [key for key in SORT_KEYS if key == 'row' or key in frame.columns]
+        self.ranks: Dict[str, np.ndarray] = {}
+        self.slices: Dict[str, Dict[Optional[str], tuple]] = {}
+        for key in self.sort_keys:
+            if key == 'row':
+                order = np.arange(n)
+            else:
+                values = pd.to_numeric(frame[key], errors='coerce').to_numpy(dtype=np.float64)
+                order = np.argsort(np.nan_to_num(values, nan=-np.inf), kind='stable')   # Missing values first
+            rank = np.empty(n, dtype=np.int64)
+            rank[order] = np.arange(n)
+            self.ranks[key] = rank
+
+            # Stable sort by state keeps the key order inside each state
+            by_state = order[np.argsort(state_codes[order], kind='stable')]
+            bounds = np.searchsorted(state_codes[by_state], np.arange(len(state_names) + 1))
+            slices = {None: (order, np.arange(n))}
+            for code, state in enumerate(state_names):
+                positions = by_state[bounds[code]:bounds[code + 1]]
+                slices[state] = (positions, rank[positions])
+            self.slices[key] = slices
+
+    def __len__(self) -> int:
+        return len(self.ranks['row'])
+
+    def page(self, state: Optional[str] = None, district: Optional[str] = None,
+             category: Optional[str] = None, sort: str = 'row', descending: bool = False,
+             cursor: Optional[str] = None, limit: int = 100,
+             fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        One page of rows.
+
+        Args:
+            state, district, category: Exact (case-insensitive) filters
+            sort: One of ``sort_keys``
+            cursor: ``next_cursor`` of the previous page
+            fields: Columns to return (all if None)
+
+        Returns:
+            Dict with ``results`` (records), ``count`` and ``next_cursor``
+            (None on the last page)
+
+        Raises:
+            ValueError: Unknown sort key or field, or a malformed cursor
+                (MalformedCursorError); CursorError for an expired cursor
+        """
+        if sort not in self.sort_keys:
+            raise ValueError(f"Unknown sort key: {sort} (expected one of {self.sort_keys})")
+        fields = fields or self.fields
+        unknown = [f for f in fields if f not in self.columns]
+        if unknown:
+            raise ValueError(f"Unknown fields: {unknown} (available: {self.fields})")
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        empty = {'results': [], 'count': 0, 'next_cursor': None}
+        state_key = state.strip().lower() if state else None
+        if state_key not in self.slices[sort]:
+            return empty
+        positions, ranks = self.slices[sort][state_key]
+
+        # Rows after the cursor, in page order
+        if cursor is not None:
+            last = decode_cursor(cursor, self.version, sort, descending)
+            if descending:
+                positions = positions[:np.searchsorted(ranks, last, side='left')]
+            else:
+                positions = positions[np.searchsorted(ranks, last, side='right'):]
+        if descending:
+            positions = positions[::-1]
+
+        for name, value in [('district', district), ('activity_category', category)]:
+            if value is None:
+                continue
+            if name not in self._codes:
+                return empty
+            codes, lookup = self._codes[name]
+            code = lookup.get(value.strip().lower())
+            if code is None:
+                return empty
+            positions = positions[codes[positions] == code]
+
+        page = positions[:limit]
+        records = [dict(zip(fields, row)) for row in zip(*(_to_python(self.columns[f][page]) for f in fields))] \
+            if len(page) else []
+        next_cursor = encode_cursor(self.version, sort, descending, self.ranks[sort][page[-1]]) \
+            if len(positions) > limit else None
+        return {'results': records, 'count': len(records), 'next_cursor': next_cursor}
+
+
+def _to_python(values: np.ndarray) -> list:
+    """Column values as JSON-ready Python objects (NaN -> None)."""
+    if values.dtype.kind == 'f':
+        return [None if v != v else v for v in values.tolist()]
+    if values.dtype.kind in 'iub':
+        return values.tolist()
+    return [None if isinstance(v, float) and v != v or v is pd.NA else v for v in values.tolist()]
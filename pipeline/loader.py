@@ -0,0 +1,219 @@
+"""
+⚡ AADHAAR INTELLIGENCE SYSTEM - Parallel Shard Loader
+======================================================
+Parses CSV shards across a process pool with a bounded memory footprint.
+
+Each worker parses and downcasts one shard (int32 counts, categorical
+state/district, parsed ``date``) and hands the compact frame back. The parent
+copies every result straight into one column buffer per output column and
+drops the shard frame, so peak memory stays close to the final frame plus the
+shards that are in flight:
+
+    - ``workers`` caps the number of parser processes
+    - ``memory_limit_mb`` caps the estimated memory of in-flight shards
+      (a shard is budgeted at ``PARSE_OVERHEAD`` x its CSV size)
+
+When the row count of every shard is known up front (the shard manifest
+records it) the output columns are preallocated and filled in place.
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Parsing a CSV shard temporarily needs a few times its on-disk size
+PARSE_OVERHEAD = 3
+
+
+def default_workers() -> int:
+    """Worker count used when none is configured (one per core)."""
+    return max(1, os.cpu_count() or 1)
+
+
+def path_size(path: str) -> int:
+    """Size of a file, or of all files below a folder (a store partition)."""
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+def map_shards(func: Callable, paths: Sequence[str], workers: Optional[int] = None,
+               memory_limit_mb: Optional[float] = None, args: Tuple = (),
+               overhead: float = PARSE_OVERHEAD) -> Iterator[Tuple[int, object]]:
+    """
+    Run ``func(path, *args)`` for every shard (file or folder) in a process pool.
+
+    Shards are submitted lazily: a new one is only started while the
+    number of running tasks is below ``workers`` and their budgeted
+    memory (``overhead`` x file size) is below ``memory_limit_mb``. At
+    least one shard is always in flight, whatever its size.
+
+    Yields:
+        (index into ``paths``, result) in completion order
+    """
+    workers = workers or default_workers()
+    budget = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+
+    if workers == 1 or len(paths) <= 1:
+        for index, path in enumerate(paths):
+            yield index, func(path, *args)
+        return
+
+    def cost(path: str) -> int:
+        return path_size(path) * overhead
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        pending: Dict = {}
+        in_flight = 0
+        next_index = 0
+
+        while next_index < len(paths) or pending:
+            while next_index < len(paths) and len(pending) < workers:
+                path_cost = cost(paths[next_index])
+                if pending and budget is not None and in_flight + path_cost > budget:
+                    break
+                future = pool.submit(func, paths[next_index], *args)
+                pending[future] = (next_index, path_cost)
+                in_flight += path_cost
+                next_index += 1
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, path_cost = pending.pop(future)
+                in_flight -= path_cost
+                yield index, future.result()
+
+
+class FrameBuilder:
+    """
+    Accumulates shard frames column by column.
+
+    Categorical columns are stored as int32 codes against a growing,
+    shared category list, so shards with different category sets can be
+    merged without object columns ever being materialised.
+    """
+
+    def __init__(self, row_counts: Optional[Sequence[int]] = None):
+        self.offsets = None
+        self.total_rows = None
+        if row_counts is not None:
+            self.offsets = np.concatenate([[0], np.cumsum(row_counts)]).astype(np.int64)
+            self.total_rows = int(self.offsets[-1])
+        self.columns: List[str] = []
+        self.buffers: Dict[str, object] = {}
+        self.dtypes: Dict[str, np.dtype] = {}
+        self.categories: Dict[str, Dict[object, int]] = {}
+        self.chunks: Dict[int, Dict[str, np.ndarray]] = {}
+        self.filled: List[int] = []
+
+    def _allocate(self, name: str, series: pd.Series):
+        self.columns.append(name)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            self.categories[name] = {}
+            dtype = np.dtype('int32')
+        else:
+            dtype = series.dtype
+        self.dtypes[name] = dtype
+        if self.total_rows is not None:
+            fill = -1 if name in self.categories else 0
+            self.buffers[name] = np.full(self.total_rows, fill, dtype=dtype)
+
+    def _values(self, name: str, series: pd.Series) -> np.ndarray:
+        if name not in self.categories:
+            return series.to_numpy()
+        lookup = self.categories[name]
+        for category in series.cat.categories:
+            if category not in lookup:
+                lookup[category] = len(lookup)
+        mapping = np.array([lookup[c] for c in series.cat.categories] + [-1], dtype=np.int32)
+        return mapping[series.cat.codes.to_numpy()]
+
+    def add(self, index: int, df: pd.DataFrame):
+        """Copy shard ``index`` into the buffers; the frame can be dropped afterwards."""
+        for name in df.columns:
+            if name not in self.columns:
+                self._allocate(name, df[name])
+        chunk = {name: self._values(name, df[name]) for name in df.columns}
+
+        if self.offsets is not None and len(df) != self.offsets[index + 1] - self.offsets[index]:
+            self._abandon_preallocation()
+
+        if self.offsets is not None:
+            start, stop = self.offsets[index], self.offsets[index + 1]
+            for name, values in chunk.items():
+                self.buffers[name][start:stop] = values
+            self.filled.append(index)
+        else:
+            self.chunks[index] = chunk
+
+    def _abandon_preallocation(self):
+        """Row counts were stale: move filled slices to chunks and concatenate later."""
+        for index in self.filled:
+            start, stop = self.offsets[index], self.offsets[index + 1]
+            self.chunks[index] = {name: buffer[start:stop].copy() for name, buffer in self.buffers.items()}
+        self.offsets = None
+        self.total_rows = None
+        self.buffers = {}
+        self.filled = []
+
+    def _column(self, chunk: Dict[str, np.ndarray], name: str) -> np.ndarray:
+        if name in chunk:
+            return chunk[name]
+        n_rows = len(next(iter(chunk.values())))
+        if name in self.categories:
+            return np.full(n_rows, -1, dtype=np.int32)
+        return np.zeros(n_rows, dtype=self.dtypes[name])   # Same fill and dtype as preallocation
+
+    def build(self) -> pd.DataFrame:
+        """Assemble the final frame (in shard order)."""
+        if self.chunks:
+            # Row counts were unknown or stale: fall back to ordered concatenation
+            ordered = [self.chunks[i] for i in sorted(self.chunks)]
+            self.buffers = {
+                name: np.concatenate([self._column(chunk, name) for chunk in ordered])
+                for name in self.columns
+            }
+            self.chunks = {}
+
+        data = {}
+        for name in self.columns:
+            values = self.buffers[name]
+            if name in self.categories:
+                categories = list(self.categories[name])
+                data[name] = pd.Categorical.from_codes(values, categories=categories)
+            else:
+                data[name] = values
+        return pd.DataFrame(data, copy=False)
+
+
+def load_shards(paths: Sequence[str], parse: Callable[[str], pd.DataFrame],
+                workers: Optional[int] = None, memory_limit_mb: Optional[float] = None,
+                row_counts: Optional[Sequence[int]] = None) -> Optional[pd.DataFrame]:
+    """
+    Parse shards in parallel and stream them into a single frame.
+
+    Args:
+        paths: CSV shards to load (output keeps this order)
+        parse: Top-level (picklable) function parsing one shard
+        workers: Parser processes (default: one per core)
+        memory_limit_mb: Ceiling for in-flight shard memory
+        row_counts: Rows per shard if known, enables preallocation
+
+    Returns:
+        Concatenated DataFrame, or None if ``paths`` is empty
+    """
+    if not paths:
+        return None
+
+    builder = FrameBuilder(row_counts)
+    for index, df in map_shards(parse, paths, workers, memory_limit_mb):
+        builder.add(index, df)
+        del df
+    return builder.build()
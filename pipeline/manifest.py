@@ -0,0 +1,126 @@
+"""
+📋 AADHAAR INTELLIGENCE SYSTEM - Shard Manifest
+================================================
+Tracks every raw CSV shard that has been ingested into the columnar store.
+
+Each entry records the shard's size, mtime, content hash and row count, so a
+pipeline run can tell which ``..._<start>_<end>.csv`` shards are new, changed
+or gone and only process that delta. The content hash is only recomputed when
+size or mtime differ from the recorded values.
+
+Manifest layout (``data/store/_manifest.json``)::
+
+    {
+      "enrolment": {
+        "api_data_aadhar_enrolment/api_data_aadhar_enrolment_0_500000.csv": {
+          "size": 12345678, "mtime": 1767225600.0, "sha256": "...", "rows": 500000
+        }
+      }
+    }
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import os
+import json
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+MANIFEST_NAME = '_manifest.json'
+HASH_CHUNK_SIZE = 1 << 20
+
+
+@dataclass
+class ShardDelta:
+    """Shards of one dataset that differ from the manifest."""
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    entries: Dict[str, Dict] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+
+def file_sha256(path: str) -> str:
+    """Content hash of a shard, read in 1 MB chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_path(store_dir: str) -> str:
+    return os.path.join(store_dir, MANIFEST_NAME)
+
+
+def load_manifest(store_dir: str) -> Dict[str, Dict[str, Dict]]:
+    """Load the manifest, or an empty one if the store has never been built."""
+    path = manifest_path(store_dir)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Ignoring unreadable manifest {path}: {e}")
+        return {}
+
+
+def save_manifest(manifest: Dict[str, Dict[str, Dict]], store_dir: str):
+    """Atomically write the manifest next to the store partitions."""
+    os.makedirs(store_dir, exist_ok=True)
+    path = manifest_path(store_dir)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def shard_key(path: str, dataset_dir: str) -> str:
+    """Manifest key of a shard: its path relative to the dataset folder."""
+    return os.path.relpath(path, dataset_dir).replace(os.sep, '/')
+
+
+def compute_delta(shards: List[str], dataset_dir: str,
+                  recorded: Optional[Dict[str, Dict]]) -> ShardDelta:
+    """
+    Compare the shards on disk with the recorded manifest entries.
+
+    Shards whose size and mtime match the manifest are trusted without
+    hashing. A shard that was touched but has identical content is kept
+    as unchanged with its new mtime.
+
+    Returns:
+        ShardDelta with the added/changed/removed keys and the manifest
+        entries for the shards still on disk (hash known, rows pending
+        for new content)
+    """
+    recorded = recorded or {}
+    delta = ShardDelta()
+
+    for path in shards:
+        key = shard_key(path, dataset_dir)
+        stat = os.stat(path)
+        entry = {'size': stat.st_size, 'mtime': stat.st_mtime}
+        previous = recorded.get(key)
+
+        if previous and previous.get('size') == entry['size'] and previous.get('mtime') == entry['mtime']:
+            delta.entries[key] = previous
+            continue
+
+        entry['sha256'] = file_sha256(path)
+        if previous is None:
+            delta.added.append(key)
+        elif previous.get('sha256') != entry['sha256']:
+            delta.changed.append(key)
+        else:
+            entry['rows'] = previous.get('rows')
+        delta.entries[key] = entry
+
+    delta.removed = sorted(set(recorded) - set(delta.entries))
+    return delta
@@ -0,0 +1,175 @@
+"""
+🏷️ AADHAAR INTELLIGENCE SYSTEM - Name Normalization
+===================================================
+Canonical state and district names for the raw UIDAI dumps, shared by the
+store reader, the aggregates, the training script, the notebooks and the
+backend API.
+
+The dumps spell the same place many ways ('WEST BENGAL', 'west  bengal',
+'Westbengal', 'Orissa', 'Jammu & Kashmir', ...) and carry junk values
+('100000'). A value is matched on its letters and digits only (lower case,
+'&' read as 'and'), so case, spacing and punctuation variants collapse
+without listing them:
+
+    - states:    canonical name of STATES / STATE_ALIASES; values without
+                 letters are invalid (None); anything else is title-cased
+    - districts: DISTRICT_ALIASES renames, otherwise whitespace-collapsed
+                 and title-cased
+
+Columns are normalized through their categorical codes: each distinct
+value is mapped once in Python, then every row is remapped with one numpy
+take on the codes. A multi-million-row column with a few thousand
+distinct values normalizes in milliseconds when it is already categorical
+(as read from the store) and in well under a second from plain strings.
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+# States and union territories (current names)
+STATES = [
+    'Andaman and Nicobar Islands', 'Andhra Pradesh', 'Arunachal Pradesh', 'Assam', 'Bihar',
+    'Chandigarh', 'Chhattisgarh', 'Dadra and Nagar Haveli and Daman and Diu', 'Delhi', 'Goa',
+    'Gujarat', 'Haryana', 'Himachal Pradesh', 'Jammu and Kashmir', 'Jharkhand', 'Karnataka',
+    'Kerala', 'Ladakh', 'Lakshadweep', 'Madhya Pradesh', 'Maharashtra', 'Manipur', 'Meghalaya',
+    'Mizoram', 'Nagaland', 'Odisha', 'Puducherry', 'Punjab', 'Rajasthan', 'Sikkim', 'Tamil Nadu',
+    'Telangana', 'Tripura', 'Uttar Pradesh', 'Uttarakhand', 'West Bengal',
+]
+
+# Old names and misspellings (matched like any value, see match_key)
+STATE_ALIASES = {
+    'West Bangal': 'West Bengal',
+    'Orissa': 'Odisha',
+    'Pondicherry': 'Puducherry',
+    'Uttaranchal': 'Uttarakhand',
+    'Chhatisgarh': 'Chhattisgarh',
+    'NCT of Delhi': 'Delhi',
+    'Andaman and Nicobar': 'Andaman and Nicobar Islands',
+    'Dadra and Nagar Haveli': 'Dadra and Nagar Haveli and Daman and Diu',
+    'Daman and Diu': 'Dadra and Nagar Haveli and Daman and Diu',
+    'The Dadra and Nagar Haveli and Daman and Diu': 'Dadra and Nagar Haveli and Daman and Diu',
+}
+
+# Renamed districts and common alternative spellings
+DISTRICT_ALIASES = {
+    'Gurgaon': 'Gurugram',
+    'Allahabad': 'Prayagraj',
+    'Faizabad': 'Ayodhya',
+    'Rangareddi': 'Rangareddy',
+    'Hugli': 'Hooghly',
+    'Haora': 'Howrah',
+    'Bangalore': 'Bengaluru',
+    'Bangalore Urban': 'Bengaluru Urban',
+    'Bangalore Rural': 'Bengaluru Rural',
+    'Mysore': 'Mysuru',
+    'Gulbarga': 'Kalaburagi',
+    'Belgaum': 'Belagavi',
+}
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+_SPACES = re.compile(r'\s+')
+
+
+def match_key(value: str) -> str:
+    """Lower-case letters and digits of a name ('&' read as 'and')."""
+    return _NON_ALNUM.sub('', value.lower().replace('&', 'and'))
+
+
+def _clean(value) -> Optional[str]:
+    """Stripped, whitespace-collapsed text (None for missing or empty values)."""
+    if value is None or (isinstance(value, float) and value != value) or value is pd.NA:
+        return None
+    text = _SPACES.sub(' ', str(value)).strip(' ,*-')
+    return text or None
+
+
+def _title(text: str) -> str:
+    """Title case that keeps joining words lower case ('Jammu and Kashmir')."""
+    words = text.title().split(' ')
+    return ' '.join(w.lower() if i and w.lower() in ('and', 'of', 'the') else w for i, w in enumerate(words))
+
+
+_STATE_LOOKUP = {match_key(name): name for name in STATES}
+_STATE_LOOKUP.update({match_key(alias): name for alias, name in STATE_ALIASES.items()})
+_DISTRICT_LOOKUP = {match_key(alias): name for alias, name in DISTRICT_ALIASES.items()}
+
+
+@lru_cache(maxsize=None)
+def normalize_state_name(state) -> Optional[str]:
+    """Canonical state name, or None for missing and invalid (non-text) values."""
+    text = _clean(state)
+    if text is None:
+        return None
+    key = match_key(text)
+    if not re.search('[a-z]', key):
+        return None
+    return _STATE_LOOKUP.get(key, _title(text))
+
+
+@lru_cache(maxsize=None)
+def normalize_district_name(district) -> Optional[str]:
+    """Canonical district name, or None for missing values."""
+    text = _clean(district)
+    if text is None:
+        return None
+    return _DISTRICT_LOOKUP.get(match_key(text), _title(text))
+
+
+def _normalize_column(values: pd.Series, normalize: Callable) -> pd.Series:
+    """Map every distinct value once and remap the rows through their codes."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+    new_codes, categories = pd.factorize(pd.Series([normalize(v) for v in uniques], dtype=object))
+    # Code -1 (missing) stays -1: append it as the last entry of the lookup
+    remap = np.append(new_codes, -1).astype(codes.dtype if codes.dtype.kind == 'i' else np.int64)
+    result = pd.Categorical.from_codes(remap[codes], categories=pd.Index(categories, dtype=object))
+    return pd.Series(result, index=values.index, name=values.name)
+
+
+def normalize_states(values: pd.Series) -> pd.Series:
+    """Canonical state names of a column, as a categorical (invalid -> NaN)."""
+    return _normalize_column(values, normalize_state_name)
+
+
+def normalize_districts(values: pd.Series) -> pd.Series:
+    """Canonical district names of a column, as a categorical."""
+    return _normalize_column(values, normalize_district_name)
+
+
+def normalize_frame(df: pd.DataFrame, columns: Iterable[str] = ('state', 'district'),
+                    drop_invalid: bool = True, categorical: Optional[bool] = None) -> pd.DataFrame:
+    """
+    Normalize the state / district columns of a frame.
+
+    Args:
+        columns: Columns to normalize ('state' and/or 'district')
+        drop_invalid: Drop rows whose state is missing or invalid
+        categorical: Return the columns as categoricals (default: only if
+            they were categorical)
+
+    Returns:
+        New frame sharing the other columns' data
+    """
+    normalizers = {'state': normalize_states, 'district': normalize_districts}
+    df = df.copy(deep=False)
+    for column in columns:
+        if column not in df.columns:
+            continue
+        keep_categorical = isinstance(df[column].dtype, pd.CategoricalDtype) if categorical is None else categorical
+        normalized = normalizers[column](df[column])
+        df[column] = normalized if keep_categorical else normalized.astype(object)
+
+    if drop_invalid and 'state' in columns and 'state' in df.columns:
+        valid = df['state'].notna().to_numpy()
+        if not valid.all():
+            df = df[valid].reset_index(drop=True)
+    return df
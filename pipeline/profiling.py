@@ -0,0 +1,310 @@
+"""
+⏱️ AADHAAR INTELLIGENCE SYSTEM - Stage Profiling
+================================================
+Wall time, CPU time, peak RSS and throughput of pipeline stages and of the
+phases inside them (loading, aggregation, scaling, fitting, metrics, ...).
+
+    profiler = Profiler(dump_dir='outputs/metrics/profiles', mode='cprofile')
+    with profiler.stage('kmeans', rows=len(df)):
+        phase('scale', rows=len(df))     # ends the previous phase, starts this one
+        ...
+        phase('fit')
+        ...
+    profiler.report()
+
+``phase`` is a module-level call that finds the stage open on the calling
+thread, so trainers can mark phases without a profiler argument (and the
+call does nothing outside a profiled stage). Stages may run concurrently on
+different threads.
+
+    - wall_s / thread_cpu_s: of the stage's own thread
+    - cpu_s: the whole process plus finished child processes (includes
+      BLAS / joblib threads and process pools; shared when stages overlap)
+    - peak_rss_mb: highest process RSS sampled while the stage or phase was
+      open (psutil or /proc; shared when stages overlap)
+    - rows_per_s: rows / wall_s when the caller gives a row count
+
+With ``mode='cprofile'`` each stage writes ``<stage>.prof`` (pstats; view
+with snakeviz or ``python -m pstats``). cProfile is process-wide on Python
+3.12+ (a second ``enable()`` fails while one is active, and an active
+profile records every thread), so in this mode stages must run one at a
+time: ``Profiler.serial`` is True and the trainer then runs its DAG with a
+single worker; overlapping cProfile stages raise RuntimeError. With ``mode='stacks'`` the stage's
+thread is sampled and written as ``<stage>.folded`` collapsed stacks, the
+same format as ``py-spy record --format raw`` (flamegraph.pl, speedscope).
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:  # Windows
+    HAS_RESOURCE = False
+
+PROFILE_MODES = ['cprofile', 'stacks']
+_CPROFILE_LOCK = threading.Lock()   # One cProfile-profiled stage at a time in the process
+SAMPLE_INTERVAL = 0.05      # Seconds between RSS / stack samples
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes (None if unavailable)."""
+    if HAS_PSUTIL:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        pass
+    if HAS_RESOURCE:  # high-water mark, not current (KB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    return None
+
+
+def _process_cpu() -> float:
+    """CPU seconds of this process and its finished children."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _mb(value: Optional[int]) -> Optional[float]:
+    return round(value / 1024 ** 2, 1) if value is not None else None
+
+
+class Span:
+    """One timed interval (a stage or a phase of it)."""
+
+    def __init__(self, name: str, rows: Optional[int] = None, origin: float = 0.0):
+        self.name = name
+        self.rows = rows
+        self.started_at = time.perf_counter() - origin
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.thread_cpu_s = 0.0
+        self.rss_start = current_rss()
+        self.peak_rss = self.rss_start
+        self._start = (time.perf_counter(), _process_cpu(), time.thread_time())
+
+    def observe(self, rss: Optional[int]):
+        if rss is not None and (self.peak_rss is None or rss > self.peak_rss):
+            self.peak_rss = rss
+
+    def close(self):
+        wall, cpu, thread_cpu = self._start
+        self.observe(current_rss())
+        self.wall_s = time.perf_counter() - wall
+        self.cpu_s = _process_cpu() - cpu
+        self.thread_cpu_s = time.thread_time() - thread_cpu
+
+    def as_dict(self) -> Dict[str, Any]:
+        stats = {
+            'wall_s': round(self.wall_s, 3),
+            'cpu_s': round(self.cpu_s, 3),
+            'thread_cpu_s': round(self.thread_cpu_s, 3),
+            'started_at_s': round(self.started_at, 3),
+            'rss_start_mb': _mb(self.rss_start),
+            'peak_rss_mb': _mb(self.peak_rss),
+        }
+        if self.rows is not None:
+            stats['rows'] = int(self.rows)
+            stats['rows_per_s'] = round(self.rows / max(self.wall_s, 1e-9), 1)
+        return stats
+
+
+# Stage open on each thread: [profiler, stage span, current phase span, finished phases]
+_local = threading.local()
+
+
+def phase(name: str, rows: Optional[int] = None):
+    """End the current phase of this thread's stage and start ``name``."""
+    state = getattr(_local, 'state', None)
+    if state is not None:
+        state[0]._start_phase(state, name, rows)
+
+
+def set_rows(rows: int):
+    """Set the row count of the current phase (when only known at its end)."""
+    state = getattr(_local, 'state', None)
+    if state is not None and state[2] is not None:
+        state[2].rows = rows
+
+
+class Profiler:
+    """Collects stage and phase statistics; optionally dumps a profile per stage."""
+
+    def __init__(self, dump_dir: Optional[str] = None, mode: Optional[str] = None,
+                 interval: float = SAMPLE_INTERVAL):
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode} (expected one of {PROFILE_MODES})")
+        self.dump_dir = dump_dir
+        self.mode = mode if dump_dir else None
+        self.serial = self.mode == 'cprofile'     # Stages must not overlap (see module docstring)
+        self.interval = interval
+        self.origin = time.perf_counter()
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self._open: Dict[int, list] = {}         # span id -> [span, thread id, stack counter]
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    # -- sampling ------------------------------------------------------
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            rss = current_rss()
+            frames = sys._current_frames() if self.mode == 'stacks' else {}
+            with self._lock:
+                for span, thread_id, stacks in self._open.values():
+                    span.observe(rss)
+                    if stacks is not None and thread_id in frames:
+                        stacks[_fold(frames[thread_id])] += 1
+
+    def _track(self, span: Span, stacks: Optional[Counter] = None):
+        with self._lock:
+            self._open[id(span)] = [span, threading.get_ident(), stacks]
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample, name='profiler', daemon=True)
+                self._sampler.start()
+
+    def _untrack(self, span: Span):
+        with self._lock:
+            self._open.pop(id(span), None)
+
+    # -- stages and phases ---------------------------------------------
+    def _start_phase(self, state: list, name: str, rows: Optional[int]):
+        self._end_phase(state)
+        span = Span(name, rows, self.origin)
+        self._track(span)
+        state[2] = span
+
+    def _end_phase(self, state: list):
+        span = state[2]
+        if span is not None:
+            span.close()
+            self._untrack(span)
+            state[3].append(span)
+            state[2] = None
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None):
+        """
+        Profile a stage run on the calling thread.
+
+        Yields:
+            The stage Span (``rows`` may be set on it before the stage ends)
+        """
+        span = Span(name, rows, self.origin)
+        stacks = Counter() if self.mode == 'stacks' else None
+        self._track(span, stacks)
+        state = [self, span, None, []]
+        previous, _local.state = getattr(_local, 'state', None), state
+
+        profile = None
+        if self.mode == 'cprofile' and previous is None:   # cProfile does not nest on a thread
+            if not _CPROFILE_LOCK.acquire(blocking=False):
+                self._untrack(span)
+                _local.state = previous
+                raise RuntimeError(f"Cannot profile stage '{name}' with cProfile while another stage "
+                                   "is profiled: run stages serially in cprofile mode")
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except BaseException:
+                _CPROFILE_LOCK.release()
+                self._untrack(span)
+                _local.state = previous
+                raise
+        try:
+            yield span
+        finally:
+            if profile is not None:
+                profile.disable()
+                _CPROFILE_LOCK.release()
+            self._end_phase(state)
+            span.close()
+            self._untrack(span)
+            _local.state = previous
+
+            stats = span.as_dict()
+            stats['phases'] = {p.name: p.as_dict() for p in state[3]}
+            if self.dump_dir and (profile is not None or stacks):
+                os.makedirs(self.dump_dir, exist_ok=True)
+                if profile is not None:
+                    stats['profile'] = os.path.join(self.dump_dir, f'{name}.prof')
+                    profile.dump_stats(stats['profile'])
+                else:
+                    stats['profile'] = os.path.join(self.dump_dir, f'{name}.folded')
+                    with open(stats['profile'], 'w') as f:
+                        f.writelines(f'{stack} {count}\n' for stack, count in stacks.most_common())
+            with self._lock:
+                self.stages[name] = stats
+
+    def close(self):
+        """Stop the sampling thread."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    def report(self) -> Dict[str, Any]:
+        """Statistics of every finished stage, in start order."""
+        return {
+            'mode': self.mode,
+            'psutil': HAS_PSUTIL,
+            'stages': dict(sorted(self.stages.items(), key=lambda item: item[1]['started_at_s'])),
+        }
+
+
+def _fold(frame) -> str:
+    """Collapsed stack of a frame, root first: ``func (file:line);...``."""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f'{code.co_name} ({code.co_filename}:{frame.f_lineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(parts))
+
+
+def compare(previous: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.25,
+            min_seconds: float = 1.0) -> List[str]:
+    """
+    Stages and phases whose wall time grew since a previous report.
+
+    A slowdown counts when it is above ``tolerance`` (relative) and
+    ``min_seconds`` (absolute), so short noisy phases are ignored. Runs
+    with different profile modes are not compared (profiling adds overhead).
+    """
+    if previous.get('mode') != current.get('mode'):
+        return []
+    regressions = []
+    for name, stage in current.get('stages', {}).items():
+        before = previous.get('stages', {}).get(name)
+        if not before:
+            continue
+        pairs = [(name, before, stage)]
+        pairs += [(f'{name}.{p}', before.get('phases', {}).get(p), stats)
+                  for p, stats in stage.get('phases', {}).items()]
+        for label, old, new in pairs:
+            if not old or ('rows' in new and old.get('rows') != new['rows']):
+                continue  # different input size: not comparable
+            grew = new['wall_s'] - old['wall_s']
+            if grew > min_seconds and grew > tolerance * old['wall_s']:
+                regressions.append(f"{label}: {old['wall_s']:.1f}s -> {new['wall_s']:.1f}s")
+    return regressions
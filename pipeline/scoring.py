@@ -0,0 +1,420 @@
+"""
+🎯 AADHAAR INTELLIGENCE SYSTEM - Vectorized Scoring
+====================================================
+Scores enrolment records with the trained models, many rows at a time.
+
+Every function takes a frame of records (``pincode`` plus the age counts of
+``pipeline.features``), builds one feature matrix and makes a single
+vectorized model call, returning one output row per input row:
+
+    - score_anomalies: Isolation Forest anomaly score of the record's pincode-day
+    - assign_clusters: K-Means segment and its volume tier
+    - forecast_demand: Random Forest next-period forecast with a per-tree interval
+    - fraud_rings: DBSCAN fraud ring of the record (-1 = noise)
+
+Run as a script it scores the full enrolment history from the columnar
+store, one pincode-day per output row (records clustered individually,
+as in training, then aggregated to their day), and writes the scores as Parquet
+partitioned like the store (``outputs/scores/month=YYYY-MM/``)::
+
+    python -m pipeline.scoring --workers 8 --memory-limit-mb 4096
+
+Month partitions are scored in parallel by a process pool (each worker
+loads the models once) within a memory budget, like ingestion.
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import os
+import glob
+import time
+import shutil
+import argparse
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import NearestNeighbors
+
+from .features import (
+    COUNT_COLUMNS, PROFILE_KEYS, pincode_profile, profile_features, cluster_features
+)
+from .artifacts import FlatForest, load_forest
+from .loader import map_shards
+from .timeseries import ForecastHistory, load_history
+from .store import BASE_DIR, STORE_DIR, DATE_FORMAT, build_store
+
+MODELS_DIR = os.path.join(BASE_DIR, 'models', 'trained')
+SCORES_DIR = os.path.join(BASE_DIR, 'outputs', 'scores')
+
+# Trained artifacts: name -> (model file, scaler file) in models/trained
+MODEL_FILES = {
+    'isolation_forest': ('isolation_forest_model.pkl', 'isolation_forest_scaler.pkl'),
+    'dbscan': ('dbscan_model.pkl', 'dbscan_scaler.pkl'),
+    'kmeans': ('kmeans_model.pkl', 'kmeans_scaler.pkl'),
+    'random_forest': ('random_forest_forecast.pkl', 'forecast_scaler.pkl'),
+}
+
+# Memory-mappable exports of the forests (see pipeline/artifacts.py), preferred when present
+FLAT_FILES = {
+    'isolation_forest': 'isolation_forest_flat.joblib',
+    'random_forest': 'random_forest_flat.joblib',
+}
+
+# Recent per-pincode series the forecast features are built from (see pipeline/timeseries.py)
+HISTORY_FILE = 'forecast_history.joblib'
+
+# Models applied by the bulk scorer
+BULK_MODELS = ['isolation_forest', 'dbscan', 'kmeans']
+
+# Scoring a month partition needs far more memory than its compressed size
+SCORE_OVERHEAD = 20
+
+# Tiers of K-Means segments, ranked by the enrolment volume of their centre
+TIER_HIGH, TIER_MEDIUM, TIER_LOW = 0, 1, 2
+
+# Rows per model call when scoring large frames (bounds the per-tree buffer)
+FORECAST_CHUNK_ROWS = 50000
+
+
+def _scale(scaler, X: np.ndarray) -> np.ndarray:
+    return scaler.transform(X) if scaler is not None else X
+
+
+def normalize_records(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Coerce uploaded records to the scoring schema.
+
+    Missing counts become 0 and a missing or non-numeric pincode becomes 0,
+    so every record can be scored. A ``date`` column (DD-MM-YYYY as in the
+    raw dumps, or ISO) is kept as datetime64 (NaT when unparseable).
+    """
+    out = pd.DataFrame(index=df.index)
+    pincode = df['pincode'] if 'pincode' in df.columns else pd.Series(0, index=df.index)
+    out['pincode'] = pd.to_numeric(pincode, errors='coerce').fillna(0).astype(np.int64)
+    for col in COUNT_COLUMNS:
+        values = df[col] if col in df.columns else pd.Series(0, index=df.index)
+        out[col] = pd.to_numeric(values, errors='coerce').fillna(0)
+    if 'date' in df.columns:
+        dates = pd.to_datetime(df['date'], format=DATE_FORMAT, errors='coerce')
+        retry = dates.isna() & df['date'].notna()
+        if retry.any():
+            dates[retry] = pd.to_datetime(df['date'][retry].astype(str), format='ISO8601', errors='coerce')
+        out['date'] = dates
+    return out.reset_index(drop=True)
+
+
+def _profile_groups(df: pd.DataFrame) -> np.ndarray:
+    """
+    Isolation Forest profile of every record (codes 0..n_profiles-1).
+
+    Records with a pincode and a date are profiled per pincode-day, like
+    the training data; any other record (no date column, no date or no
+    pincode) is a profile of its own, so unrelated records are never pooled.
+    """
+    groups = np.arange(len(df), dtype=np.int64)
+    if 'date' in df.columns:
+        known = (df['pincode'].to_numpy() > 0) & df['date'].notna().to_numpy()
+        if known.any():
+            days = pd.MultiIndex.from_arrays([df['pincode'].to_numpy()[known], df['date'].to_numpy()[known]])
+            groups[known] = len(df) + pd.factorize(days)[0]
+    return pd.factorize(groups)[0]
+
+
+def score_anomalies(model, scaler, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Isolation Forest scores.
+
+    The model was trained on pincode-day profiles: records that share a
+    pincode and a date are profiled together and get their day's score,
+    every other record is profiled on its own (see ``_profile_groups``).
+
+    Returns:
+        DataFrame with ``anomaly_score`` (0..1, higher = more isolated)
+        and ``is_anomaly``
+    """
+    groups = _profile_groups(df)
+    profile = pincode_profile(df[COUNT_COLUMNS].assign(profile=groups), keys=['profile'])
+    scores = -model.score_samples(_scale(scaler, profile_features(profile)))
+    row_scores = scores[groups]     # Profiles come back sorted by their code
+    return pd.DataFrame({
+        'anomaly_score': row_scores,
+        'is_anomaly': row_scores > -model.offset_,
+    })
+
+
+def cluster_tiers(model, scaler) -> np.ndarray:
+    """Volume tier (TIER_HIGH/MEDIUM/LOW) of every K-Means cluster."""
+    centers = model.cluster_centers_
+    if scaler is not None:
+        centers = scaler.inverse_transform(centers)
+    volume = centers.sum(axis=1)
+    rank = (volume[None, :] > volume[:, None]).sum(axis=1)
+    return np.where(rank == 0, TIER_HIGH, np.where(rank == len(centers) - 1, TIER_LOW, TIER_MEDIUM))
+
+
+def assign_clusters(model, scaler, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    K-Means segment of every record.
+
+    Returns:
+        DataFrame with ``cluster`` and its volume ``tier``
+    """
+    clusters = model.predict(_scale(scaler, cluster_features(df)))
+    return pd.DataFrame({
+        'cluster': clusters.astype(np.int32),
+        'tier': cluster_tiers(model, scaler)[clusters],
+    })
+
+
+def forecast_demand(model, scaler, df: pd.DataFrame, history: ForecastHistory) -> pd.DataFrame:
+    """
+    Random Forest forecast of total enrolments of every record's pincode.
+
+    Each record is the newest observation of its pincode (total of its age
+    counts), appended to the pincode's stored history; the forecast is for
+    the following period (see ``ForecastHistory.features``). Pincodes
+    without history start from zeros.
+
+    The interval is the 10th-90th percentile of the individual trees. Trees
+    are evaluated through the low-level ``tree_`` API, which skips the
+    per-call validation of ``estimator.predict`` (or from the flat arrays
+    of a FlatForest).
+
+    Returns:
+        DataFrame with ``predicted_value``, ``lower_bound`` and ``upper_bound``
+    """
+    parts = []
+    for start in range(0, len(df), FORECAST_CHUNK_ROWS):
+        chunk = df.iloc[start:start + FORECAST_CHUNK_ROWS]
+        latest = chunk[COUNT_COLUMNS].to_numpy(dtype=np.float64).sum(axis=1)
+        X = _scale(scaler, history.features(chunk[history.level].to_numpy(), latest))
+        if isinstance(model, FlatForest):
+            per_tree = model.tree_predictions(X)
+        else:
+            X32 = np.ascontiguousarray(X, dtype=np.float32)
+            per_tree = np.stack([tree.tree_.predict(X32)[:, 0] for tree in model.estimators_], axis=1)
+        lower, upper = np.percentile(per_tree, [10, 90], axis=1)
+        parts.append(pd.DataFrame({
+            'predicted_value': per_tree.mean(axis=1),
+            'lower_bound': lower,
+            'upper_bound': upper,
+        }))
+    if not parts:
+        return pd.DataFrame(columns=['predicted_value', 'lower_bound', 'upper_bound'])
+    return pd.concat(parts, ignore_index=True)
+
+
+def fraud_rings(model, scaler, df: pd.DataFrame, index: Optional[NearestNeighbors] = None) -> np.ndarray:
+    """
+    DBSCAN fraud ring of every record.
+
+    DBSCAN cannot predict, so a record joins the ring of its nearest core
+    sample if that sample is within ``eps``, and is noise (-1) otherwise.
+
+    Args:
+        index: Nearest-neighbour index over ``model.components_``
+            (built on the fly if not given)
+    """
+    X = _scale(scaler, cluster_features(df))
+    if len(model.core_sample_indices_) == 0:
+        return np.full(len(X), -1, dtype=np.int32)
+    if index is None:
+        index = NearestNeighbors(n_neighbors=1).fit(model.components_)
+    distance, nearest = index.kneighbors(X)
+    core_labels = model.labels_[model.core_sample_indices_]
+    return np.where(distance[:, 0] <= model.eps, core_labels[nearest[:, 0]], -1).astype(np.int32)
+
+
+def load_model(name: str, models_dir: Optional[str] = None, flat: bool = True) -> Optional[tuple]:
+    """
+    Load a (model, scaler) pair from MODEL_FILES, or None if not trained.
+
+    Forests with a flat export (FLAT_FILES) are memory-mapped as a
+    FlatForest unless ``flat`` is False.
+    """
+    models_dir = models_dir or MODELS_DIR
+    model_file, scaler_file = MODEL_FILES[name]
+    model_path = os.path.join(models_dir, model_file)
+    if not os.path.exists(model_path):
+        return None
+    scaler_path = os.path.join(models_dir, scaler_file)
+    scaler = joblib.load(scaler_path) if os.path.exists(scaler_path) else None
+    flat_path = os.path.join(models_dir, FLAT_FILES[name]) if name in FLAT_FILES else None
+    if flat and flat_path and os.path.exists(flat_path):
+        return load_forest(flat_path), scaler
+    return joblib.load(model_path), scaler
+
+
+def load_forecast_history(models_dir: Optional[str] = None) -> Optional[ForecastHistory]:
+    """Series history saved with the Random Forest, or None if not trained."""
+    return load_history(os.path.join(models_dir or MODELS_DIR, HISTORY_FILE))
+
+
+# Models loaded by a scoring worker process, keyed by models folder
+_worker_models: Dict[str, Dict[str, Any]] = {}
+
+
+def _bulk_models(models_dir: str) -> Dict[str, Any]:
+    if models_dir not in _worker_models:
+        models = {}
+        for name in BULK_MODELS:
+            loaded = load_model(name, models_dir)
+            if loaded is None:
+                continue
+            model, scaler = loaded
+            if hasattr(model, 'n_jobs'):
+                model.n_jobs = 1  # parallelism comes from the process pool
+            models[name] = loaded
+        if 'dbscan' in models and len(models['dbscan'][0].core_sample_indices_):
+            models['dbscan_index'] = NearestNeighbors(n_neighbors=1).fit(models['dbscan'][0].components_)
+        _worker_models[models_dir] = models
+    return _worker_models[models_dir]
+
+
+def _group_mode(groups: np.ndarray, labels: np.ndarray, n_groups: int, noise: Optional[int] = None) -> np.ndarray:
+    """
+    Most frequent label of every group (ties: the smaller label).
+
+    Labels equal to ``noise`` only win in groups that have no other label.
+    """
+    low = int(labels.min(initial=0))
+    width = int(labels.max(initial=0)) - low + 1
+    counts = np.bincount(groups * width + (labels - low), minlength=n_groups * width).reshape(n_groups, width)
+    if noise is not None and low <= noise < low + width:
+        has_other = counts.sum(axis=1) > counts[:, noise - low]
+        counts[has_other, noise - low] = 0
+    return (counts.argmax(axis=1) + low).astype(np.int32)
+
+
+def score_pincode_days(df: pd.DataFrame, models: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Score enrolment records, one output row per pincode-day.
+
+    Each model sees the input it was trained on: the Isolation Forest the
+    pincode-day profile, K-Means and DBSCAN the individual records (whose
+    labels are then aggregated to the day: its most frequent cluster, and
+    its most frequent fraud ring if any record is in one).
+
+    Returns:
+        DataFrame with ``pincode``, ``date``, ``anomaly_score``,
+        ``is_anomaly``, ``cluster`` and ``fraud_ring`` (columns of models
+        that have not been trained are left out)
+    """
+    profile = pincode_profile(df, keys=PROFILE_KEYS)
+    # Pincode-day of every record, in the (sorted) order of the profile rows
+    groups = df.groupby(PROFILE_KEYS, observed=True, dropna=False, sort=True).ngroup().to_numpy()
+    out = profile[PROFILE_KEYS].copy()
+    out['pincode'] = out['pincode'].astype(np.int32)
+
+    if 'isolation_forest' in models:
+        model, scaler = models['isolation_forest']
+        scores = -model.score_samples(_scale(scaler, profile_features(profile)))
+        out['anomaly_score'] = scores.astype(np.float32)
+        out['is_anomaly'] = scores > -model.offset_
+    if 'kmeans' in models:
+        model, scaler = models['kmeans']
+        clusters = model.predict(_scale(scaler, cluster_features(df))).astype(np.int64)
+        out['cluster'] = _group_mode(groups, clusters, len(out))
+    if 'dbscan' in models:
+        model, scaler = models['dbscan']
+        rings = fraud_rings(model, scaler, df, models.get('dbscan_index')).astype(np.int64)
+        out['fraud_ring'] = _group_mode(groups, rings, len(out), noise=-1)
+    return out
+
+
+def score_month(month_dir: str, models_dir: str, output_dir: str) -> int:
+    """
+    Score one month partition of the store and write its scores (worker function).
+
+    A pincode-day can have records in several shard slices, so the whole
+    month is scored together and written to
+    ``<output_dir>/month=YYYY-MM/scores.parquet``.
+
+    Returns:
+        Number of pincode-days written
+    """
+    df = pd.read_parquet(month_dir, columns=PROFILE_KEYS + COUNT_COLUMNS)
+    scores = score_pincode_days(df, _bulk_models(models_dir))
+    out_dir = os.path.join(output_dir, os.path.basename(month_dir))
+    os.makedirs(out_dir, exist_ok=True)
+    scores.to_parquet(os.path.join(out_dir, 'scores.parquet'), index=False)
+    return len(scores)
+
+
+def score_history(store_dir: Optional[str] = None, models_dir: Optional[str] = None,
+                  output_dir: Optional[str] = None, months: Optional[List[str]] = None,
+                  workers: Optional[int] = None, memory_limit_mb: Optional[float] = None) -> int:
+    """
+    Score the full enrolment history in the store.
+
+    Scores are written to a staging folder that replaces ``output_dir``
+    once every month is done, so readers never see a half-written run.
+
+    Args:
+        months: Only score these ``YYYY-MM`` partitions (default: all)
+
+    Returns:
+        Number of pincode-days scored
+    """
+    store_dir = store_dir or STORE_DIR
+    models_dir = models_dir or MODELS_DIR
+    output_dir = output_dir or SCORES_DIR
+
+    missing = [name for name in BULK_MODELS if not os.path.exists(os.path.join(models_dir, MODEL_FILES[name][0]))]
+    if len(missing) == len(BULK_MODELS):
+        raise FileNotFoundError(f"No trained models in {models_dir} - run models/train_models.py first")
+    if missing:
+        print(f"⚠️ Not trained, skipped: {', '.join(missing)}")
+
+    month_dirs = sorted(glob.glob(os.path.join(store_dir, 'enrolment', 'month=*')))
+    if months:
+        month_dirs = [d for d in month_dirs if os.path.basename(d)[len('month='):] in months]
+
+    staging_dir = output_dir + '.tmp'
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+
+    total = 0
+    for _, rows in map_shards(score_month, month_dirs, workers, memory_limit_mb,
+                              args=(models_dir, staging_dir), overhead=SCORE_OVERHEAD):
+        total += rows
+
+    if months and os.path.isdir(output_dir):
+        # Partial run: only replace the rescored month partitions
+        for month_dir in glob.glob(os.path.join(staging_dir, 'month=*')):
+            target = os.path.join(output_dir, os.path.basename(month_dir))
+            shutil.rmtree(target, ignore_errors=True)
+            os.replace(month_dir, target)
+        shutil.rmtree(staging_dir)
+    else:
+        shutil.rmtree(output_dir, ignore_errors=True)
+        os.replace(staging_dir, output_dir)
+    return total
+
+
+def main():
+    """Command-line entry point for nightly bulk scoring."""
+    parser = argparse.ArgumentParser(description="Score every pincode-day of the enrolment history")
+    parser.add_argument('--month', action='append', dest='months', help="Only score this YYYY-MM partition")
+    parser.add_argument('--workers', type=int, help="Scoring processes (default: one per core)")
+    parser.add_argument('--memory-limit-mb', type=float, help="Memory ceiling for partitions being scored")
+    parser.add_argument('--output-dir', help=f"Output folder (default: {SCORES_DIR})")
+    parser.add_argument('--skip-ingest', action='store_true', help="Do not ingest new CSV shards first")
+    args = parser.parse_args()
+
+    if not args.skip_ingest:
+        build_store(['enrolment'], workers=args.workers, memory_limit_mb=args.memory_limit_mb)
+
+    start = time.time()
+    rows = score_history(output_dir=args.output_dir, months=args.months,
+                         workers=args.workers, memory_limit_mb=args.memory_limit_mb)
+    elapsed = time.time() - start
+    print(f"✅ Scored {rows:,} pincode-days in {elapsed:.1f}s "
+          f"({rows / max(elapsed, 1e-9):,.0f}/s) -> {args.output_dir or SCORES_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+📍 AADHAAR INTELLIGENCE SYSTEM - Spatial Index
+==============================================
+In-memory index of pincode coordinates for map queries.
+
+    - within: pincodes within R km of a point (great-circle distance)
+    - nearest: k nearest pincodes to a point
+    - bbox: pincodes inside a map viewport (south/west/north/east)
+
+Radius and nearest-neighbour queries use a scikit-learn BallTree with the
+haversine metric on (lat, lon) in radians. Viewport queries binary-search
+the rows sorted by latitude and filter the longitude of that band, which
+avoids walking the tree for rectangular windows. The index is built once
+per data load; every query is O(log n + matches).
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+class PincodeIndex:
+    """Spatial index over the rows of a frame with ``latitude`` / ``longitude``."""
+
+    def __init__(self, frame: pd.DataFrame, leaf_size: int = 40):
+        coords = frame[['latitude', 'longitude']].apply(pd.to_numeric, errors='coerce')
+        valid = (coords['latitude'].between(-90, 90) & coords['longitude'].between(-180, 180)).to_numpy()
+        self.frame = frame.loc[valid].reset_index(drop=True)
+        self.lat = coords.loc[valid, 'latitude'].to_numpy(dtype=np.float64)
+        self.lon = coords.loc[valid, 'longitude'].to_numpy(dtype=np.float64)
+        self.tree = BallTree(np.radians(np.column_stack([self.lat, self.lon])),
+                             leaf_size=leaf_size, metric='haversine') if len(self.lat) else None
+
+        # Latitude-sorted order for viewport queries
+        self.lat_order = np.argsort(self.lat, kind='stable')
+        self.lat_sorted = self.lat[self.lat_order]
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def _point(self, lat: float, lon: float) -> np.ndarray:
+        return np.radians([[lat, lon]])
+
+    def within(self, lat: float, lon: float, radius_km: float,
+               limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rows within ``radius_km`` of a point, nearest first.
+
+        Returns:
+            (row positions, distances in km), at most ``limit`` of each
+        """
+        if self.tree is None:
+            return np.array([], dtype=np.int64), np.array([])
+        idx, dist = self.tree.query_radius(self._point(lat, lon), r=radius_km / EARTH_RADIUS_KM,
+                                           return_distance=True, sort_results=True)
+        idx, dist = idx[0], dist[0] * EARTH_RADIUS_KM
+        if limit is not None:
+            idx, dist = idx[:limit], dist[:limit]
+        return idx, dist
+
+    def nearest(self, lat: float, lon: float, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The ``k`` rows nearest to a point.
+
+        Returns:
+            (row positions, distances in km), nearest first
+        """
+        k = min(k, len(self))
+        if k == 0:
+            return np.array([], dtype=np.int64), np.array([])
+        dist, idx = self.tree.query(self._point(lat, lon), k=k)
+        return idx[0], dist[0] * EARTH_RADIUS_KM
+
+    def bbox(self, south: float, west: float, north: float, east: float,
+             limit: Optional[int] = None) -> np.ndarray:
+        """
+        Rows inside a viewport, in latitude order.
+
+        ``west > east`` is a viewport across the antimeridian.
+        """
+        start = np.searchsorted(self.lat_sorted, south, side='left')
+        stop = np.searchsorted(self.lat_sorted, north, side='right')
+        band = self.lat_order[start:stop]
+        lon = self.lon[band]
+        inside = (lon >= west) & (lon <= east) if west <= east else (lon >= west) | (lon <= east)
+        rows = band[inside]
+        return rows[:limit] if limit is not None else rows
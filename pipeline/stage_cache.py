@@ -0,0 +1,150 @@
+"""
+🗃️ AADHAAR INTELLIGENCE SYSTEM - Training Stage Cache
+======================================================
+Content-addressed cache for the outputs of training stages.
+
+A stage (e.g. "fit the Isolation Forest") is keyed by a hash of everything
+that determines its result: the content hashes of the input shards, the
+hyperparameters and the source code of the stage. Its artifacts (pickled
+model and scaler, prediction CSVs) and its metrics are stored under that key::
+
+    models/trained/cache/<stage>/<key>/
+        meta.json                  # metrics + artifact names
+        isolation_forest_model.pkl
+        ...
+
+On a rerun with the same key the artifacts are linked back into place and
+the stage is skipped. Only the newest ``keep`` entries of a stage are kept.
+
+Cached files are hard links shared with the restored artifacts, so a stage
+that reruns must ``release`` its artifact paths before writing them again
+(overwriting in place would rewrite the cached copy too).
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import inspect
+from typing import Any, Dict, List, Optional
+
+META_NAME = 'meta.json'
+
+
+def stage_key(*parts: Any) -> str:
+    """
+    Hash of a stage's inputs.
+
+    Parts may be JSON-serializable values or functions/modules (hashed by
+    their source code, so editing a trainer invalidates its entries).
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if inspect.isfunction(part) or inspect.ismodule(part):
+            part = inspect.getsource(part)
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _entry_dir(cache_dir: str, stage: str, key: str) -> str:
+    return os.path.join(cache_dir, stage, key)
+
+
+def _place(src: str, dst: str):
+    """Put a cached file at ``dst``, hard-linking when possible."""
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return  # already in place (rename() between links of one file is a no-op)
+    tmp = dst + '.tmp'
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+def has(cache_dir: str, stage: str, key: str) -> bool:
+    """True if a complete entry exists for ``key``."""
+    entry = _entry_dir(cache_dir, stage, key)
+    meta_path = os.path.join(entry, META_NAME)
+    if not os.path.exists(meta_path):
+        return False
+    with open(meta_path, 'r') as f:
+        meta = json.load(f)
+    return all(os.path.exists(os.path.join(entry, name)) for name in meta['artifacts'])
+
+
+def restore(cache_dir: str, stage: str, key: str,
+            artifacts: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """
+    Restore a cached stage.
+
+    Args:
+        artifacts: Artifact name -> path it must be restored to
+
+    Returns:
+        The cached metrics, or None on a miss (or an incomplete entry)
+    """
+    if not has(cache_dir, stage, key):
+        return None
+    entry = _entry_dir(cache_dir, stage, key)
+    meta_path = os.path.join(entry, META_NAME)
+    with open(meta_path, 'r') as f:
+        meta = json.load(f)
+
+    for name in meta['artifacts']:
+        if name in artifacts:
+            _place(os.path.join(entry, name), artifacts[name])
+    os.utime(meta_path)  # mark as recently used
+    return meta['metrics']
+
+
+def release(artifacts: Dict[str, str]):
+    """Unlink artifact paths so a rerun writes new files instead of cached ones."""
+    for path in artifacts.values():
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def store(cache_dir: str, stage: str, key: str, artifacts: Dict[str, str],
+          metrics: Dict[str, Any], keep: int = 3):
+    """
+    Save a stage's artifacts and metrics under ``key``.
+
+    Args:
+        artifacts: Artifact name -> path of the file the stage produced
+            (missing files are skipped)
+        keep: Entries of this stage to keep, most recently used first
+    """
+    entry = _entry_dir(cache_dir, stage, key)
+    staging = entry + '.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    saved: List[str] = []
+    for name, path in artifacts.items():
+        if os.path.exists(path):
+            _place(path, os.path.join(staging, name))
+            saved.append(name)
+    with open(os.path.join(staging, META_NAME), 'w') as f:
+        json.dump({'stage': stage, 'key': key, 'artifacts': saved, 'metrics': metrics}, f, indent=2)
+
+    shutil.rmtree(entry, ignore_errors=True)
+    os.replace(staging, entry)
+    prune(cache_dir, stage, keep)
+
+
+def prune(cache_dir: str, stage: str, keep: int):
+    """Drop all but the ``keep`` most recently used entries of a stage."""
+    stage_dir = os.path.join(cache_dir, stage)
+    entries = [os.path.join(stage_dir, name) for name in os.listdir(stage_dir)
+               if os.path.exists(os.path.join(stage_dir, name, META_NAME))]
+    entries.sort(key=lambda path: os.path.getmtime(os.path.join(path, META_NAME)), reverse=True)
+    for path in entries[keep:]:
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,420 @@
+"""
+📦 AADHAAR INTELLIGENCE SYSTEM - Columnar Ingestion Store
+==========================================================
+Converts the raw UIDAI CSV shards into a typed, partitioned Parquet store.
+
+The raw dumps live under ``data/{enrolment,demographic,biometric}/`` as
+``api_data_aadhar_<dataset>_<start>_<end>.csv`` shards. Parsing them with
+``pd.read_csv`` on every run costs minutes of CPU, so each shard is converted
+once into Parquet, partitioned by dataset and month::
+
+    data/store/<dataset>/month=YYYY-MM/part-<shard>-<key hash>.parquet
+
+The key hash (of the shard's path relative to the dataset folder, its
+manifest key) keeps same-named shards of different subfolders apart.
+Stores written with an older part naming (``_layout`` marker of the
+dataset folder) are rebuilt once.
+
+Column types in the store:
+    - date:            datetime64 (parsed from DD-MM-YYYY)
+    - state, district: categorical (dictionary encoded)
+    - pincode:         int32
+    - count columns:   int32
+
+Only new or changed shards are converted on each run; see pipeline/manifest.py.
+
+Usage:
+    python -m pipeline.store            # ingest new/changed shards
+    python -m pipeline.store --rebuild  # rebuild everything from the CSVs
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import os
+import glob
+import hashlib
+import shutil
+import argparse
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from .manifest import ShardDelta, compute_delta, load_manifest, save_manifest, shard_key
+from .loader import load_shards, map_shards
+from .normalize import normalize_frame
+
+# PyArrow powers the Parquet store (optional - falls back to CSV parsing)
+try:
+    import pyarrow.dataset as pds
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# ============================================
+# CONFIGURATION
+# ============================================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+STORE_DIR = os.path.join(DATA_DIR, 'store')
+
+DATASETS = ['enrolment', 'demographic', 'biometric']
+KEY_COLUMNS = ['date', 'state', 'district', 'pincode']
+CATEGORY_COLUMNS = ['state', 'district']
+DATE_FORMAT = '%d-%m-%Y'
+UNKNOWN_MONTH = 'unknown'
+
+# Bump when the part naming changes (older stores are rebuilt from the CSVs).
+# The marker starts with '_' so Parquet dataset discovery skips it.
+STORE_LAYOUT = 2
+LAYOUT_NAME = '_layout'
+
+
+def list_shards(dataset: str, data_dir: Optional[str] = None) -> List[str]:
+    """Return the sorted list of raw CSV shards for a dataset."""
+    pattern = os.path.join(data_dir or DATA_DIR, dataset, '**', '*.csv')
+    return sorted(glob.glob(pattern, recursive=True))
+
+
+def read_shard(path: str) -> pd.DataFrame:
+    """
+    Parse one raw CSV shard into the typed store schema.
+
+    Count columns are coerced to int32 (missing values become 0), the
+    pincode to int32, state/district to categoricals and the date string
+    to datetime64. Column names are kept exactly as in the raw dump.
+    """
+    df = pd.read_csv(path, dtype={col: 'category' for col in CATEGORY_COLUMNS})
+
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'], format=DATE_FORMAT, errors='coerce')
+    if 'pincode' in df.columns:
+        df['pincode'] = pd.to_numeric(df['pincode'], errors='coerce').fillna(0).astype('int32')
+
+    count_cols = [col for col in df.columns if col not in KEY_COLUMNS]
+    for col in count_cols:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype('int32')
+
+    return df
+
+
+def _month_keys(df: pd.DataFrame) -> pd.Series:
+    """Partition key (YYYY-MM) for every row of a typed shard."""
+    if 'date' not in df.columns:
+        return pd.Series(UNKNOWN_MONTH, index=df.index)
+    return df['date'].dt.strftime('%Y-%m').fillna(UNKNOWN_MONTH)
+
+
+def _shard_part_name(key: str) -> str:
+    """File name of a shard's slice inside every month partition (``key``: manifest key)."""
+    stem = os.path.splitext(os.path.basename(key))[0]
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+    return f"part-{stem}-{digest}.parquet"
+
+
+def _layout_path(dataset_dir: str) -> str:
+    return os.path.join(dataset_dir, LAYOUT_NAME)
+
+
+def _has_current_layout(dataset_dir: str) -> bool:
+    try:
+        with open(_layout_path(dataset_dir), 'r') as f:
+            return int(f.read().strip()) == STORE_LAYOUT
+    except (OSError, ValueError):
+        return False
+
+
+def write_shard(df: pd.DataFrame, key: str, dataset: str,
+                store_dir: Optional[str] = None) -> int:
+    """
+    Write a typed shard into its month partitions.
+
+    Args:
+        key: Manifest key of the shard (path relative to the dataset folder)
+
+    Returns:
+        Number of partition files written
+    """
+    dataset_dir = os.path.join(store_dir or STORE_DIR, dataset)
+    part_name = _shard_part_name(key)
+    written = 0
+
+    for month, part in df.groupby(_month_keys(df), sort=False):
+        month_dir = os.path.join(dataset_dir, f'month={month}')
+        os.makedirs(month_dir, exist_ok=True)
+        part.to_parquet(os.path.join(month_dir, part_name), index=False)
+        written += 1
+
+    return written
+
+
+def convert_shard(path: str, dataset: str, store_dir: str, raw_dir: str) -> int:
+    """Parse one shard and write it into the store (runs in a worker process)."""
+    df = read_shard(path)
+    write_shard(df, shard_key(path, raw_dir), dataset, store_dir)
+    return int(len(df))
+
+
+def read_shard_slices(key: str, dataset: str,
+                      store_dir: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """Read back everything one shard (by manifest key) contributed to the store."""
+    part_name = _shard_part_name(key)
+    parts = sorted(glob.glob(os.path.join(store_dir or STORE_DIR, dataset, 'month=*', part_name)))
+    if not parts:
+        return None
+    return pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+
+
+def remove_shard(key: str, dataset: str, store_dir: Optional[str] = None) -> int:
+    """
+    Delete a shard's (by manifest key) slices from every month partition.
+
+    Returns:
+        Number of partition files removed
+    """
+    dataset_dir = os.path.join(store_dir or STORE_DIR, dataset)
+    part_name = _shard_part_name(key)
+    removed = 0
+
+    for part_path in glob.glob(os.path.join(dataset_dir, 'month=*', part_name)):
+        os.remove(part_path)
+        removed += 1
+        month_dir = os.path.dirname(part_path)
+        if not os.listdir(month_dir):
+            os.rmdir(month_dir)
+
+    return removed
+
+
+def build_store(datasets: Optional[List[str]] = None, rebuild: bool = False,
+                data_dir: Optional[str] = None, store_dir: Optional[str] = None,
+                workers: Optional[int] = None,
+                memory_limit_mb: Optional[float] = None) -> Dict[str, ShardDelta]:
+    """
+    Ingest new or changed CSV shards into the Parquet store.
+
+    The shard manifest decides what to do: new and changed shards are
+    (re)converted, slices of changed or deleted shards are removed, and
+    unchanged shards are left alone. ``rebuild`` drops the dataset and
+    converts every shard again. Shards are converted in parallel, see
+    pipeline/loader.py for ``workers`` and ``memory_limit_mb``.
+
+    Returns:
+        Dict mapping dataset name to the ShardDelta that was applied
+    """
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow is required to build the Parquet store")
+
+    data_dir = data_dir or DATA_DIR
+    store_dir = store_dir or STORE_DIR
+    manifest = load_manifest(store_dir)
+    deltas = {}
+
+    for dataset in datasets or DATASETS:
+        raw_dir = os.path.join(data_dir, dataset)
+        dataset_dir = os.path.join(store_dir, dataset)
+
+        outdated = os.path.isdir(dataset_dir) and not _has_current_layout(dataset_dir)
+        if outdated and not rebuild:
+            print(f"🔄 {dataset}: store uses an older part naming, rebuilding it from the CSVs")
+        if rebuild or outdated:
+            if os.path.isdir(dataset_dir):
+                shutil.rmtree(dataset_dir)
+            manifest.pop(dataset, None)
+
+        delta = compute_delta(list_shards(dataset, data_dir), raw_dir, manifest.get(dataset))
+        deltas[dataset] = delta
+        if delta.is_empty and dataset in manifest:
+            continue
+
+        for key in delta.changed + delta.removed:
+            remove_shard(key, dataset, store_dir)
+
+        keys = delta.added + delta.changed
+        paths = [os.path.join(raw_dir, key) for key in keys]
+        for index, n_rows in map_shards(convert_shard, paths, workers, memory_limit_mb,
+                                        args=(dataset, store_dir, raw_dir)):
+            delta.entries[keys[index]]['rows'] = n_rows
+
+        os.makedirs(dataset_dir, exist_ok=True)
+        with open(_layout_path(dataset_dir), 'w') as f:
+            f.write(str(STORE_LAYOUT))
+        manifest[dataset] = delta.entries
+        save_manifest(manifest, store_dir)
+
+        if not delta.is_empty:
+            print(f"📦 {dataset}: {len(delta.added)} new, {len(delta.changed)} changed, "
+                  f"{len(delta.removed)} removed shards -> {dataset_dir}")
+
+    return deltas
+
+
+def _read_store(dataset: str, columns: Optional[List[str]], months: Optional[List[str]],
+                store_dir: str) -> Optional[pd.DataFrame]:
+    """Read a dataset from its Parquet partitions."""
+    dataset_dir = os.path.join(store_dir, dataset)
+    if not os.path.isdir(dataset_dir):
+        return None
+
+    ds = pds.dataset(dataset_dir, format='parquet', partitioning='hive')
+    if ds.count_rows() == 0:
+        return None
+
+    data_columns = [name for name in ds.schema.names if name != 'month']
+    if columns is not None:
+        data_columns = [col for col in data_columns if col in columns]
+    row_filter = pds.field('month').isin(months) if months else None
+
+    return ds.to_table(columns=data_columns, filter=row_filter).to_pandas()
+
+
+def iter_month_batches(dataset: str, columns: Optional[List[str]] = None,
+                       batch_rows: int = 100000,
+                       store_dir: Optional[str] = None,
+                       normalize: bool = True) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Stream a dataset from the store in record batches, month by month.
+
+    Only one batch is in memory at a time, whatever the size of the store.
+    Batches of a month are yielded consecutively, so callers can finalize
+    per-month state when the month changes. Requires pyarrow; shards are
+    not ingested here (call ``build_store`` first).
+
+    Args:
+        normalize: Canonical state/district names, dropping rows with an
+            invalid state, exactly as ``load_dataset`` does
+
+    Yields:
+        (month, DataFrame of at most ``batch_rows`` records)
+    """
+    dataset_dir = os.path.join(store_dir or STORE_DIR, dataset)
+    # The state column is read to drop invalid rows even when not requested
+    read_columns = columns + ['state'] if normalize and columns is not None and 'state' not in columns else columns
+    for month_dir in sorted(glob.glob(os.path.join(dataset_dir, 'month=*'))):
+        month = os.path.basename(month_dir).split('=', 1)[1]
+        ds = pds.dataset(month_dir, format='parquet')
+        for batch in ds.to_batches(columns=read_columns, batch_size=batch_rows):
+            if not batch.num_rows:
+                continue
+            df = batch.to_pandas()
+            if normalize:
+                df = normalize_frame(df, [col for col in CATEGORY_COLUMNS if col in df.columns], categorical=True)
+                if read_columns is not columns:
+                    df = df[columns]
+            if len(df):
+                yield month, df
+
+
+def _recorded_rows(path: str, entry: Optional[Dict]) -> Optional[int]:
+    """Row count of a manifest entry, if the shard's size and mtime still match it."""
+    if not entry or entry.get('rows') is None:
+        return None
+    stat = os.stat(path)
+    if entry.get('size') != stat.st_size or entry.get('mtime') != stat.st_mtime:
+        return None
+    return entry['rows']
+
+
+def _read_csvs(dataset: str, columns: Optional[List[str]], months: Optional[List[str]],
+               data_dir: Optional[str], store_dir: str, workers: Optional[int],
+               memory_limit_mb: Optional[float]) -> Optional[pd.DataFrame]:
+    """Fallback reader that parses the raw shards directly, in parallel."""
+    shards = list_shards(dataset, data_dir)
+
+    # Preallocate the output when the manifest knows the rows of every (unchanged) shard
+    recorded = load_manifest(store_dir).get(dataset, {})
+    raw_dir = os.path.join(data_dir or DATA_DIR, dataset)
+    row_counts = [_recorded_rows(path, recorded.get(shard_key(path, raw_dir))) for path in shards]
+    if None in row_counts:
+        row_counts = None
+
+    df = load_shards(shards, read_shard, workers, memory_limit_mb, row_counts)
+    if df is None:
+        return None
+
+    if months:
+        df = df[_month_keys(df).isin(months)].reset_index(drop=True)
+    if columns is not None:
+        df = df[[col for col in df.columns if col in columns]]
+    return df
+
+
+def load_dataset(dataset: str, columns: Optional[List[str]] = None,
+                 months: Optional[List[str]] = None, categorical: bool = True,
+                 data_dir: Optional[str] = None, store_dir: Optional[str] = None,
+                 workers: Optional[int] = None,
+                 memory_limit_mb: Optional[float] = None,
+                 normalize: bool = True) -> Optional[pd.DataFrame]:
+    """
+    Load one UIDAI dataset from the columnar store.
+
+    New or changed shards are ingested before reading. Without pyarrow the
+    raw CSV shards are parsed directly into the same schema.
+
+    Args:
+        dataset: 'enrolment', 'demographic' or 'biometric'
+        columns: Optional column projection
+        months: Optional list of 'YYYY-MM' partitions to read
+        categorical: Keep state/district as categoricals. Pass False to
+            get plain strings (e.g. for code that groups without observed=True)
+        workers: Parser processes for CSV shards (default: one per core)
+        memory_limit_mb: Ceiling for the memory of shards being parsed
+        normalize: Canonical state/district names, dropping rows with an
+            invalid state (see pipeline/normalize.py). The store keeps the
+            names as dumped.
+
+    Returns:
+        DataFrame, or None if the dataset has no shards
+    """
+    store_dir = store_dir or STORE_DIR
+
+    if HAS_PYARROW:
+        build_store([dataset], data_dir=data_dir, store_dir=store_dir,
+                    workers=workers, memory_limit_mb=memory_limit_mb)
+        df = _read_store(dataset, columns, months, store_dir)
+    else:
+        df = _read_csvs(dataset, columns, months, data_dir, store_dir, workers, memory_limit_mb)
+
+    if df is None:
+        return None
+
+    if normalize:
+        df = normalize_frame(df, [col for col in CATEGORY_COLUMNS if col in df.columns], categorical=True)
+    if not categorical:
+        for col in CATEGORY_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype(object)
+    return df
+
+
+def load_all_datasets(categorical: bool = True, workers: Optional[int] = None,
+                      memory_limit_mb: Optional[float] = None,
+                      normalize: bool = True) -> Dict[str, pd.DataFrame]:
+    """Load every dataset that has shards, keyed by dataset name."""
+    datasets = {}
+    for dataset in DATASETS:
+        df = load_dataset(dataset, categorical=categorical, workers=workers,
+                          memory_limit_mb=memory_limit_mb, normalize=normalize)
+        if df is not None:
+            datasets[dataset] = df
+    return datasets
+
+
+def main():
+    """Command-line entry point for (re)building the store."""
+    parser = argparse.ArgumentParser(description="Build the columnar UIDAI ingestion store")
+    parser.add_argument('--rebuild', action='store_true', help="Rebuild every dataset from the raw CSVs")
+    parser.add_argument('--dataset', action='append', choices=DATASETS, help="Restrict to one dataset")
+    parser.add_argument('--workers', type=int, help="Parser processes (default: one per core)")
+    parser.add_argument('--memory-limit-mb', type=float, help="Memory ceiling for shards being parsed")
+    args = parser.parse_args()
+
+    deltas = build_store(args.dataset, rebuild=args.rebuild, workers=args.workers,
+                         memory_limit_mb=args.memory_limit_mb)
+    for dataset, delta in deltas.items():
+        print(f"✅ {dataset}: {len(delta.entries)} shards in store "
+              f"({len(delta.added) + len(delta.changed)} ingested this run)")
+
+
+if __name__ == "__main__":
+    main()
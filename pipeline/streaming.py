@@ -0,0 +1,133 @@
+"""
+🌊 AADHAAR INTELLIGENCE SYSTEM - Out-of-Core Training Helpers
+==============================================================
+Building blocks for training on record batches streamed from the store
+(see ``store.iter_month_batches``) instead of one in-memory frame.
+
+    - ProfileAccumulator: pincode-day profiles (sum/mean/std of each age
+      count, as ``features.pincode_profile``) merged batch by batch with
+      Welford/Chan updates of (count, mean, M2). A pincode-day never spans
+      two months, so finished months are flushed and memory holds at most
+      one month of groups.
+    - Reservoir: fixed-size uniform sample of a stream of feature rows
+      (Algorithm R), used as the training set of the Isolation Forest.
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+from typing import Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .features import COUNT_COLUMNS, PROFILE_COLUMNS, PROFILE_KEYS
+
+
+class ProfileAccumulator:
+    """Pincode-day profiles of a stream of enrolment batches."""
+
+    def __init__(self, keys: Sequence[str] = tuple(PROFILE_KEYS)):
+        self.keys = list(keys)
+        self.state: Optional[pd.DataFrame] = None   # index: keys; columns: (stat, count column)
+
+    def _partial(self, df: pd.DataFrame) -> pd.DataFrame:
+        """(n, mean, M2) of every group in one batch."""
+        grouped = df.groupby(self.keys, observed=True, dropna=False)[COUNT_COLUMNS]
+        n = grouped.count()
+        mean = grouped.mean()
+        m2 = grouped.var(ddof=0).fillna(0) * n
+        return pd.concat({'n': n, 'mean': mean, 'm2': m2}, axis=1)
+
+    def update(self, df: pd.DataFrame):
+        """Merge a batch of records into the running group statistics."""
+        partial = self._partial(df.assign(**{col: df[col].astype(np.float64) for col in COUNT_COLUMNS}))
+        if self.state is None:
+            self.state = partial
+            return
+
+        # Chan et al. parallel update, for every count column at once
+        pieces = pd.concat([self.state, partial])
+        n = pieces['n'].groupby(level=self.keys, dropna=False).sum()
+        weighted = (pieces['n'] * pieces['mean']).groupby(level=self.keys, dropna=False).sum()
+        mean = (weighted / n.where(n > 0)).fillna(0)
+        spread = pieces['n'] * (pieces['mean'] - mean.reindex(pieces.index)) ** 2
+        m2 = (pieces['m2'] + spread.fillna(0)).groupby(level=self.keys, dropna=False).sum()
+        self.state = pd.concat({'n': n, 'mean': mean, 'm2': m2}, axis=1)
+
+    def flush(self) -> pd.DataFrame:
+        """
+        Profiles of every group seen since the last flush, then reset.
+
+        Returns:
+            DataFrame with the key columns followed by PROFILE_COLUMNS
+            (same values as ``features.pincode_profile``)
+        """
+        if self.state is None:
+            return pd.DataFrame(columns=self.keys + PROFILE_COLUMNS)
+        n, mean, m2 = self.state['n'], self.state['mean'], self.state['m2']
+        std = np.sqrt(m2 / (n - 1).where(n > 1))     # ddof=1 like pandas; one record -> 0
+        profile = pd.DataFrame(index=self.state.index)
+        for col in COUNT_COLUMNS:
+            profile[f'{col}_sum'] = n[col] * mean[col]
+            profile[f'{col}_mean'] = mean[col]
+            profile[f'{col}_std'] = std[col]
+        self.state = None
+        return profile[PROFILE_COLUMNS].fillna(0).reset_index()
+
+
+def monthly_profiles(batches: Iterator[Tuple[str, pd.DataFrame]],
+                     keys: Sequence[str] = tuple(PROFILE_KEYS)) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Pincode-day profiles of each month of a ``store.iter_month_batches`` stream.
+
+    Yields:
+        (month, profile frame) once all batches of the month are merged
+    """
+    accumulator = ProfileAccumulator(keys)
+    current = None
+    for month, batch in batches:
+        if current is not None and month != current:
+            yield current, accumulator.flush()
+        current = month
+        accumulator.update(batch)
+    if current is not None:
+        yield current, accumulator.flush()
+
+
+class Reservoir:
+    """Uniform sample of at most ``capacity`` rows from a stream (Algorithm R)."""
+
+    def __init__(self, capacity: int, random_state: int = 42):
+        self.capacity = capacity
+        self.rng = np.random.RandomState(random_state)
+        self.rows: Optional[np.ndarray] = None
+        self.size = 0
+        self.seen = 0
+
+    def add(self, X: np.ndarray):
+        """Offer a batch of rows to the sample."""
+        if self.rows is None:
+            self.rows = np.empty((self.capacity, X.shape[1]), dtype=X.dtype)
+
+        # Fill the free slots first
+        fill = min(len(X), self.capacity - self.size)
+        self.rows[self.size:self.size + fill] = X[:fill]
+        self.size += fill
+        self.seen += fill
+
+        # Row i of the stream replaces a random slot with probability capacity / (i + 1)
+        rest = X[fill:]
+        if len(rest):
+            positions = self.seen + np.arange(len(rest))
+            slots = (self.rng.random_sample(len(rest)) * (positions + 1)).astype(np.int64)
+            keep = slots < self.capacity
+            self.rows[slots[keep]] = rest[keep]   # later rows win on repeated slots
+            self.seen += len(rest)
+
+    @property
+    def sample(self) -> np.ndarray:
+        """The sampled rows."""
+        if self.rows is None:
+            return np.empty((0, 0))
+        return self.rows[:self.size]
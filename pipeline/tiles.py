@@ -0,0 +1,158 @@
+"""
+🗺️ AADHAAR INTELLIGENCE SYSTEM - Map Tiles
+==========================================
+Level-of-detail aggregates of the pincode table for the India heatmap.
+
+Pincodes are binned into Web Mercator cells (the slippy-map z/x/y grid)
+at every zoom from 0 to MAX_CELL_ZOOM. A tile z/x/y is served as the
+cells of zoom ``z + CELL_BITS`` inside it (a 2^CELL_BITS x 2^CELL_BITS
+grid), so a payload never has more than 4^CELL_BITS cells whatever the
+zoom, and the whole country is a handful of tiles at low zoom.
+
+Cells are keyed by their Morton (Z-order) code. Sorting the pincodes
+once by the code at MAX_CELL_ZOOM makes every coarser level a prefix of
+it, so:
+
+    - each level is built with one ``np.add.reduceat`` over the sorted
+      pincodes (no groupby, no per-level sort)
+    - the cells of a tile are a contiguous range of a level, found with
+      two binary searches
+
+Per cell: pincodes, enrolments, activity, mean daily enrolment rate,
+share of critical (bottom 25% activity) pincodes and the mean position
+of its pincodes.
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+MAX_CELL_ZOOM = 16          # Finest cells (~600 m at the equator)
+CELL_BITS = 4               # A tile holds up to 16 x 16 cells
+MAX_MERCATOR_LAT = 85.0511287798
+CRITICAL_CATEGORY = 'Critical (Bottom 25%)'
+
+# Summed per cell (means and shares are derived when serving)
+SUM_COLUMNS = ['pincodes', 'total_enrolments', 'total_activity', 'daily_enrolment_rate',
+               'critical', 'latitude', 'longitude']
+
+
+def mercator_cells(lat: np.ndarray, lon: np.ndarray, zoom: int):
+    """Web Mercator cell (x, y) of each point at ``zoom``."""
+    n = 1 << zoom
+    lat = np.radians(np.clip(lat, -MAX_MERCATOR_LAT, MAX_MERCATOR_LAT))
+    x = (np.asarray(lon) + 180.0) / 360.0 * n
+    y = (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / np.pi) / 2.0 * n
+    return (np.clip(x, 0, n - 1).astype(np.uint64),
+            np.clip(y, 0, n - 1).astype(np.uint64))
+
+
+def _spread_bits(v: np.ndarray) -> np.ndarray:
+    """Insert a zero bit between the low 32 bits of each value."""
+    v = np.asarray(v, dtype=np.uint64) & np.uint64(0xFFFFFFFF)
+    for shift, mask in [(16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF),
+                        (4, 0x0F0F0F0F0F0F0F0F), (2, 0x3333333333333333), (1, 0x5555555555555555)]:
+        v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+    return v
+
+
+def _compact_bits(v: np.ndarray) -> np.ndarray:
+    """Inverse of ``_spread_bits``."""
+    v = np.asarray(v, dtype=np.uint64) & np.uint64(0x5555555555555555)
+    for shift, mask in [(1, 0x3333333333333333), (2, 0x0F0F0F0F0F0F0F0F), (4, 0x00FF00FF00FF00FF),
+                        (8, 0x0000FFFF0000FFFF), (16, 0x00000000FFFFFFFF)]:
+        v = (v | (v >> np.uint64(shift))) & np.uint64(mask)
+    return v
+
+
+def morton(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Z-order code of cells (x bits on even positions, y bits on odd)."""
+    return _spread_bits(x) | (_spread_bits(y) << np.uint64(1))
+
+
+class TileAggregates:
+    """Per-zoom cell sums of a pincode frame, queryable by z/x/y tile."""
+
+    def __init__(self, frame: pd.DataFrame, max_zoom: int = MAX_CELL_ZOOM):
+        self.max_zoom = max_zoom
+        coords = frame[['latitude', 'longitude']].apply(pd.to_numeric, errors='coerce')
+        valid = (coords['latitude'].between(-90, 90) & coords['longitude'].between(-180, 180)).to_numpy()
+        frame, coords = frame.loc[valid], coords.loc[valid]
+
+        x, y = mercator_cells(coords['latitude'].to_numpy(), coords['longitude'].to_numpy(), max_zoom)
+        codes = morton(x, y)
+        order = np.argsort(codes, kind='stable')
+        codes = codes[order]
+
+        values = np.zeros((len(frame), len(SUM_COLUMNS)))
+        values[:, 0] = 1.0
+        for i, column in enumerate(SUM_COLUMNS[1:], start=1):
+            if column == 'critical':
+                if 'activity_category' in frame.columns:
+                    values[:, i] = (frame['activity_category'] == CRITICAL_CATEGORY).to_numpy()
+            elif column in coords.columns:
+                values[:, i] = coords[column].to_numpy()
+            elif column in frame.columns:
+                values[:, i] = pd.to_numeric(frame[column], errors='coerce').fillna(0).to_numpy()
+        values = values[order]
+
+        # levels[z] = (sorted cell codes, sums per cell)
+        self.levels: List[tuple] = []
+        for zoom in range(max_zoom + 1):
+            level_codes = codes >> np.uint64(2 * (max_zoom - zoom))
+            starts = np.flatnonzero(np.r_[True, level_codes[1:] != level_codes[:-1]]) if len(codes) else \
+                np.array([], dtype=np.int64)
+            sums = np.add.reduceat(values, starts, axis=0) if len(starts) else np.zeros((0, len(SUM_COLUMNS)))
+            self.levels.append((level_codes[starts], sums))
+
+    def cell_count(self, zoom: int) -> int:
+        return len(self.levels[min(zoom, self.max_zoom)][0])
+
+    def _range(self, cell_zoom: int, zoom: int, x: int, y: int) -> slice:
+        codes = self.levels[cell_zoom][0]
+        shift = np.uint64(2 * (cell_zoom - zoom))
+        first = morton(np.array([x]), np.array([y]))[0]
+        start = np.searchsorted(codes, first << shift, side='left')
+        stop = np.searchsorted(codes, (first + np.uint64(1)) << shift, side='left')
+        return slice(int(start), int(stop))
+
+    def _cells(self, cell_zoom: int, part: slice) -> Dict[str, Any]:
+        codes, sums = self.levels[cell_zoom]
+        codes, sums = codes[part], sums[part]
+        count = sums[:, 0]
+        return {
+            'x': _compact_bits(codes).astype(np.int64),
+            'y': _compact_bits(codes >> np.uint64(1)).astype(np.int64),
+            'lat': np.round(sums[:, 5] / count, 5),
+            'lon': np.round(sums[:, 6] / count, 5),
+            'pincodes': count.astype(np.int64),
+            'enrolments': sums[:, 1].astype(np.int64),
+            'activity': sums[:, 2].astype(np.int64),
+            'avg_daily_rate': np.round(sums[:, 3] / count, 3),
+            'critical_share': np.round(sums[:, 4] / count, 3),
+        }
+
+    def tile(self, zoom: int, x: int, y: int) -> Optional[Dict[str, Any]]:
+        """
+        Cells of tile z/x/y at zoom ``min(z + CELL_BITS, max_zoom)``.
+
+        Returns:
+            Dict with the cell zoom and one array per field ('x', 'y',
+            'lat', 'lon', 'pincodes', ...), or None if the tile is empty
+        """
+        if not 0 <= zoom <= self.max_zoom or not (0 <= x < (1 << zoom) and 0 <= y < (1 << zoom)):
+            raise ValueError(f"Invalid tile {zoom}/{x}/{y}")
+        cell_zoom = min(zoom + CELL_BITS, self.max_zoom)
+        part = self._range(cell_zoom, zoom, x, y)
+        if part.start == part.stop:
+            return None
+        return {'cell_zoom': cell_zoom, 'cells': self._cells(cell_zoom, part)}
+
+    def level(self, zoom: int) -> Dict[str, Any]:
+        """Every cell of one zoom (the national picture at that resolution)."""
+        zoom = min(max(zoom, 0), self.max_zoom)
+        return {'cell_zoom': zoom, 'cells': self._cells(zoom, slice(None))}
@@ -0,0 +1,306 @@
+"""
+📈 AADHAAR INTELLIGENCE SYSTEM - Time-Series Features
+======================================================
+Enrolment series per pincode/district/state and the lag, rolling-window and
+calendar features the demand forecast is trained on.
+
+Records are resampled to one dense matrix per level and frequency
+(``series_matrix``): a row per pincode (or district, state), a column per
+day or month, holding total enrolments (all age groups). Features for
+predicting column ``t`` only look at the columns before it:
+
+    - lag_k:            value k periods earlier
+    - roll_mean_w/std_w: mean and std of the previous w periods
+    - calendar:         day of week / weekend / day of month and month
+                        seasonality of the target period
+
+Features are computed for all periods of a block of series at once from
+cumulative sums (no loop over series or periods), so 19k+ pincodes take
+seconds. Training rows are
+built by ``feature_frame`` and cached as Parquet under
+``data/store/_features/``; serving builds the same features for the next
+period from a short per-series history (``ForecastHistory``).
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from typing import List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from .features import COUNT_COLUMNS
+from .stage_cache import stage_key
+from .store import STORE_DIR, HAS_PYARROW
+
+FEATURE_CACHE_DIR = os.path.join(STORE_DIR, '_features')
+
+SERIES_TARGET = 'total_enrolments'
+
+# Series whose features are built at once (bounds the series x periods x features buffer)
+SERIES_BLOCK = 2048
+
+# Frequency -> lags and rolling windows (in periods of that frequency)
+FREQ_SPECS = {
+    'D': {'lags': [1, 2, 7, 14, 28], 'windows': [7, 28]},
+    'M': {'lags': [1, 2, 3, 6], 'windows': [3, 6]},
+}
+
+CALENDAR_FEATURES = {
+    'D': ['day_of_week', 'is_weekend', 'day_of_month', 'month_sin', 'month_cos'],
+    'M': ['month_sin', 'month_cos'],
+}
+
+
+def history_length(freq: str) -> int:
+    """Periods of history needed to build one feature row."""
+    spec = FREQ_SPECS[freq]
+    return max(spec['lags'] + spec['windows'])
+
+
+def feature_columns(freq: str) -> List[str]:
+    """Feature names, in matrix order."""
+    spec = FREQ_SPECS[freq]
+    columns = [f'lag_{k}' for k in spec['lags']]
+    for w in spec['windows']:
+        columns += [f'roll_mean_{w}', f'roll_std_{w}']
+    return columns + CALENDAR_FEATURES[freq]
+
+
+def _period_start(dates: pd.Series, freq: str) -> np.ndarray:
+    values = pd.to_datetime(dates).to_numpy(dtype='datetime64[D]')
+    return values if freq == 'D' else values.astype('datetime64[M]').astype('datetime64[D]')
+
+
+def shift_periods(periods: np.ndarray, steps: int, freq: str) -> np.ndarray:
+    """Periods ``steps`` days or months later."""
+    periods = np.asarray(periods, dtype='datetime64[D]')
+    if freq == 'D':
+        return periods + np.timedelta64(steps, 'D')
+    return (periods.astype('datetime64[M]') + np.timedelta64(steps, 'M')).astype('datetime64[D]')
+
+
+@dataclass
+class SeriesMatrix:
+    """Dense enrolment series: ``values[i, t]`` = total of ``keys[i]`` in ``periods[t]``."""
+    level: str
+    freq: str
+    keys: np.ndarray
+    periods: np.ndarray          # datetime64[D], first day of each period
+    values: np.ndarray           # float64 (n_keys, n_periods)
+
+
+def series_matrix(df: pd.DataFrame, level: str = 'pincode', freq: str = 'D') -> SeriesMatrix:
+    """
+    Resample enrolment records to one dense series per ``level`` value.
+
+    Periods without records are 0. Records without a date are ignored.
+
+    Args:
+        df: Enrolment records (``date``, ``level`` and the age counts)
+        level: 'pincode', 'district' or 'state'
+        freq: 'D' (daily) or 'M' (monthly)
+    """
+    dated = df[df['date'].notna()]
+    period = _period_start(dated['date'], freq)
+    if len(period) == 0:
+        return SeriesMatrix(level, freq, np.array([]), np.array([], dtype='datetime64[D]'), np.zeros((0, 0)))
+
+    first, last = period.min(), period.max()
+    if freq == 'D':
+        periods = np.arange(first, last + np.timedelta64(1, 'D'))
+        period_code = (period - first).astype(np.int64)
+    else:
+        months = np.arange(first.astype('datetime64[M]'), last.astype('datetime64[M]') + np.timedelta64(1, 'M'))
+        periods = months.astype('datetime64[D]')
+        period_code = (period.astype('datetime64[M]') - first.astype('datetime64[M]')).astype(np.int64)
+
+    key_code, keys = pd.factorize(dated[level].astype(str) if level != 'pincode' else dated[level], sort=True)
+    total = dated[COUNT_COLUMNS].fillna(0).to_numpy(dtype=np.float64).sum(axis=1)
+    flat = np.bincount(key_code * len(periods) + period_code, weights=total,
+                       minlength=len(keys) * len(periods))
+    return SeriesMatrix(level, freq, np.asarray(keys), periods, flat.reshape(len(keys), len(periods)))
+
+
+def calendar_features(periods: np.ndarray, freq: str) -> np.ndarray:
+    """Calendar features of target periods, shape (len(periods), n_calendar)."""
+    dates = pd.DatetimeIndex(np.asarray(periods, dtype='datetime64[D]'))
+    month = dates.month.to_numpy()
+    month_sin = np.sin(2 * np.pi * month / 12)
+    month_cos = np.cos(2 * np.pi * month / 12)
+    if freq == 'M':
+        return np.column_stack([month_sin, month_cos])
+    dow = dates.dayofweek.to_numpy()
+    return np.column_stack([dow, dow >= 5, dates.day.to_numpy(), month_sin, month_cos]).astype(np.float64)
+
+
+def lag_features(values: np.ndarray, targets: np.ndarray, freq: str) -> np.ndarray:
+    """
+    Lag and rolling features for predicting ``values[:, t]``, t in ``targets``.
+
+    Only columns before t are used; every t must be >= history_length(freq).
+
+    Returns:
+        Array of shape (n_series, len(targets), n_lag_features)
+    """
+    spec = FREQ_SPECS[freq]
+    zeros = np.zeros((len(values), 1))
+    cumsum = np.concatenate([zeros, np.cumsum(values, axis=1)], axis=1)       # cumsum[:, t] = sum of values[:, :t]
+    cumsq = np.concatenate([zeros, np.cumsum(values ** 2, axis=1)], axis=1)
+
+    columns = [values[:, targets - k] for k in spec['lags']]
+    for w in spec['windows']:
+        mean = (cumsum[:, targets] - cumsum[:, targets - w]) / w
+        var = (cumsq[:, targets] - cumsq[:, targets - w]) / w - mean ** 2
+        columns += [mean, np.sqrt(np.clip(var, 0, None))]
+    return np.stack(columns, axis=2)
+
+
+def feature_frame(matrix: SeriesMatrix) -> pd.DataFrame:
+    """
+    Training rows: features and target of every (series, period) with history.
+
+    Rows of inactive series (no enrolments in the longest window and none in
+    the target period) are dropped. Features are float32.
+
+    Returns:
+        DataFrame with the level column, ``period``, feature_columns(freq)
+        and SERIES_TARGET, sorted by period
+    """
+    freq = matrix.freq
+    columns = feature_columns(freq)
+    targets = np.arange(history_length(freq), matrix.values.shape[1])
+    calendar = calendar_features(matrix.periods[targets], freq)
+    longest = columns.index(f"roll_mean_{max(FREQ_SPECS[freq]['windows'])}")
+
+    parts = []
+    for start in range(0, len(matrix.keys), SERIES_BLOCK):
+        values = matrix.values[start:start + SERIES_BLOCK]
+        lags = lag_features(values, targets, freq)
+        y = values[:, targets]
+        active = (lags[:, :, longest] > 0) | (y > 0)
+        series_idx, target_idx = np.nonzero(active)
+        part = pd.DataFrame(np.hstack([lags[active], calendar[target_idx]]).astype(np.float32), columns=columns)
+        part.insert(0, matrix.level, matrix.keys[start + series_idx])
+        part.insert(1, 'period', matrix.periods[targets][target_idx])
+        part[SERIES_TARGET] = y[active].astype(np.float32)
+        parts.append(part)
+
+    if not parts:
+        return pd.DataFrame(columns=[matrix.level, 'period'] + columns + [SERIES_TARGET])
+    frame = pd.concat(parts, ignore_index=True)
+    return frame.sort_values('period', kind='stable').reset_index(drop=True)
+
+
+def period_split(periods: np.ndarray, fraction: float) -> int:
+    """
+    Index of the first row of the latest ``fraction`` of periods.
+
+    ``periods`` must be sorted (as in ``feature_frame``), so rows before the
+    index are strictly older than the rows from it on.
+    """
+    unique = np.unique(periods)
+    if len(unique) < 2:
+        return len(periods)
+    cut = unique[min(len(unique) - 1, int(len(unique) * (1 - fraction)))]
+    return int(np.searchsorted(periods, cut))
+
+
+def cached_feature_frame(df: pd.DataFrame, data_key: Optional[str], level: str = 'pincode',
+                         freq: str = 'D', cache_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    ``feature_frame`` of the records, cached on disk.
+
+    The cache file is keyed by ``data_key`` (content hash of the input
+    shards), the level/frequency and this module's source, so it is rebuilt
+    whenever the data or the feature definitions change. Each build writes
+    its own temporary file and publishes it with an atomic rename.
+    """
+    if data_key is None or not HAS_PYARROW:
+        return feature_frame(series_matrix(df, level, freq))
+    cache_dir = cache_dir or FEATURE_CACHE_DIR
+    key = stage_key(data_key, level, freq, FREQ_SPECS, sys.modules[__name__])
+    path = os.path.join(cache_dir, f'{level}_{freq}_{key[:16]}.parquet')
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+
+    frame = feature_frame(series_matrix(df, level, freq))
+    os.makedirs(cache_dir, exist_ok=True)
+    # Unique temporary name: concurrent builders of the same key never share a file
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=f'{level}_{freq}_', suffix='.tmp')
+    os.close(fd)
+    try:
+        frame.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    for name in os.listdir(cache_dir):  # drop stale matrices (not other builders' temp files)
+        if name.startswith(f'{level}_{freq}_') and name.endswith('.parquet') and name != os.path.basename(path):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except FileNotFoundError:
+                pass
+    return frame
+
+
+# ============================================
+# SERVING
+# ============================================
+@dataclass
+class ForecastHistory:
+    """The last ``history_length`` periods of every series, for next-period features."""
+    level: str
+    freq: str
+    keys: np.ndarray
+    last_period: np.ndarray      # datetime64[D] of the newest column
+    window: np.ndarray           # (n_keys, history_length)
+
+    @classmethod
+    def from_matrix(cls, matrix: SeriesMatrix) -> 'ForecastHistory':
+        length = history_length(matrix.freq)
+        window = matrix.values[:, -length:]
+        if window.shape[1] < length:
+            window = np.pad(window, ((0, 0), (length - window.shape[1], 0)))
+        last = matrix.periods[-1] if len(matrix.periods) else np.datetime64('NaT', 'D')
+        return cls(matrix.level, matrix.freq, matrix.keys, np.datetime64(last, 'D'), window)
+
+    def features(self, keys: np.ndarray, latest: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Feature rows forecasting the next period of each key.
+
+        Args:
+            keys: Series to forecast (unknown keys get an all-zero history)
+            latest: Optional newest observation per key, appended after the
+                stored history (the forecast is then one period further)
+        """
+        position = pd.Index(self.keys).get_indexer(keys)
+        window = np.where(position[:, None] >= 0, self.window[np.maximum(position, 0)], 0.0)
+        target = shift_periods(self.last_period, 1, self.freq)
+        if latest is not None:
+            window = np.concatenate([window[:, 1:], np.asarray(latest, dtype=np.float64)[:, None]], axis=1)
+            target = shift_periods(target, 1, self.freq)
+
+        lags = lag_features(window, np.array([window.shape[1]]), self.freq)[:, 0, :]
+        calendar = np.repeat(calendar_features(np.array([target]), self.freq), len(keys), axis=0)
+        return np.hstack([lags, calendar])
+
+    def target_period(self, with_latest: bool = False) -> str:
+        return str(shift_periods(self.last_period, 2 if with_latest else 1, self.freq))
+
+
+def save_history(history: ForecastHistory, path: str):
+    tmp = path + '.tmp'
+    joblib.dump(history, tmp)
+    os.replace(tmp, path)
+
+
+def load_history(path: str) -> Optional[ForecastHistory]:
+    return joblib.load(path) if os.path.exists(path) else None
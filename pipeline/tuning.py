@@ -0,0 +1,294 @@
+"""
+🎛️ AADHAAR INTELLIGENCE SYSTEM - Hyperparameter Search
+=======================================================
+Successive-halving random search for the demand forecast models (Random
+Forest and XGBoost / Gradient Boosting) on the cached time-series feature
+matrix (see ``timeseries.cached_feature_frame``).
+
+    - Candidates are sampled from SEARCH_SPACES.
+    - Validation is temporal: expanding-window folds over the periods
+      before the test split (``temporal_folds``), never shuffled.
+    - Each rung fits every surviving candidate on every fold with the most
+      recent ``resource`` training rows, keeps the best 1/eta by mean
+      validation MAE and multiplies the rows by eta, up to all rows.
+    - Boosting stops early against the validation fold (``fit_boosting``),
+      so its round count is not searched: candidates run up to
+      MAX_BOOSTING_ROUNDS, but that cap is not part of the best
+      parameters (training keeps its own round limit and early stopping;
+      the rounds kept during the search are reported as ``best_rounds``).
+    - (candidate, fold) fits run in a process pool; the feature matrix is
+      sent to each worker once.
+
+``models/train_models.py --tune`` writes the best configurations to
+``outputs/metrics/best_params.json``; training merges them into its
+hyperparameters.
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import ParameterSampler, TimeSeriesSplit
+
+from .loader import default_workers
+
+# Try importing XGBoost (optional)
+try:
+    import xgboost as xgb
+    HAS_XGBOOST = True
+except ImportError:
+    HAS_XGBOOST = False
+
+TUNED_MODELS = ['random_forest', 'gradient_boosting']
+
+# Search spaces (sampled without replacement)
+SEARCH_SPACES = {
+    'random_forest': {
+        'n_estimators': [100, 200],
+        'max_depth': [6, 8, 10, 14, 18],
+        'min_samples_split': [2, 10, 20],
+        'min_samples_leaf': [1, 5, 10, 20],
+        'max_features': ['sqrt', 0.5, 1.0],
+    },
+    'gradient_boosting': {
+        'max_depth': [3, 4, 6, 8],
+        'learning_rate': [0.03, 0.05, 0.1, 0.2],
+        'subsample': [0.6, 0.8, 1.0],
+        'colsample_bytree': [0.6, 0.8, 1.0],      # XGBoost only
+        'min_child_weight': [1, 5, 20],           # min_samples_leaf without XGBoost
+    },
+}
+
+N_CANDIDATES = 16
+ETA = 3                     # Survivors per rung: 1/ETA; rows per rung: x ETA
+MIN_RESOURCE = 5000         # Training rows of the first rung
+N_FOLDS = 3
+MAX_BOOSTING_ROUNDS = 1000
+EARLY_STOPPING_ROUNDS = 30
+GB_STEP = 10                # Trees added per early-stopping check without XGBoost
+
+
+# ============================================
+# MODELS
+# ============================================
+def build_forest(params: Dict[str, Any], n_jobs: int = 1) -> RandomForestRegressor:
+    return RandomForestRegressor(
+        n_estimators=params['n_estimators'],
+        max_depth=params['max_depth'],
+        min_samples_split=params['min_samples_split'],
+        min_samples_leaf=params['min_samples_leaf'],
+        max_features=params['max_features'],
+        random_state=params.get('random_state', 42),
+        n_jobs=n_jobs,
+    )
+
+
+def fit_boosting(params: Dict[str, Any], X_train: np.ndarray, y_train: np.ndarray,
+                 X_val: np.ndarray, y_val: np.ndarray, n_jobs: int = 1):
+    """
+    Fit XGBoost (or sklearn Gradient Boosting) with early stopping on a validation set.
+
+    ``params['n_estimators']`` is the round limit. XGBoost stops after
+    ``early_stopping_rounds`` rounds without improvement of the validation
+    MAE. Gradient Boosting grows GB_STEP trees at a time (warm start) and
+    is cut back to the best step.
+
+    Returns:
+        (fitted model, boosting rounds kept)
+    """
+    patience = params.get('early_stopping_rounds', EARLY_STOPPING_ROUNDS)
+    if HAS_XGBOOST:
+        model = xgb.XGBRegressor(
+            n_estimators=params['n_estimators'],
+            max_depth=params['max_depth'],
+            learning_rate=params['learning_rate'],
+            subsample=params['subsample'],
+            colsample_bytree=params['colsample_bytree'],
+            min_child_weight=params.get('min_child_weight', 1),
+            early_stopping_rounds=patience,
+            eval_metric='mae',
+            random_state=params.get('random_state', 42),
+            n_jobs=n_jobs,
+        )
+        model.fit(X_train, y_train, eval_set=[(X_val, y_val)], verbose=False)
+        return model, int(model.best_iteration) + 1
+
+    model = GradientBoostingRegressor(
+        n_estimators=0,
+        max_depth=params['max_depth'],
+        learning_rate=params['learning_rate'],
+        subsample=params['subsample'],
+        min_samples_leaf=params.get('min_child_weight', 1),
+        random_state=params.get('random_state', 42),
+        warm_start=True,
+    )
+    best_mae, best_rounds = np.inf, 0
+    while model.n_estimators < params['n_estimators']:
+        model.set_params(n_estimators=min(model.n_estimators + GB_STEP, params['n_estimators']))
+        model.fit(X_train, y_train)
+        mae = mean_absolute_error(y_val, model.predict(X_val))
+        if mae < best_mae:
+            best_mae, best_rounds = mae, model.n_estimators
+        elif model.n_estimators - best_rounds >= patience:
+            break
+
+    # Drop the trees after the best step (as sklearn's own n_iter_no_change does)
+    model.estimators_ = model.estimators_[:best_rounds]
+    model.train_score_ = model.train_score_[:best_rounds]
+    if hasattr(model, 'oob_improvement_'):
+        model.oob_improvement_ = model.oob_improvement_[:best_rounds]
+    model.n_estimators_ = best_rounds
+    model.set_params(n_estimators=best_rounds, warm_start=False)
+    return model, best_rounds
+
+
+# ============================================
+# SEARCH
+# ============================================
+def temporal_folds(periods: np.ndarray, n_splits: int = N_FOLDS) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Expanding-window folds over the distinct periods of period-sorted rows.
+
+    Returns:
+        (train row indices, validation row indices) per fold
+    """
+    unique = np.unique(periods)
+    n_splits = min(n_splits, len(unique) - 1)
+    if n_splits < 1:
+        raise ValueError("Need at least two periods for temporal validation")
+    folds = []
+    for train_p, val_p in TimeSeriesSplit(n_splits=n_splits).split(unique):
+        start = np.searchsorted(periods, unique[val_p[0]])
+        end = np.searchsorted(periods, unique[val_p[-1]], side='right')
+        folds.append((np.arange(start), np.arange(start, end)))
+    return folds
+
+
+# Feature matrix of a search worker, set once per process
+_worker_data: Dict[str, np.ndarray] = {}
+
+
+def _init_worker(X: np.ndarray, y: np.ndarray):
+    _worker_data['X'] = X
+    _worker_data['y'] = y
+
+
+def _evaluate(name: str, params: Dict[str, Any], train_idx: np.ndarray, val_idx: np.ndarray,
+              resource: int) -> Tuple[float, int]:
+    """Validation MAE of one candidate on one fold, trained on the last ``resource`` rows."""
+    X, y = _worker_data['X'], _worker_data['y']
+    train_idx = train_idx[-resource:]
+    X_train, y_train, X_val, y_val = X[train_idx], y[train_idx], X[val_idx], y[val_idx]
+    if name == 'random_forest':
+        model = build_forest(params).fit(X_train, y_train)
+        rounds = params['n_estimators']
+    else:
+        model, rounds = fit_boosting(params, X_train, y_train, X_val, y_val)
+    return float(mean_absolute_error(y_val, model.predict(X_val))), rounds
+
+
+def successive_halving(name: str, X: np.ndarray, y: np.ndarray, periods: np.ndarray,
+                       base_params: Dict[str, Any], n_candidates: int = N_CANDIDATES,
+                       eta: int = ETA, min_resource: int = MIN_RESOURCE,
+                       workers: Optional[int] = None, verbose: bool = True) -> Dict[str, Any]:
+    """
+    Successive-halving random search of one model.
+
+    Args:
+        X, y: Training rows sorted by period (test periods already removed)
+        periods: Period of every row
+        base_params: Current hyperparameters; candidates override the
+            searched keys
+
+    Returns:
+        Dict with ``best_params`` (base_params with the winner applied),
+        ``cv_mae``, the final rung's ``leaderboard`` and search statistics
+    """
+    start = time.time()
+    folds = temporal_folds(periods)
+    max_resource = max(len(train) for train, _ in folds)
+    space = SEARCH_SPACES[name]
+    fixed = {} if name == 'random_forest' else {'n_estimators': MAX_BOOSTING_ROUNDS}
+    candidates = [{**base_params, **sampled, **fixed}
+                  for sampled in ParameterSampler(space, n_candidates, random_state=base_params.get('random_state', 42))]
+
+    workers = min(workers or default_workers(), len(candidates) * len(folds))
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(X, y)) if workers > 1 else None
+    if pool is None:
+        _init_worker(X, y)
+
+    resource = min(min_resource, max_resource)
+    evaluations = 0
+    try:
+        while True:
+            tasks = [(c, fold) for c in range(len(candidates)) for fold in folds]
+            args = ([name] * len(tasks), [candidates[c] for c, _ in tasks],
+                    [train for _, (train, _) in tasks], [val for _, (_, val) in tasks], [resource] * len(tasks))
+            results = list(pool.map(_evaluate, *args) if pool else map(_evaluate, *args))
+            evaluations += len(tasks)
+
+            mae = np.array([r[0] for r in results]).reshape(len(candidates), len(folds)).mean(axis=1)
+            rounds = np.array([r[1] for r in results]).reshape(len(candidates), len(folds))
+            order = np.argsort(mae, kind='stable')
+            if verbose:
+                print(f"   {name}: {len(candidates)} candidates x {len(folds)} folds on {resource:,} rows, "
+                      f"best MAE {mae[order[0]]:.3f}")
+            if resource >= max_resource or len(candidates) <= 1:
+                break
+            keep = order[:max(1, len(candidates) // eta)]
+            candidates = [candidates[i] for i in keep]
+            resource = min(resource * eta, max_resource)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # Searched values only: the search-only round cap must not replace the base round limit
+    winner = candidates[order[0]]
+    best = {**base_params, **{k: winner[k] for k in space if k in winner}}
+    return {
+        'best_params': best,
+        'cv_mae': round(float(mae[order[0]]), 4),
+        'best_rounds': int(np.median(rounds[order[0]])),    # kept by early stopping (boosting)
+        'leaderboard': [
+            {'params': {k: candidates[i][k] for k in space if k in candidates[i]},
+             'cv_mae': round(float(mae[i]), 4)}
+            for i in order[:5]
+        ],
+        'candidates': n_candidates,
+        'evaluations': evaluations,
+        'folds': len(folds),
+        'seconds': round(time.time() - start, 2),
+    }
+
+
+# ============================================
+# PERSISTENCE
+# ============================================
+def save_best_params(results: Dict[str, Dict[str, Any]], path: str):
+    """Write search results (``successive_halving`` output per model)."""
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(results, f, indent=2, default=str)
+    os.replace(tmp, path)
+
+
+def load_best_params(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Best values of the searched hyperparameters per model, or {} if no
+    search has run (other keys of a saved result, such as a search-only
+    round cap, are not applied).
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        results = json.load(f)
+    return {name: {k: v for k, v in result['best_params'].items() if k in SEARCH_SPACES.get(name, {})}
+            for name, result in results.items() if 'best_params' in result}
@@ -52,6 +52,7 @@ setup(
     install_requires=[
         "pandas>=2.0.0",
         "numpy>=1.24.0",
+        "pyarrow>=14.0.0",
         "plotly>=5.18.0",
         "scikit-learn>=1.3.0",
         "fastapi>=0.109.0",
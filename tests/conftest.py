@@ -0,0 +1,14 @@
+"""
+🧪 AADHAAR INTELLIGENCE SYSTEM - Test Configuration
+===================================================
+Makes the ``pipeline`` package importable when pytest is run from any
+directory.
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
@@ -0,0 +1,103 @@
+"""
+🧪 AADHAAR INTELLIGENCE SYSTEM - Incremental Aggregate Tests
+============================================================
+``aggregates.update_aggregates`` keeps running totals by adding the
+partials of new shards and subtracting those of changed or deleted ones.
+After any sequence of shard changes the totals must equal a build from
+scratch of the same shards.
+
+    python -m pytest tests/test_aggregates.py
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from pipeline import aggregates, store
+
+pytestmark = pytest.mark.skipif(not store.HAS_PYARROW, reason='pyarrow is not installed')
+
+HEADER = 'date,state,district,pincode,age_0_5,age_5_17,age_18_greater\n'
+
+
+def write_csv(path, rows):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(HEADER)
+        for date, state, district, pincode, counts in rows:
+            f.write(f'{date},{state},{district},{pincode},{counts[0]},{counts[1]},{counts[2]}\n')
+
+
+def update(data_dir, store_dir):
+    store.build_store(['enrolment'], data_dir=data_dir, store_dir=store_dir, workers=1)
+    merged = aggregates.update_aggregates(['enrolment'], store_dir)
+    return merged['enrolment']
+
+
+def totals(store_dir):
+    df = aggregates.load_totals('enrolment', store_dir)
+    keys, values = aggregates.PARTIAL_COLUMNS['enrolment']
+    return df.sort_values(keys).reset_index(drop=True)[keys + values].astype({v: 'int64' for v in values})
+
+
+def from_scratch(data_dir, tmp_path):
+    store_dir = str(tmp_path / 'scratch_store')
+    update(data_dir, store_dir)
+    return totals(store_dir)
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    data_dir, store_dir = str(tmp_path / 'data'), str(tmp_path / 'store')
+    write_csv(os.path.join(data_dir, 'enrolment', '2025', 'shard_1.csv'), [
+        ('01-03-2025', 'Kerala', 'Ernakulam', 682001, (1, 2, 3)),
+        ('02-03-2025', 'Kerala', 'Ernakulam', 682001, (4, 5, 6)),
+        ('01-03-2025', 'Goa', 'North Goa', 403001, (2, 0, 1)),
+    ])
+    write_csv(os.path.join(data_dir, 'enrolment', '2025', 'shard_2.csv'), [
+        ('03-03-2025', 'Kerala', 'Ernakulam', 682001, (1, 1, 1)),
+        ('03-03-2025', 'Assam', 'Kamrup', 781001, (7, 0, 0)),
+    ])
+    return data_dir, store_dir
+
+
+def test_new_shards_are_added(dirs, tmp_path):
+    data_dir, store_dir = dirs
+    assert update(data_dir, store_dir) == 2
+    result = totals(store_dir)
+    kerala = result[result['pincode'] == 682001].iloc[0]
+    assert kerala['total_enrolments'] == 24
+    assert kerala['enrolment_days'] == 3
+    pd.testing.assert_frame_equal(result, from_scratch(data_dir, tmp_path))
+    assert update(data_dir, store_dir) == 0
+
+
+def test_changed_shard_is_replaced(dirs, tmp_path):
+    data_dir, store_dir = dirs
+    update(data_dir, store_dir)
+
+    write_csv(os.path.join(data_dir, 'enrolment', '2025', 'shard_1.csv'), [
+        ('01-03-2025', 'Kerala', 'Ernakulam', 682001, (10, 0, 0)),
+    ])
+    assert update(data_dir, store_dir) == 1
+    result = totals(store_dir)
+    kerala = result[result['pincode'] == 682001].iloc[0]
+    assert kerala['total_enrolments'] == 13
+    assert 403001 not in result['pincode'].tolist()     # Only the old shard had Goa
+    pd.testing.assert_frame_equal(result, from_scratch(data_dir, tmp_path))
+
+
+def test_deleted_shard_is_subtracted(dirs, tmp_path):
+    data_dir, store_dir = dirs
+    update(data_dir, store_dir)
+
+    os.remove(os.path.join(data_dir, 'enrolment', '2025', 'shard_2.csv'))
+    assert update(data_dir, store_dir) == 1
+    result = totals(store_dir)
+    assert sorted(result['pincode']) == [403001, 682001]
+    assert result.loc[result['pincode'] == 682001, 'enrolment_days'].iloc[0] == 2
+    pd.testing.assert_frame_equal(result, from_scratch(data_dir, tmp_path))
@@ -0,0 +1,127 @@
+"""
+🧪 AADHAAR INTELLIGENCE SYSTEM - Flat Forest Tests
+==================================================
+Parity of the flat forest artifacts (pipeline/artifacts.py) with the
+sklearn models they are exported from, on every inference backend, for
+single rows, batches and chunked (threaded) batches.
+
+    python -m pytest tests/test_artifacts.py
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import IsolationForest, RandomForestRegressor
+
+from pipeline import artifacts
+from pipeline.artifacts import FlatForest, HAS_NUMBA, check_parity, export_forest, flatten_forest, load_forest
+
+BACKENDS = [
+    'numpy',
+    pytest.param('numba', marks=pytest.mark.skipif(not HAS_NUMBA, reason='numba is not installed')),
+]
+
+N_FEATURES = 6
+
+
+def _data(n_rows, seed=0):
+    rng = np.random.RandomState(seed)
+    X = rng.normal(0, 1, (n_rows, N_FEATURES))
+    X[:10] *= 6  # A few clear outliers
+    y = X[:, 0] * 3 + np.sin(X[:, 1]) + rng.normal(0, 0.1, n_rows)
+    return X, y
+
+
+@pytest.fixture(scope='module')
+def isolation_models():
+    X, _ = _data(2000)
+    return {
+        'all_features': IsolationForest(n_estimators=40, contamination=0.02, random_state=1).fit(X),
+        'max_features': IsolationForest(n_estimators=40, max_features=0.5, contamination=0.02,
+                                        random_state=2).fit(X),
+    }
+
+
+@pytest.fixture(scope='module')
+def regression_model():
+    X, y = _data(2000)
+    return RandomForestRegressor(n_estimators=30, max_depth=12, random_state=3).fit(X, y)
+
+
+@pytest.fixture(scope='module')
+def batch():
+    X, _ = _data(3000, seed=7)
+    return X
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('variant', ['all_features', 'max_features'])
+def test_isolation_forest_parity(isolation_models, batch, backend, variant):
+    model = isolation_models[variant]
+    flat = FlatForest(flatten_forest(model), backend=backend)
+
+    np.testing.assert_allclose(flat.score_samples(batch), model.score_samples(batch),
+                               rtol=0, atol=artifacts.PARITY_TOLERANCE)
+    np.testing.assert_allclose(flat.decision_function(batch), model.decision_function(batch),
+                               rtol=0, atol=artifacts.PARITY_TOLERANCE)
+    np.testing.assert_array_equal(flat.predict(batch), model.predict(batch))
+    assert (flat.predict(batch) == -1).any()
+
+    for row in [batch[:1], batch[5:6]]:
+        np.testing.assert_allclose(flat.score_samples(row), model.score_samples(row),
+                                   rtol=0, atol=artifacts.PARITY_TOLERANCE)
+        np.testing.assert_array_equal(flat.predict(row), model.predict(row))
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_random_forest_parity(regression_model, batch, backend):
+    flat = FlatForest(flatten_forest(regression_model), backend=backend)
+
+    np.testing.assert_allclose(flat.predict(batch), regression_model.predict(batch),
+                               rtol=0, atol=artifacts.PARITY_TOLERANCE)
+    per_tree = np.column_stack([tree.predict(batch) for tree in regression_model.estimators_])
+    np.testing.assert_allclose(flat.tree_predictions(batch), per_tree, rtol=0, atol=artifacts.PARITY_TOLERANCE)
+
+    row = batch[:1]
+    assert flat.predict(row).shape == (1,)
+    np.testing.assert_allclose(flat.predict(row), regression_model.predict(row),
+                               rtol=0, atol=artifacts.PARITY_TOLERANCE)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_chunked_batches_match(regression_model, isolation_models, batch, backend, monkeypatch):
+    model = isolation_models['max_features']
+    expected_scores = model.score_samples(batch)
+    expected_forecast = regression_model.predict(batch)
+
+    # Force the row-chunked (thread pool) path on small batches
+    monkeypatch.setattr(artifacts, 'EVAL_CHUNK_ROWS', 256)
+    monkeypatch.setattr(artifacts, 'PARALLEL_MIN_ROWS', 100)
+    np.testing.assert_allclose(FlatForest(flatten_forest(model), backend=backend).score_samples(batch),
+                               expected_scores, rtol=0, atol=artifacts.PARITY_TOLERANCE)
+    np.testing.assert_allclose(FlatForest(flatten_forest(regression_model), backend=backend).predict(batch),
+                               expected_forecast, rtol=0, atol=artifacts.PARITY_TOLERANCE)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_exported_artifact_round_trip(isolation_models, regression_model, batch, backend, tmp_path):
+    for name, model in [('isolation', isolation_models['max_features']), ('regression', regression_model)]:
+        path = str(tmp_path / f'{name}_flat.joblib')
+        assert export_forest(model, path) > 0
+        for mmap in [True, False]:
+            report = check_parity(model, load_forest(path, mmap=mmap, backend=backend), batch)
+            assert report['passed'], report
+
+
+def test_empty_input(regression_model):
+    flat = FlatForest(flatten_forest(regression_model), backend='numpy')
+    assert flat.predict(np.empty((0, N_FEATURES))).shape == (0,)
+
+
+def test_format_version_is_checked(regression_model):
+    arrays = flatten_forest(regression_model)
+    arrays['meta'] = {**arrays['meta'], 'format': artifacts.FORMAT_VERSION - 1}
+    with pytest.raises(ValueError, match='re-export'):
+        FlatForest(arrays)
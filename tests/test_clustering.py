@@ -0,0 +1,59 @@
+"""
+🧪 AADHAAR INTELLIGENCE SYSTEM - Partitioned DBSCAN Tests
+=========================================================
+``clustering.partitioned_dbscan`` must reproduce ``sklearn.cluster.DBSCAN``
+whatever the number of spatial partitions: same noise, same core points
+and the same clusters (up to label ids).
+
+    python -m pytest tests/test_clustering.py
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import numpy as np
+import pytest
+from sklearn.cluster import DBSCAN
+from sklearn.datasets import make_blobs
+from sklearn.metrics import adjusted_rand_score
+
+from pipeline.clustering import partitioned_dbscan
+
+EPS = 0.3
+MIN_SAMPLES = 5
+
+
+@pytest.fixture(scope='module')
+def points():
+    # Blobs of rounded (so partly duplicated, i.e. weighted) points plus scattered noise
+    X, _ = make_blobs(n_samples=3000, centers=8, cluster_std=0.6, center_box=(-12, 12), random_state=4)
+    noise = np.random.RandomState(5).uniform(-14, 14, (150, 2))
+    return np.round(np.vstack([X, noise]), 1)
+
+
+@pytest.fixture(scope='module')
+def reference(points):
+    return DBSCAN(eps=EPS, min_samples=MIN_SAMPLES).fit(points)
+
+
+@pytest.mark.parametrize('partitions', [1, 8, 35])
+def test_matches_sklearn_dbscan(points, reference, partitions):
+    n_unique = len(np.unique(points, axis=0))
+    result = partitioned_dbscan(points, eps=EPS, min_samples=MIN_SAMPLES,
+                                partition_points=-(-n_unique // partitions), verbose=False)
+
+    assert len(result.partitions) >= partitions
+    assert len(result.labels) == len(points)
+    np.testing.assert_array_equal(result.labels == -1, reference.labels_ == -1)
+    assert adjusted_rand_score(reference.labels_, result.labels) == 1.0
+
+    # Same core points (the model keeps them deduplicated)
+    expected_core = np.unique(points[reference.core_sample_indices_], axis=0)
+    np.testing.assert_array_equal(np.unique(result.model.components_, axis=0), expected_core)
+
+
+def test_all_noise():
+    X = np.arange(20, dtype=float).reshape(-1, 1) * 10
+    result = partitioned_dbscan(X, eps=EPS, min_samples=MIN_SAMPLES, partition_points=4, verbose=False)
+    assert (result.labels == -1).all()
+    assert len(result.model.core_sample_indices_) == 0
@@ -0,0 +1,104 @@
+"""
+🧪 AADHAAR INTELLIGENCE SYSTEM - Columnar Store Tests
+=====================================================
+Ingestion of raw CSV shards into the Parquet store (pipeline/store.py):
+same-named shards in different subfolders, changed and deleted shards, the
+one-time rebuild of stores with an older part naming and the row counts
+the CSV fallback preallocates from.
+
+    python -m pytest tests/test_store.py
+
+Author: Aadhaar Intelligence Team
+Date: January 2026
+"""
+
+import os
+
+import pytest
+
+from pipeline import store
+
+pytestmark = pytest.mark.skipif(not store.HAS_PYARROW, reason='pyarrow is not installed')
+
+HEADER = 'date,state,district,pincode,age_0_5,age_5_17,age_18_greater\n'
+
+
+def write_csv(path, state, district, pincode, days=3, count=1):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(HEADER)
+        for day in range(1, days + 1):
+            f.write(f'{day:02d}-03-2025,{state},{district},{pincode},{count},{count},{count}\n')
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    data_dir, store_dir = str(tmp_path / 'data'), str(tmp_path / 'store')
+    write_csv(os.path.join(data_dir, 'enrolment', 'a', 'x.csv'), 'Kerala', 'Ernakulam', 682001)
+    write_csv(os.path.join(data_dir, 'enrolment', 'b', 'x.csv'), 'Goa', 'North Goa', 403001)
+    return data_dir, store_dir
+
+
+def load(dirs):
+    data_dir, store_dir = dirs
+    return store.load_dataset('enrolment', data_dir=data_dir, store_dir=store_dir, workers=1)
+
+
+def test_same_named_shards_in_subfolders_keep_their_rows(dirs):
+    df = load(dirs)
+    assert sorted(df['state'].astype(str).unique()) == ['Goa', 'Kerala']
+    assert len(df) == 6
+    for key in ['a/x.csv', 'b/x.csv']:
+        assert len(store.read_shard_slices(key, 'enrolment', dirs[1])) == 3
+
+
+def test_changed_and_deleted_shards_leave_their_namesakes_alone(dirs):
+    data_dir, store_dir = dirs
+    load(dirs)
+
+    write_csv(os.path.join(data_dir, 'enrolment', 'a', 'x.csv'), 'Kerala', 'Ernakulam', 682001, days=5)
+    df = load(dirs)
+    assert (df['state'] == 'Kerala').sum() == 5
+    assert (df['state'] == 'Goa').sum() == 3
+
+    os.remove(os.path.join(data_dir, 'enrolment', 'b', 'x.csv'))
+    df = load(dirs)
+    assert list(df['state'].astype(str).unique()) == ['Kerala']
+    assert len(df) == 5
+
+
+def test_older_part_naming_is_rebuilt(dirs):
+    data_dir, store_dir = dirs
+    load(dirs)
+    os.remove(os.path.join(store_dir, 'enrolment', store.LAYOUT_NAME))
+
+    deltas = store.build_store(['enrolment'], data_dir=data_dir, store_dir=store_dir, workers=1)
+    assert sorted(deltas['enrolment'].added) == ['a/x.csv', 'b/x.csv']
+    assert len(load(dirs)) == 6
+
+
+def test_csv_fallback_uses_the_callers_manifest_and_skips_stale_counts(dirs, monkeypatch):
+    data_dir, store_dir = dirs
+    load(dirs)
+    shard = os.path.join(data_dir, 'enrolment', 'a', 'x.csv')
+    write_csv(shard, 'Kerala', 'Ernakulam', 682001, days=7)   # Manifest still says 3 rows
+
+    seen = {}
+    original = store.load_shards
+
+    def spy(paths, parse, workers, memory_limit_mb, row_counts=None):
+        seen['row_counts'] = row_counts
+        return original(paths, parse, workers, memory_limit_mb, row_counts)
+
+    monkeypatch.setattr(store, 'HAS_PYARROW', False)
+    monkeypatch.setattr(store, 'load_shards', spy)
+    df = load(dirs)
+    assert seen['row_counts'] is None
+    assert (df['state'] == 'Kerala').sum() == 7
+
+    # Unchanged shards: the counts recorded in this store's manifest are used
+    monkeypatch.setattr(store, 'HAS_PYARROW', True)
+    store.build_store(['enrolment'], data_dir=data_dir, store_dir=store_dir, workers=1)
+    monkeypatch.setattr(store, 'HAS_PYARROW', False)
+    load(dirs)
+    assert sorted(seen['row_counts']) == [3, 7]